@@ -1,17 +1,34 @@
 """
 Conways Game of Life
 
+The boards, UIs and performance tools are imported the first time they are used.
+
 Author: Zack Hankin
 Started: 2/02/2023
 """
-from .logic import Board, logger
+import importlib
+from typing import Any
+
+from .logic import logger
+
+__all__: list[str] = ["logger"]
+
+LAZY: dict[str, str] = {
+    "Board": "conways.logic",
+    "Options": "conways.ui",
+    "PygameUI": "conways.ui",
+    "CLI": "conways.ui",
+    "Timer": "conways.performance",
+    }
 
-__all__: list[str] = ["Board", "logger"]
+__all__ += list(LAZY)
 
-from .ui import Options, PygameUI, CLI
 
-__all__ += ["Options", "PygameUI", "CLI"]
+def __getattr__(name: str) -> Any:
+    if name not in LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(LAZY[name]), name)
 
-from .performance import Timer
 
-__all__ += ["Timer"]
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
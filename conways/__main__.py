@@ -10,9 +10,9 @@ import os
 import sys
 from typing import Protocol
 
-from icecream import ic
-from conways import Board, CLI, PygameUI, Timer, Options
-from conways.logic import logger, Condition
+from conways.logic import Board, logger, ENGINES, History, LogLevel, Position, load_pattern
+from conways.performance.timer import Timer
+from conways.ui.ui_args import Options
 
 
 # noinspection PyMissingOrEmptyDocstring
@@ -30,23 +30,80 @@ def setup_ui(args: Options, board: Board) -> UIType:
             args.set_ui()
             return setup_ui(args, board)
         case "pygame":
-            ui = PygameUI(board=board, fps=args.fps)
+            from conways.ui.pygame_ui import PygameUI
+
+            history = None if args.history is None else History(args.history, args.keyframe_every)
+            ui = PygameUI(board=board, fps=args.fps, generations_per_second=args.gps, history=history)
         case "CLI":
-            ui = CLI(board, number_of_generations=args.n)
+            from conways.ui.cli_ui import CLI
+
+            ui = CLI(
+                board, number_of_generations=args.n, stop_on_cycle=args.stop_on_cycle,
+                checkpoint=args.get_checkpoint(),
+                )
+        case "record":
+            from conways.ui.recorder import Recorder
+
+            ui = Recorder(
+                board, path=args.record, number_of_generations=args.n, every=args.every, fps=args.fps,
+                frame_size=args.frame_size,
+                )
     return ui
 
 
 def main() -> int:
+    if sys.argv[1:2] == ["sweep"]:
+        from conways.ui.sweep import Sweep
+
+        return Sweep(sys.argv[2:]).run()
+    if sys.argv[1:2] == ["bench"]:
+        from conways.ui.bench import Bench
+
+        return Bench(sys.argv[2:]).run()
+    if sys.argv[1:2] == ["import-time"]:
+        from conways.performance.import_time import check_import_time
+
+        return check_import_time(sys.argv[2:])
     try:
         logger.success("Started Conway's Game of Life")
         options = Options()
         logger.debug(f"UI: {options.ui}")
-        board = Board(options.width, num_of_runs=options.n, loading_bar=options.loading)
+        logger.debug(f"Engine: {options.engine}")
+        if options.timing is not None:
+            Timer.enable().report_at_exit(None if str(options.timing) == "-" else options.timing)
+        if options.metrics is not None or LogLevel.enabled("TRACE"):
+            from conways.performance.metrics import Metrics
+
+            Metrics(options.metrics).enable().close_at_exit()
+        board_type = ENGINES[options.engine]
+        board_args = dict(
+            num_of_runs=options.n, loading_bar=options.loading, height=options.height, **options.engine_options(),
+            )
+        if options.topology is not None:
+            board_args["topology"] = options.topology
+        if options.resume is not None:
+            board = board_type.load(options.resume, **board_args)
+            options.n = board.num_of_runs = max(0, options.n - board.generation_number)
+            logger.info(f"Resuming at generation {board.generation_number:,}, {options.n:,} generation/s to go.")
+        elif options.report_memory:
+            from conways.performance.memory import measure_construction
+
+            board, report = measure_construction(board_type, options.width, **board_args)
+            report.log()
+        else:
+            board = board_type(options.width, **board_args)
         logger.info(f"Total number of cells: {len(board):,}")
         ui = setup_ui(options, board)
-        if options.random:
+        if options.random and options.resume is None:
             board.set_random_board()
-        ui.run()
+        if options.pattern is not None:
+            load_pattern(board, options.pattern, Position(*options.at))
+        if options.profile is None:
+            ui.run()
+        else:
+            from conways.performance.profiler import profile_run
+
+            profile_run(ui.run, options.profile, options.profile_dir, options.sample_ms / 1000)
     except KeyboardInterrupt:
         logger.success('Exited Program via KeyboardInterrupt')
     except Exception as error:
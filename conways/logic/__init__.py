@@ -4,9 +4,12 @@ Logic for conways game of life.
 Author: Zack Hankin
 Started: 3/02/2023
 """
+import importlib
+from typing import Any, Iterator, Mapping
+
 from .util import (
     State, Position, NEIGHBOURS_DEFAULT, Colour, logger, Condition, ColourState, ALIVE_COLOUR,
-    DEAD_COLOUR, WHITE, BLACK,
+    DEAD_COLOUR, WHITE, BLACK, Window, progress, LogLevel,
     )
 
 __all__: list[str] = [
@@ -21,12 +24,77 @@ __all__: list[str] = [
     'DEAD_COLOUR',
     'WHITE',
     'BLACK',
+    'Window',
+    'progress',
+    'LogLevel',
     ]
 
-from .cell import Cell
+from .topology import TOPOLOGIES, fill_padding
+
+__all__ += ['TOPOLOGIES', 'fill_padding']
+
+from .neighbourhood import MOORE, Neighbourhood, count_cells
+
+__all__ += ['MOORE', 'Neighbourhood', 'count_cells']
+
+from .rules import NEIGHBOUR_ORDER, Rule, parse_rule
+
+__all__ += ['NEIGHBOUR_ORDER', 'Rule', 'parse_rule']
+
+ENGINE_CLASSES: dict[str, tuple[str, str]] = {
+    "board": ("board", "Board"),
+    "numpy": ("array_board", "ArrayBoard"),
+    "sparse": ("sparse_board", "SparseBoard"),
+    "hashlife": ("hashlife", "HashLifeBoard"),
+    "parallel": ("parallel_board", "ParallelBoard"),
+    "bitpacked": ("bit_board", "BitBoard"),
+    }
+# Names imported from their module the first time they are used.
+LAZY: dict[str, str] = {
+    **{name: module for module, name in ENGINE_CLASSES.values()},
+    "BoardPool": "board_pool",
+    "Checkpoint": "snapshot",
+    "Snapshot": "snapshot",
+    "open_snapshot": "snapshot",
+    "save_grid": "snapshot",
+    "load_pattern": "patterns",
+    "pattern_runs": "patterns",
+    "place_runs": "patterns",
+    "History": "history",
+    "Cell": "cell",
+    "CellView": "cell",
+    }
+
+__all__ += list(LAZY)
+
+
+class Engines(Mapping[str, type]):
+    """
+    Engine classes by name. An engine's module is imported the first time it is looked up, so a run only
+    loads the engine it uses.
+    """
+
+    def __getitem__(self, name: str) -> type:
+        module, engine = ENGINE_CLASSES[name]
+        return getattr(importlib.import_module(f".{module}", __name__), engine)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(ENGINE_CLASSES)
+
+    def __len__(self) -> int:
+        return len(ENGINE_CLASSES)
+
+
+ENGINES: Engines = Engines()
+
+__all__ += ["ENGINES"]
+
 
-__all__ += ['Cell']
+def __getattr__(name: str) -> Any:
+    if name not in LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{LAZY[name]}", __name__), name)
 
-from .board import Board
 
-__all__ += ["Board"]
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
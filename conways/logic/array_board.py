@@ -0,0 +1,342 @@
+"""
+array_board
+
+Numpy backed board. The whole grid is held in one uint8 array and the neighbour
+counts are summed from shifted slices of a padded copy, its border filled for the
+board's topology. Larger, hexagonal and von Neumann neighbourhoods are counted from
+summed-area tables instead.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from random import randint
+from typing import Generator, Optional
+
+import numpy as np
+
+from .cycle import Cycle, hash_bytes, hash_grid, run_until_cycle
+from .util import Condition, NEIGHBOURS_DEFAULT, Position, Window, logger, progress
+from ..performance.timer import Timer
+from .cell import CellView
+from .snapshot import Checkpoint, Snapshot, load_board, run_with_checkpoints, save_board
+from .rules import NEIGHBOUR_ORDER, Rule
+from .neighbourhood import MOORE, Neighbourhood, count_cells
+from .topology import check_topology, fill_padding
+
+
+def condition_table(condition: Condition, size: int = 9) -> np.ndarray:
+    """
+    Boolean lookup table for a Condition, indexed by number of alive neighbours.
+
+    Args:
+        condition (Condition): Condition to compile.
+        size (int): Length of the table. Default is 9, enough for a Moore neighbourhood.
+
+    Returns:
+        np.ndarray of uint8, 1 where the neighbour count is in the condition.
+    """
+    table = np.zeros(size, dtype=np.uint8)
+    table[[count for count in condition.contains if 0 <= count < size]] = 1
+    return table
+
+
+def count_neighbours(padded: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Sums the eight shifted neighbour slices of a padded grid, or a stack of them.
+
+    Args:
+        padded (np.ndarray): Grid with a one cell border on every side of the last two axes.
+        out (np.ndarray): Array to write the counts into, two smaller than padded in the last two axes.
+
+    Returns:
+        out
+    """
+    rows, columns = out.shape[-2:]
+    out[...] = 0
+    for offset in NEIGHBOURS_DEFAULT:
+        out += padded[..., 1 + offset.y:rows + 1 + offset.y, 1 + offset.x:columns + 1 + offset.x]
+    return out
+
+
+def count_changes(before: np.ndarray, after: np.ndarray) -> tuple[int, int]:
+    """
+    Births and deaths between two grids of states, only state 1 is alive.
+
+    Returns:
+        births, deaths
+    """
+    alive, was_alive = after == 1, before == 1
+    return int(np.count_nonzero(alive > was_alive)), int(np.count_nonzero(was_alive > alive))
+
+
+def neighbour_masks(padded: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Which of the eight neighbours are alive as a mask, bit k for NEIGHBOUR_ORDER[k], for non-totalistic rules.
+
+    Args:
+        padded (np.ndarray): 0 or 1 grid with a one cell border on every side of the last two axes.
+        out (np.ndarray): uint8 array to write the masks into, two smaller than padded in the last two axes.
+
+    Returns:
+        out
+    """
+    rows, columns = out.shape[-2:]
+    out[...] = 0
+    for bit, offset in enumerate(NEIGHBOUR_ORDER):
+        out |= padded[..., 1 + offset.y:rows + 1 + offset.y, 1 + offset.x:columns + 1 + offset.x] << bit
+    return out
+
+
+def neighbourhoods(padded: np.ndarray, out: np.ndarray, rule: np.ndarray) -> np.ndarray:
+    """
+    Fill out with the column of the rule table for every cell of a padded grid of states. Only alive cells,
+    state 1, are neighbours.
+
+    Args:
+        padded (np.ndarray): Grid of states with a one cell border on every side of the last two axes.
+        out (np.ndarray): uint8 array to write into, two smaller than padded in the last two axes.
+        rule (np.ndarray): rule[state, neighbourhood] -> next state, 9 columns for counts or 256 for masks.
+
+    Returns:
+        out
+    """
+    if rule.shape[0] > 2:
+        padded = (padded == 1).view(np.uint8)
+    if rule.shape[1] > 9:
+        return neighbour_masks(padded, out)
+    return count_neighbours(padded, out)
+
+
+class ArrayBoard:
+    """
+    Drop in replacement for Board that keeps the grid in a numpy array.
+
+    Runs any Rule, board[pos.y][pos.x] is 0 dead, 1 alive or 2 and up dying for Generations rules.
+    """
+
+    cycle: Optional[Cycle] = None
+    generation_number: int = 0
+    seed: Optional[int] = None
+    # Births and deaths of the last generation, only counted while counting is on.
+    counting: bool = False
+    counts: tuple[int, int] = (0, 0)
+
+    def __init__(
+            self,
+            num_of_cells: int,
+            live_conditions: Condition = Condition(2, 3),
+            birth_condition: Condition = Condition(3),
+            num_of_runs: int = 0,
+            loading_bar: bool = False,
+            height: Optional[int] = None,
+            topology: str = "bounded",
+            rule: Optional[Rule] = None,
+            ):
+        """
+
+        Args:
+            num_of_cells (int): Number of cells across the board.
+            live_conditions (Condition): the number of neighbours around a cell where you live.
+            birth_condition (Condition): number of neighbours which a cell is born.
+            height (int, Optional): Number of cells down the board. Default is num_of_cells.
+            topology (str): 'bounded', 'torus' or 'klein'. Default is 'bounded'.
+            rule (Rule, Optional): Generations, non-totalistic or Larger-than-Life rule, replaces the conditions.
+                                   Default is None.
+        """
+        self.num_of_runs = num_of_runs
+        self.board_size = self.width = num_of_cells
+        self.height: int = num_of_cells if height is None else height
+        self.topology: str = check_topology(topology)
+        self.board: np.ndarray = np.zeros((self.height, self.width), dtype=np.uint8)
+        self._padded: np.ndarray = np.zeros((self.height + 2, self.width + 2), dtype=np.uint8)
+        if rule is None:
+            rule = Rule.from_conditions(live_conditions, birth_condition)
+        else:
+            live_conditions, birth_condition = rule.live_conditions, rule.birth_condition
+        self.birth_condition = birth_condition
+        self.live_condition = live_conditions
+        self.rule_name: str = rule.name
+        self.states: int = rule.states
+        # rule[state, alive_neighbours] -> next state, alive_neighbours is a mask of them for non-totalistic rules
+        self.rule: np.ndarray = rule.table()
+        self.neighbourhood: Neighbourhood = rule.neighbourhood
+        self.alive_neighbours: np.ndarray = np.zeros(
+            self.board.shape, dtype=np.uint8 if self.rule.shape[1] <= 256 else np.uint16
+            )
+        logger.debug(f"Rule: {rule.name}, table: {self.rule.shape}")
+        self.loading_bar: bool = loading_bar
+        logger.success("Board initialised: ")
+
+    def __len__(self):
+        return self.board.size
+
+    @property
+    def population(self) -> int:
+        if self.states > 2:
+            return int(np.count_nonzero(self.board == 1))
+        return int(self.board.sum(dtype=np.int64))
+
+    def set_random_board(self, random_seed: Optional[int] = None) -> ArrayBoard:
+        """
+        Sets every cell in the board to a random state.
+
+        Args:
+            random_seed (int, Optional): Random seed value, if no seed is given will use a random value.
+                                         Default is None.
+
+        Returns:
+            Self
+        """
+        if random_seed is None:
+            random_seed = randint(0, 100)
+        logger.info(f"Random seed: {random_seed}")
+        self.seed = random_seed
+
+        random = np.random.default_rng(random_seed)
+        self.board ^= random.integers(0, 2, size=self.board.shape, dtype=np.uint8)
+        return self
+
+    def reset(self) -> ArrayBoard:
+        self.board[...] = 0
+        return self
+
+    @Timer.span("generation")
+    def generation(self) -> ArrayBoard:
+        """
+        One generation.
+
+        Returns:
+            Self
+        """
+        self.check_state()
+        self.update_state()
+        self.generation_number += 1
+        return self
+
+    def run_for_set_amount(
+            self, runs: Optional[int] = None, stop_on_cycle: bool = False, checkpoint: Optional[Checkpoint] = None
+            ):
+        runs = self.num_of_runs if runs is None else runs
+        self.cycle = None
+        if stop_on_cycle:
+            self.cycle = run_until_cycle(self, runs, loading_bar=self.loading_bar, checkpoint=checkpoint)
+            return
+        if checkpoint is not None:
+            run_with_checkpoints(self, runs, checkpoint, loading_bar=self.loading_bar)
+            return
+        match self.loading_bar:
+            case True:
+                for _ in progress(range(runs)):
+                    self.generation()
+            case False:
+                for _ in range(runs):
+                    self.generation()
+
+    @Timer.span("check_state")
+    def check_state(self) -> ArrayBoard:
+        """
+        Sums the eight shifted neighbour slices into alive_neighbours, or ORs them into a mask for
+        non-totalistic rules. Other neighbourhoods are counted with summed-area tables.
+
+        Returns:
+            Self
+        """
+        if self.neighbourhood != MOORE:
+            alive = self.board if self.states == 2 else (self.board == 1).view(np.uint8)
+            count_cells(alive, self.neighbourhood, self.topology, self.alive_neighbours)
+            return self
+        self._padded[1:-1, 1:-1] = self.board
+        fill_padding(self._padded, self.topology)
+        neighbourhoods(self._padded, self.alive_neighbours, self.rule)
+        return self
+
+    @Timer.span("update_state")
+    def update_state(self) -> ArrayBoard:
+        """
+        Update the state of every cell with one lookup in the rule table.
+
+        Returns:
+            Self
+        """
+        states = self.rule[self.board, self.alive_neighbours]
+        if self.counting:
+            self.counts = count_changes(self.board, states)
+        self.board[...] = states
+        return self
+
+    def toggle_cell(self, cell: Position) -> ArrayBoard:
+        self.board[cell.y, cell.x] = self.board[cell.y, cell.x] != 1
+        return self
+
+    def get_state(self, cell: Position) -> bool:
+        return bool(self.board[cell.y, cell.x] == 1)
+
+    def state_hash(self) -> bytes:
+        if self.states > 2:
+            # Dying cells are part of the state, boards with the same alive cells can still differ.
+            return hash_bytes(self.board.tobytes() + np.array(self.board.shape, dtype=np.int64).tobytes())
+        return hash_grid(self.board)
+
+    def set_state(self, cell: Position, is_alive: bool) -> ArrayBoard:
+        self.board[cell.y, cell.x] = is_alive
+        return self
+
+    def __iter__(self) -> Generator[tuple[Position, CellView], None, None]:
+        for j in range(self.height):
+            for i in range(self.width):
+                yield Position(i, j), CellView(i, j, self)
+
+    def save(self, path: Path | str) -> ArrayBoard:
+        """
+        Write the board to a snapshot file.
+        """
+        save_board(self, path)
+        return self
+
+    @classmethod
+    def load(cls, path: Path | str, **kwargs) -> ArrayBoard:
+        """
+        New board from a snapshot file, the size and rules come from the file and kwargs go to the constructor.
+        """
+        return load_board(cls, path, **kwargs)
+
+    def load_snapshot(self, snapshot: Snapshot) -> ArrayBoard:
+        if snapshot.states > 2:
+            self.board[...] = snapshot.grid()
+            return self
+        return self.load_grid(snapshot.grid())
+
+    def set_alive(self, ys: np.ndarray, xs: np.ndarray) -> ArrayBoard:
+        """
+        Set the cells at (xs[i], ys[i]) alive.
+
+        Returns:
+            Self
+        """
+        self.board[ys, xs] = 1
+        return self
+
+    def load_grid(self, grid: np.ndarray) -> ArrayBoard:
+        """
+        Replace the board with the cells of a grid[y, x] array.
+
+        Returns:
+            Self
+        """
+        self.board[...] = grid != 0
+        return self
+
+    def to_grid(self, window: Optional[Window] = None) -> np.ndarray:
+        """
+        The board as a uint8 array, grid[y, x]. Dying cells of a Generations rule are 0.
+
+        Args:
+            window (Window, Optional): Only copy the cells in this window. Default is the whole board.
+        """
+        cells = self.board if window is None else self.board[window.rows, window.columns]
+        if self.states > 2:
+            return (cells == 1).view(np.uint8)
+        return cells.copy()
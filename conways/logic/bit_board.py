@@ -0,0 +1,354 @@
+"""
+bit_board
+
+Bit packed board. Each row is stored as uint64 words, cell x of a row is bit x % 64 of word
+x // 64. A generation shifts whole words to line up the eight neighbours of 64 cells at once
+and adds them with bitwise full adders into a four bit count.
+
+On a torus or Klein bottle the bit shifted off one end of a row is ORed onto the other end,
+and the halo rows above the first row and below the last are the opposite edge rows, bit
+reversed for the Klein bottle.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from random import randint
+from typing import Generator, Optional
+
+import numpy as np
+
+from .cycle import Cycle, hash_bytes, run_until_cycle
+from .util import Condition, Position, Window, logger, progress
+from ..performance.timer import Timer
+from .cell import CellView
+from .snapshot import Checkpoint, Snapshot, load_board, run_with_checkpoints, save_board
+from .topology import check_topology
+
+
+WORD = np.dtype("<u8")
+WORD_BITS = 64
+ONE = np.uint64(1)
+TOP = np.uint64(WORD_BITS - 1)
+POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def popcount(words: np.ndarray) -> int:
+    """
+    Number of set bits in an array of words.
+    """
+    if hasattr(np, "bitwise_count"):
+        # numpy 2 counts in one pass, older versions look the bytes up in POPCOUNT.
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+    return int(POPCOUNT[words.view(np.uint8)].sum(dtype=np.int64))
+
+
+def shift_west(rows: np.ndarray) -> np.ndarray:
+    """
+    Moves every cell one column right, so each bit holds the state of its west neighbour.
+    """
+    out = rows << ONE
+    out[:, 1:] |= rows[:, :-1] >> TOP
+    return out
+
+
+def shift_east(rows: np.ndarray) -> np.ndarray:
+    """
+    Moves every cell one column left, so each bit holds the state of its east neighbour.
+    """
+    out = rows >> ONE
+    out[:, :-1] |= rows[:, 1:] << TOP
+    return out
+
+
+def reverse_row(row: np.ndarray, width: int) -> np.ndarray:
+    """
+    A packed row with its first width cells in reverse order.
+    """
+    cells = np.unpackbits(row.view(np.uint8), count=width, bitorder="little")
+    packed = np.zeros(row.size * 8, dtype=np.uint8)
+    bytes_ = np.packbits(cells[::-1], bitorder="little")
+    packed[:bytes_.size] = bytes_
+    return packed.view(WORD)
+
+
+def full_adder(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bitwise a + b + c.
+
+    Returns:
+        sum, carry
+    """
+    partial = a ^ b
+    return partial ^ c, (a & b) | (partial & c)
+
+
+def count_bits(neighbours: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bitwise sum of eight neighbour bitboards.
+
+    Returns:
+        The four bits of the count, least significant first.
+    """
+    n0, n1, n2, n3, n4, n5, n6, n7 = neighbours
+    s0, c0 = full_adder(n0, n1, n2)
+    s1, c1 = full_adder(n3, n4, n5)
+    s2, c2 = n6 ^ n7, n6 & n7
+    bit0, c3 = full_adder(s0, s1, s2)
+    s3, d0 = full_adder(c0, c1, c2)
+    bit1, d1 = s3 ^ c3, s3 & c3
+    return bit0, bit1, d0 ^ d1, d0 & d1
+
+
+class BitBoard:
+    """
+    Board packed 64 cells to a word.
+
+    board[y, x // 64] >> (x % 64) & 1
+    """
+
+    chunk_rows: int = 1024
+    cycle: Optional[Cycle] = None
+    generation_number: int = 0
+    seed: Optional[int] = None
+    # Births and deaths of the last generation, only counted while counting is on.
+    counting: bool = False
+    counts: tuple[int, int] = (0, 0)
+
+    def __init__(
+            self,
+            num_of_cells: int,
+            live_conditions: Condition = Condition(2, 3),
+            birth_condition: Condition = Condition(3),
+            num_of_runs: int = 0,
+            loading_bar: bool = False,
+            height: Optional[int] = None,
+            topology: str = "bounded",
+            ):
+        """
+
+        Args:
+            num_of_cells (int): Number of cells across the board.
+            live_conditions (Condition): the number of neighbours around a cell where you live.
+            birth_condition (Condition): number of neighbours which a cell is born.
+            height (int, Optional): Number of cells down the board. Default is num_of_cells.
+            topology (str): 'bounded', 'torus' or 'klein'. Default is 'bounded'.
+        """
+        self.num_of_runs = num_of_runs
+        self.board_size = self.width = num_of_cells
+        self.height: int = num_of_cells if height is None else height
+        self.topology: str = check_topology(topology)
+        self.words: int = -(-num_of_cells // WORD_BITS)
+        self.board: np.ndarray = np.zeros((self.height, self.words), dtype=WORD)
+        self._next: np.ndarray = np.zeros_like(self.board)
+        spare = self.words * WORD_BITS - num_of_cells
+        self.last_word_mask = np.uint64((1 << (WORD_BITS - spare)) - 1)
+        # Bit of the last word holding the last column.
+        self.last_bit = np.uint64(WORD_BITS - spare - 1)
+        self.birth_condition = birth_condition
+        self.live_condition = live_conditions
+        self.births: list[int] = sorted(count for count in birth_condition.contains if 0 <= count <= 8)
+        self.survives: list[int] = sorted(count for count in live_conditions.contains if 0 <= count <= 8)
+        logger.debug(f"Births: {self.births}, survives: {self.survives}")
+        self.loading_bar: bool = loading_bar
+        logger.success("Board initialised: ")
+
+    def __len__(self):
+        return self.width * self.height
+
+    @property
+    def population(self) -> int:
+        return popcount(self.board)
+
+    def set_random_board(self, random_seed: Optional[int] = None) -> BitBoard:
+        """
+        Sets every cell in the board to a random state.
+
+        Random words are drawn a chunk at a time, so a seed doesn't give the same board as ArrayBoard.
+
+        Args:
+            random_seed (int, Optional): Random seed value, if no seed is given will use a random value.
+                                         Default is None.
+
+        Returns:
+            Self
+        """
+        if random_seed is None:
+            random_seed = randint(0, 100)
+        logger.info(f"Random seed: {random_seed}")
+        self.seed = random_seed
+
+        random = np.random.default_rng(random_seed)
+        for start in range(0, self.height, self.chunk_rows):
+            rows = self.board[start:start + self.chunk_rows]
+            rows ^= random.integers(0, np.iinfo(WORD).max, size=rows.shape, dtype=WORD, endpoint=True)
+        self.board[:, -1] &= self.last_word_mask
+        return self
+
+    def reset(self) -> BitBoard:
+        self.board[...] = 0
+        return self
+
+    @Timer.span("generation")
+    def generation(self) -> BitBoard:
+        """
+        One generation, stepped a chunk of rows at a time to keep the temporaries small.
+
+        Returns:
+            Self
+        """
+        size = self.height
+        wrapped = self.topology != "bounded"
+        if wrapped:
+            above, below = self.board[-1], self.board[0]
+            if self.topology == "klein":
+                above, below = reverse_row(above, self.width), reverse_row(below, self.width)
+        for start in range(0, size, self.chunk_rows):
+            end = min(start + self.chunk_rows, size)
+            low, high = max(0, start - 1), min(size, end + 1)
+            # block[i] is board row start - 1 + i, rows off a bounded board stay dead.
+            block = np.zeros((end - start + 2, self.words), dtype=WORD)
+            block[low - start + 1:high - start + 1] = self.board[low:high]
+            if wrapped and start == 0:
+                block[0] = above
+            if wrapped and end == size:
+                block[-1] = below
+            self._next[start:end] = self._step_block(block)
+        self._next[:, -1] &= self.last_word_mask
+        if self.counting:
+            changed = self._next ^ self.board
+            births = popcount(changed & self._next)
+            self.counts = births, popcount(changed) - births
+        self.board, self._next = self._next, self.board
+        self.generation_number += 1
+        return self
+
+    def _step_block(self, block: np.ndarray) -> np.ndarray:
+        """
+        Next state of the inner rows of a block that has one halo row above and below.
+        """
+        west, east = shift_west(block), shift_east(block)
+        if self.topology != "bounded":
+            west[:, 0] |= block[:, -1] >> self.last_bit
+            east[:, -1] |= (block[:, 0] & ONE) << self.last_bit
+        alive = block[1:-1]
+        bits = count_bits([
+            block[:-2], west[:-2], east[:-2],
+            west[1:-1], east[1:-1],
+            block[2:], west[2:], east[2:],
+            ])
+        result = np.zeros_like(alive)
+        for count in range(9):
+            born, survives = count in self.births, count in self.survives
+            if not (born or survives):
+                continue
+            equal = np.full_like(alive, np.iinfo(WORD).max)
+            for bit_number, bit in enumerate(bits):
+                equal &= bit if count >> bit_number & 1 else ~bit
+            if not born:
+                equal &= alive
+            elif not survives:
+                equal &= ~alive
+            result |= equal
+        return result
+
+    def run_for_set_amount(
+            self, runs: Optional[int] = None, stop_on_cycle: bool = False, checkpoint: Optional[Checkpoint] = None
+            ):
+        runs = self.num_of_runs if runs is None else runs
+        self.cycle = None
+        if stop_on_cycle:
+            self.cycle = run_until_cycle(self, runs, loading_bar=self.loading_bar, checkpoint=checkpoint)
+            return
+        if checkpoint is not None:
+            run_with_checkpoints(self, runs, checkpoint, loading_bar=self.loading_bar)
+            return
+        match self.loading_bar:
+            case True:
+                for _ in progress(range(runs)):
+                    self.generation()
+            case False:
+                for _ in range(runs):
+                    self.generation()
+
+    def toggle_cell(self, cell: Position) -> BitBoard:
+        self.board[cell.y, cell.x // WORD_BITS] ^= ONE << np.uint64(cell.x % WORD_BITS)
+        return self
+
+    def get_state(self, cell: Position) -> bool:
+        return bool(self.board[cell.y, cell.x // WORD_BITS] >> np.uint64(cell.x % WORD_BITS) & ONE)
+
+    def state_hash(self) -> bytes:
+        return hash_bytes(self.board.tobytes())
+
+    def set_state(self, cell: Position, is_alive: bool) -> BitBoard:
+        if self.get_state(cell) != bool(is_alive):
+            self.toggle_cell(cell)
+        return self
+
+    def __iter__(self) -> Generator[tuple[Position, CellView], None, None]:
+        for j in range(self.height):
+            for i in range(self.width):
+                yield Position(i, j), CellView(i, j, self)
+
+    def save(self, path: Path | str) -> BitBoard:
+        """
+        Write the board to a snapshot file.
+        """
+        save_board(self, path)
+        return self
+
+    @classmethod
+    def load(cls, path: Path | str, **kwargs) -> BitBoard:
+        """
+        New board from a snapshot file, the size and rules come from the file and kwargs go to the constructor.
+        """
+        return load_board(cls, path, **kwargs)
+
+    def load_snapshot(self, snapshot: Snapshot) -> BitBoard:
+        """
+        Snapshot rows are already packed the same way as the board, the words are copied across as they are.
+        """
+        self.board[...] = np.asarray(snapshot.cells).view(WORD)
+        return self
+
+    def to_grid(self, window: Optional[Window] = None) -> np.ndarray:
+        """
+        The board as a uint8 array, grid[y, x].
+
+        Args:
+            window (Window, Optional): Only unpack the words covering this window. Default is the whole board.
+        """
+        if window is None:
+            window = Window(0, 0, self.width, self.height)
+        first = window.x // WORD_BITS
+        last = -(-(window.x + window.width) // WORD_BITS)
+        words = np.ascontiguousarray(self.board[window.rows, first:last])
+        cells = np.unpackbits(words.view(np.uint8), axis=1, bitorder="little")
+        start = window.x - first * WORD_BITS
+        return cells[:, start:start + window.width]
+
+    def set_alive(self, ys: np.ndarray, xs: np.ndarray) -> BitBoard:
+        """
+        Set the cells at (xs[i], ys[i]) alive.
+
+        Returns:
+            Self
+        """
+        np.bitwise_or.at(self.board, (ys, xs // WORD_BITS), ONE << (xs % WORD_BITS).astype(WORD))
+        return self
+
+    def load_grid(self, grid: np.ndarray) -> BitBoard:
+        """
+        Replace the board with the cells of a grid[y, x] array.
+
+        Returns:
+            Self
+        """
+        packed = np.zeros((self.height, self.words * 8), dtype=np.uint8)
+        bytes_ = np.packbits(grid != 0, axis=1, bitorder="little")
+        packed[:, :bytes_.shape[1]] = bytes_
+        self.board[...] = packed.view(WORD)
+        return self
@@ -6,23 +6,81 @@ Started: 3/02/2023
 """
 from __future__ import annotations
 
+from pathlib import Path
 from random import randint, Random
-from typing import Generator, Optional
-import tqdm as tqdm
+from typing import Generator, Iterable, Iterator, Optional
+import numpy as np
 
-from .util import Condition, NEIGHBOURS_DEFAULT, Position, logger
+from .cycle import Cycle, hash_grid, run_until_cycle
+from .util import Condition, NEIGHBOURS_DEFAULT, Position, Window, logger, progress
+from ..performance.timer import Timer
 from .cell import Cell
+from .snapshot import Checkpoint, Snapshot, load_board, run_with_checkpoints, save_board
+from .rules import Rule
+from .topology import check_topology
 
-logger.success(f"{__name__} importing...")
+
+def neighbour_indices(x: int, y: int, width: int, height: int, topology: str = "bounded") -> tuple[int, ...]:
+    """
+    Flat indices, y * width + x, of the neighbours of (x, y).
+
+    The edges are joined here for a torus or Klein bottle, so a generation never has to check for them.
+
+    Args:
+        x (int): Column of the cell.
+        y (int): Row of the cell.
+        width (int): Number of cells across the board.
+        height (int): Number of cells down the board.
+        topology (str): 'bounded', 'torus' or 'klein'. Default is 'bounded'.
+    """
+    indices = list()
+    for offset in NEIGHBOURS_DEFAULT:
+        i, j = x + offset.x, y + offset.y
+        if topology == "bounded":
+            if 0 <= i < width and 0 <= j < height:
+                indices.append(j * width + i)
+            continue
+        if not 0 <= j < height and topology == "klein":
+            i = width - 1 - i
+        indices.append(j % height * width + i % width)
+    return tuple(indices)
+
+
+def neighbour_table(width: int, height: int, topology: str = "bounded") -> Iterator[tuple[int, ...]]:
+    """
+    Neighbour indices of every cell, in row major order.
+
+    Made one cell at a time and not kept, the table of a large board runs to hundreds of MB.
+
+    Args:
+        width (int): Number of cells across the board.
+        height (int): Number of cells down the board.
+        topology (str): 'bounded', 'torus' or 'klein'. Default is 'bounded'.
+
+    Returns:
+        table[y * width + x] -> indices, y * width + x, of the neighbours of (x, y)
+    """
+    return (neighbour_indices(x, y, width, height, topology) for y in range(height) for x in range(width))
 
 
 class Board:
     """
     board[pos.y][pos.x]
+
+    Only the cells that changed last generation and their neighbours are re-evaluated, unless more
+    than full_sweep_fraction of the board changed.
     """
 
     neighbours = list(NEIGHBOURS_DEFAULT)
-    neighbours_dict: dict[Cell, list[Cell]] = dict()
+    neighbours_dict: dict[Cell, list[Cell]]
+    full_sweep_fraction: float = 0.1
+    cycle: Optional[Cycle] = None
+    generation_number: int = 0
+    seed: Optional[int] = None
+    # Bumped by every change made between generations, changed only holds what a generation did.
+    edits: int = 0
+    # Kept up to date by every change, so reading it doesn't walk the board.
+    population: int = 0
 
     def __init__(
             self,
@@ -30,21 +88,27 @@ class Board:
             live_conditions: Condition = Condition(2, 3),
             birth_condition: Condition = Condition(3),
             num_of_runs: int = 0,
-            loading_bar: bool = False
+            loading_bar: bool = False,
+            height: Optional[int] = None,
+            topology: str = "bounded",
             ):
         """
 
         Args:
-            num_of_cells (int): Number of cells across or down on the board.
+            num_of_cells (int): Number of cells across the board.
             live_conditions (Condition): the number of neighbours around a cell where you live.
             birth_condition (Condition): number of neighbours which a cell is born.
+            height (int, Optional): Number of cells down the board. Default is num_of_cells.
+            topology (str): 'bounded', 'torus' or 'klein'. Default is 'bounded'.
         """
 
         self.num_of_runs = num_of_runs
-        self.board_size = num_of_cells
+        self.board_size = self.width = num_of_cells
+        self.height: int = num_of_cells if height is None else height
+        self.topology: str = check_topology(topology)
         self.board: list[list[Cell]] = [
-            [Cell(i, j) for i in range(num_of_cells)]
-            for j in range(num_of_cells)
+            [Cell(i, j) for i in range(self.width)]
+            for j in range(self.height)
             ]
         self.set_neighbours()
         self.birth_condition = birth_condition
@@ -53,12 +117,24 @@ class Board:
         self.live_condition = live_conditions
         self.live_condition_set = self.live_condition.contains
         logger.debug(f"Live condition: {self.live_condition_set}")
+        # transitions[is_alive][alive_neighbours] -> next state
+        self.transitions: list[list[int]] = Rule.from_conditions(live_conditions, birth_condition).table().tolist()
         self.loading_bar: bool = loading_bar
+        self.changed: list[Position] = list()
+        self._dirty: set[Cell] | None = None
+        self._active: Iterable[Cell] = self.neighbours_dict.keys()
         logger.success("Board initialised: ")
 
     def __len__(self):
         return len(self.board) * len(self.board[0])
 
+    def count_population(self) -> int:
+        """
+        Count the alive cells into population, after changes that touch the whole board.
+        """
+        self.population = sum(cell.is_alive for row in self.board for cell in row)
+        return self.population
+
     def set_random_board(self, random_seed: Optional[int] = None) -> Board:
         """
         Sets every cell in the board to a random state.
@@ -70,22 +146,30 @@ class Board:
         Returns:
             Self
         """
-        if not random_seed:
+        if random_seed is None:
             random_seed = randint(0, 100)
         logger.info(f"Random seed: {random_seed}")
+        self.seed = random_seed
 
         random = Random(random_seed)
         for row in self.board:
             for cell in row:
                 if random.choice((True, False)):
                     cell.toggle()
+        self.count_population()
+        self._dirty = None
+        self.edits += 1
         return self
 
     def reset(self) -> Board:
         for cell in self.neighbours_dict.keys():
             cell.is_alive = False
+        self.population = 0
+        self._dirty = None
+        self.edits += 1
         return self
 
+    @Timer.span("generation")
     def generation(self) -> Board:
         """
         One generation.
@@ -95,51 +179,112 @@ class Board:
         """
         self.check_state()
         self.update_state()
+        self.generation_number += 1
         return self
 
-    def run_for_set_amount(self, runs: Optional[int] = None):
+    def run_for_set_amount(
+            self, runs: Optional[int] = None, stop_on_cycle: bool = False, checkpoint: Optional[Checkpoint] = None
+            ):
+        """
+        Run a number of generations.
+
+        Args:
+            runs (int, Optional): Number of generations. Default is num_of_runs.
+            stop_on_cycle (bool): Stop as soon as the board repeats a recent state, the Cycle found is left
+                                  in cycle. Default is False.
+            checkpoint (Checkpoint, Optional): Save the board every checkpoint.every generations.
+                                               Default is None.
+        """
         runs = self.num_of_runs if runs is None else runs
+        self.cycle = None
+        if stop_on_cycle:
+            self.cycle = run_until_cycle(self, runs, loading_bar=self.loading_bar, checkpoint=checkpoint)
+            return
+        if checkpoint is not None:
+            run_with_checkpoints(self, runs, checkpoint, loading_bar=self.loading_bar)
+            return
         match self.loading_bar:
             case True:
-                for _ in tqdm.trange(runs):
+                for _ in progress(range(runs)):
                     self.generation()
             case False:
                 for _ in range(runs):
                     self.generation()
 
+    @Timer.span("check_state")
     def check_state(self) -> Board:
         """
-        Checks the neighbours and updates each cell's count.
+        Checks the neighbours and updates the count of each active cell.
+
+        The active cells are the ones changed last generation and their neighbours, or every cell
+        after a reset or when too many changed.
+
         Returns:
             Self
         """
         # state_board = np.array(self.get_state_board())
+        dirty = self._dirty
+        if dirty is None or len(dirty) > self.full_sweep_fraction * len(self.neighbours_dict):
+            self._active = self.neighbours_dict.keys()
+        else:
+            active = set(dirty)
+            for cell in dirty:
+                active.update(self.neighbours_dict[cell])
+            self._active = active
 
-        for cell, neighbours in self.neighbours_dict.items():
-            # logger.trace(f'{cell}: {neighbours = }') # taxing on time only uncomment for tracing.
+        neighbours_dict = self.neighbours_dict
+        for cell in self._active:
             cell.alive_neighbours = 0
-            for neighbour in neighbours:
+            for neighbour in neighbours_dict[cell]:
                 if neighbour.is_alive:
                     cell.alive_neighbours += 1
         return self
 
+    @Timer.span("update_state")
     def update_state(self) -> Board:
         """
-        Update the state of every cell.
+        Update the state of every active cell.
+
+        The positions toggled are left in changed.
 
         Returns:
             Self
         """
-        for row in self.board:
-            for cell in row:
-                num_alive: int = cell.alive_neighbours
-                if (((not cell.is_alive) and (num_alive in self.birth_condition_set))
-                        or (cell.is_alive and (num_alive not in self.live_condition_set))):
-                    cell.toggle()
+        toggled: list[Cell] = list()
+        transitions = self.transitions
+        for cell in self._active:
+            if transitions[cell.is_alive][cell.alive_neighbours] != cell.is_alive:
+                toggled.append(cell)
+        births = 0
+        for cell in toggled:
+            births += cell.toggle().is_alive
+        self.population += 2 * births - len(toggled)
+        self.changed = [Position(cell.x, cell.y) for cell in toggled]
+        self._dirty = set(toggled)
         return self
 
+    def _mark_dirty(self, cell: Cell):
+        self.edits += 1
+        if self._dirty is not None:
+            self._dirty.add(cell)
+
     def toggle_cell(self, cell: Position) -> Board:
-        self.board[cell.y][cell.x].toggle()
+        toggled = self.board[cell.y][cell.x].toggle()
+        self.population += 1 if toggled.is_alive else -1
+        self._mark_dirty(toggled)
+        return self
+
+    def get_state(self, cell: Position) -> bool:
+        return self.board[cell.y][cell.x].is_alive
+
+    def state_hash(self) -> bytes:
+        return hash_grid(self.to_grid())
+
+    def set_state(self, cell: Position, is_alive: bool) -> Board:
+        target = self.board[cell.y][cell.x]
+        self.population += bool(is_alive) - target.is_alive
+        target.is_alive = is_alive
+        self._mark_dirty(self.board[cell.y][cell.x])
         return self
 
     def __iter__(self) -> Generator[tuple[Position, Cell], None, None]:
@@ -147,24 +292,72 @@ class Board:
             for i, cell in enumerate(row):
                 yield Position(i, j), cell
 
+    def save(self, path: Path | str) -> Board:
+        """
+        Write the board to a snapshot file.
+        """
+        save_board(self, path)
+        return self
+
+    @classmethod
+    def load(cls, path: Path | str, **kwargs) -> Board:
+        """
+        New board from a snapshot file, the size and rules come from the file and kwargs go to the constructor.
+        """
+        return load_board(cls, path, **kwargs)
+
+    def load_snapshot(self, snapshot: Snapshot) -> Board:
+        return self.load_grid(snapshot.grid())
+
+    def set_alive(self, ys: np.ndarray, xs: np.ndarray) -> Board:
+        """
+        Set the cells at (xs[i], ys[i]) alive.
+
+        Returns:
+            Self
+        """
+        for y, x in zip(ys.tolist(), xs.tolist()):
+            self.set_state(Position(x, y), True)
+        return self
+
+    def load_grid(self, grid: np.ndarray) -> Board:
+        """
+        Replace the board with the cells of a grid[y, x] array.
+
+        Returns:
+            Self
+        """
+        for row, values in zip(self.board, grid.tolist()):
+            for cell, value in zip(row, values):
+                cell.is_alive = bool(value)
+        self.count_population()
+        self._dirty = None
+        self.edits += 1
+        return self
+
+    def to_grid(self, window: Optional[Window] = None) -> np.ndarray:
+        """
+        The board as a uint8 array, grid[y, x].
+
+        Args:
+            window (Window, Optional): Only read the cells in this window. Default is the whole board.
+        """
+        if window is None:
+            window = Window(0, 0, self.width, self.height)
+        grid = np.zeros((window.height, window.width), dtype=np.uint8)
+        for j, row in enumerate(self.board[window.rows]):
+            grid[j] = [cell.is_alive for cell in row[window.columns]]
+        return grid
+
+    @Timer.span("set_neighbours")
     def set_neighbours(self):
-        self.neighbours_dict = dict()
-        for _, cell in iter(self):
-            neighbours = list()
-            for pos in self.neighbour_position(cell):
-                neighbours.append(self.board[pos.y][pos.x])
-            self.neighbours_dict[cell] = neighbours
+        cells = [cell for row in self.board for cell in row]
+        self.neighbours_dict = {
+            cell: [cells[index] for index in indices]
+            for cell, indices in zip(cells, neighbour_table(self.width, self.height, self.topology))
+            }
         return self
 
     def neighbour_position(self, cell: Cell | Position) -> list[Position]:
-        neighbours: list[Position] = list()
-        pos: Position = Position(cell.x, cell.y)
-        offset: Position
-        for idx, offset in enumerate(NEIGHBOURS_DEFAULT):
-            temp_pos: Position = Position(pos.x + offset.x, pos.y + offset.y)
-            if temp_pos.x < 0 or temp_pos.x > self.board_size - 1:
-                continue
-            if temp_pos.y < 0 or temp_pos.y > self.board_size - 1:
-                continue
-            neighbours.append(temp_pos)
-        return neighbours
+        indices = neighbour_indices(cell.x, cell.y, self.width, self.height, self.topology)
+        return [Position(index % self.width, index // self.width) for index in indices]
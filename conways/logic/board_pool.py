@@ -0,0 +1,152 @@
+"""
+board_pool
+
+Many independent boards of the same size stepped together. The boards are one
+(boards, rows, columns) uint8 array so a generation of every board is a single set of
+numpy operations, and each board can have its own rules.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+from random import randint
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .util import Condition, Position, logger, progress
+from ..performance.timer import Timer
+from .array_board import ArrayBoard, condition_table, count_neighbours
+from .topology import check_topology, fill_padding
+
+
+Conditions = tuple[Condition, Condition]
+
+
+class BoardPool:
+    """
+    Batch of boards stepped together.
+
+    board[k][pos.y][pos.x]
+    """
+
+    generation_number: int = 0
+
+    def __init__(
+            self,
+            num_of_boards: int,
+            num_of_cells: int,
+            live_conditions: Condition = Condition(2, 3),
+            birth_condition: Condition = Condition(3),
+            num_of_runs: int = 0,
+            loading_bar: bool = False,
+            rules: Optional[Sequence[Conditions]] = None,
+            height: Optional[int] = None,
+            topology: str = "bounded",
+            ):
+        """
+
+        Args:
+            num_of_boards (int): Number of boards in the pool.
+            num_of_cells (int): Number of cells across each board.
+            live_conditions (Condition): the number of neighbours around a cell where you live.
+            birth_condition (Condition): number of neighbours which a cell is born.
+            rules (Sequence[tuple[Condition, Condition]], Optional): (live_conditions, birth_condition)
+                for each board, overrides the conditions above. Default is None.
+            height (int, Optional): Number of cells down each board. Default is num_of_cells.
+            topology (str): 'bounded', 'torus' or 'klein', the same for every board. Default is 'bounded'.
+        """
+        if rules is None:
+            rules = [(live_conditions, birth_condition)] * num_of_boards
+        if len(rules) != num_of_boards:
+            raise ValueError(f"Expected {num_of_boards} rules, got {len(rules)}.")
+        self.num_of_runs = num_of_runs
+        self.board_size = self.width = num_of_cells
+        self.height: int = num_of_cells if height is None else height
+        self.topology: str = check_topology(topology)
+        self.rules: list[Conditions] = list(rules)
+        self.board: np.ndarray = np.zeros((num_of_boards, self.height, self.width), dtype=np.uint8)
+        self._padded: np.ndarray = np.zeros((num_of_boards, self.height + 2, self.width + 2), dtype=np.uint8)
+        self.alive_neighbours: np.ndarray = np.zeros_like(self.board)
+        # rule[k, state, alive_neighbours] -> next state of board k
+        self.rule: np.ndarray = np.stack([
+            np.stack((condition_table(birth), condition_table(live))) for live, birth in self.rules
+            ])
+        self._index: np.ndarray = np.arange(num_of_boards).reshape(-1, 1, 1)
+        self.loading_bar: bool = loading_bar
+        logger.success(f"Pool of {num_of_boards} boards initialised: ")
+
+    def __len__(self):
+        return self.board.shape[0]
+
+    def __getitem__(self, k: int) -> ArrayBoard:
+        """
+        ArrayBoard sharing the cells of board k, changes to either show in both.
+        """
+        live, birth = self.rules[k]
+        board = ArrayBoard(
+            self.width, live, birth, self.num_of_runs, self.loading_bar, height=self.height, topology=self.topology
+            )
+        board.board = self.board[k]
+        return board
+
+    @property
+    def population(self) -> np.ndarray:
+        return self.board.sum(axis=(1, 2), dtype=np.int64)
+
+    def set_random_board(self, random_seeds: Optional[Sequence[Optional[int]]] = None) -> BoardPool:
+        """
+        Sets every cell of every board to a random state.
+
+        Each board uses the same draw as ArrayBoard, so a seed gives the same board as a lone run.
+
+        Args:
+            random_seeds (Sequence[int], Optional): Random seed for each board, missing seeds use a
+                                                    random value. Default is None.
+
+        Returns:
+            Self
+        """
+        if random_seeds is None:
+            random_seeds = [None] * len(self)
+        for board, random_seed in zip(self.board, random_seeds):
+            if random_seed is None:
+                random_seed = randint(0, 100)
+            logger.info(f"Random seed: {random_seed}")
+            random = np.random.default_rng(random_seed)
+            board ^= random.integers(0, 2, size=board.shape, dtype=np.uint8)
+        return self
+
+    def reset(self) -> BoardPool:
+        self.board[...] = 0
+        return self
+
+    @Timer.span("generation")
+    def generation(self) -> BoardPool:
+        """
+        One generation of every board.
+
+        Returns:
+            Self
+        """
+        self._padded[:, 1:-1, 1:-1] = self.board
+        fill_padding(self._padded, self.topology)
+        count_neighbours(self._padded, self.alive_neighbours)
+        self.board[...] = self.rule[self._index, self.board, self.alive_neighbours]
+        self.generation_number += 1
+        return self
+
+    def run_for_set_amount(self, runs: Optional[int] = None):
+        runs = self.num_of_runs if runs is None else runs
+        match self.loading_bar:
+            case True:
+                for _ in progress(range(runs)):
+                    self.generation()
+            case False:
+                for _ in range(runs):
+                    self.generation()
+
+    def toggle_cell(self, k: int, cell: Position) -> BoardPool:
+        self.board[k, cell.y, cell.x] ^= 1
+        return self
@@ -9,12 +9,9 @@ Started: 3/02/2023
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from turtle import position
 
 from .util import State, Position, NEIGHBOURS_DEFAULT, Colour, logger
 
-logger.success(f"{__name__} importing...")
-
 
 @dataclass(slots=True)
 class Cell:
@@ -44,3 +41,44 @@ class Cell:
 
     def __repr__(self) -> str:
         return f"Cell({self.x}, {self.y}, {State(self.is_alive).name})"
+
+
+class CellView:
+    """
+    Cell stand-in for boards that don't keep a Cell object per position.
+
+    The state is read from and written to the owning board on access.
+    """
+    __slots__ = ("x", "y", "_board")
+
+    def __init__(self, x: int, y: int, board):
+        self.x: int = x
+        self.y: int = y
+        self._board = board
+
+    @property
+    def is_alive(self) -> bool:
+        return self._board.get_state(Position(self.x, self.y))
+
+    @is_alive.setter
+    def is_alive(self, value: bool):
+        self._board.set_state(Position(self.x, self.y), value)
+
+    def toggle(self) -> CellView:
+        """
+        Toggle the cell from alive to dead.
+
+        Returns:
+            Self
+        """
+        self._board.toggle_cell(Position(self.x, self.y))
+        return self
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
+
+    def __eq__(self, other):
+        return (self.x, self.y) == (other.x, other.y)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.x}, {self.y}, {State(self.is_alive).name})"
@@ -0,0 +1,95 @@
+"""
+cycle
+
+Fixed point and cycle detection. Boards are hashed every generation and the hashes of the
+most recent states are kept in a bounded cache, a repeated hash means the board has entered
+a cycle.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from .snapshot import Checkpoint
+from .util import logger, progress
+
+
+class Cycle(NamedTuple):
+    """
+    Cycle found while running a board. A period of 1 is a fixed point.
+    """
+    first_seen: int
+    period: int
+
+    @property
+    def generations_run(self) -> int:
+        return self.first_seen + self.period
+
+
+def hash_bytes(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def hash_grid(grid: np.ndarray) -> bytes:
+    """
+    Hash of a grid[y, x] array, packed to one bit per cell first.
+    """
+    return hash_bytes(np.packbits(grid != 0).tobytes() + np.array(grid.shape, dtype=np.int64).tobytes())
+
+
+class StateCache:
+    """
+    Bounded cache of state hash -> generation, the oldest state is dropped first.
+    """
+
+    def __init__(self, size: int = 64):
+        self.size = size
+        self.seen: OrderedDict[bytes, int] = OrderedDict()
+
+    def check(self, state: bytes, generation: int) -> Optional[Cycle]:
+        """
+        Record a state, returns the Cycle if it has been seen before.
+        """
+        first_seen = self.seen.get(state)
+        if first_seen is not None:
+            return Cycle(first_seen, generation - first_seen)
+        self.seen[state] = generation
+        if len(self.seen) > self.size:
+            self.seen.popitem(last=False)
+        return None
+
+
+def run_until_cycle(
+        board, runs: int, history: int = 64, loading_bar: bool = False, checkpoint: Optional[Checkpoint] = None
+        ) -> Optional[Cycle]:
+    """
+    Run a board for up to runs generations, stopping as soon as it repeats a state.
+
+    Args:
+        board: Board of any engine with generation() and state_hash().
+        runs (int): Max generations to run.
+        history (int): Number of recent states to remember, the longest period that can be found.
+        loading_bar (bool): Show a loading bar over the generations.
+        checkpoint (Checkpoint, Optional): Save the board every checkpoint.every generations.
+
+    Returns:
+        Cycle with generations counted from the start of the run, None if no cycle was found.
+    """
+    cache = StateCache(history)
+    cache.check(board.state_hash(), 0)
+    generations = progress(range(1, runs + 1)) if loading_bar else range(1, runs + 1)
+    for generation in generations:
+        board.generation()
+        if checkpoint is not None:
+            checkpoint.update(board)
+        cycle = cache.check(board.state_hash(), generation)
+        if cycle is not None:
+            logger.info(f"Cycle of period {cycle.period} first seen at generation {cycle.first_seen:,}.")
+            return cycle
+    return None
@@ -0,0 +1,567 @@
+"""
+hashlife
+
+HashLife engine. The plane is a canonical quadtree, every distinct node exists once and the
+result of advancing a node is memoised, so repeated structure in space and time is only ever
+computed once. run_for_set_amount advances in power of two jumps, one per set bit of runs.
+
+The plane is unbounded, cells that leave the board are still simulated. Only the
+width x height window from (0, 0) is shown and exported, so the only topology is bounded.
+Cycles are found from a hash of the whole plane, so a pattern leaving the window isn't a cycle.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from random import randint
+from typing import Generator, Optional
+
+import numpy as np
+
+from .cycle import Cycle, hash_bytes, run_until_cycle
+from .util import Condition, NEIGHBOURS_DEFAULT, Position, Window, logger, progress
+from ..performance.timer import Timer
+from .cell import CellView
+from .board import Board
+from .snapshot import Checkpoint, Snapshot, load_board, run_with_checkpoints, save_board
+from .topology import check_topology
+
+
+class Node:
+    """
+    Quadtree node of level k covering 2**k x 2**k cells.
+
+    a b
+    c d
+    """
+    __slots__ = ("k", "a", "b", "c", "d", "n")
+
+    def __init__(self, k: int, a: Node | None, b: Node | None, c: Node | None, d: Node | None, n: int):
+        self.k: int = k
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.n: int = n
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(k={self.k}, n={self.n})"
+
+
+class HashLifeBoard:
+    """
+    Board that runs generations with HashLife.
+    """
+
+    cycle: Optional[Cycle] = None
+    generation_number: int = 0
+    seed: Optional[int] = None
+
+    def __init__(
+            self,
+            num_of_cells: int,
+            live_conditions: Condition = Condition(2, 3),
+            birth_condition: Condition = Condition(3),
+            num_of_runs: int = 0,
+            loading_bar: bool = False,
+            cache_size: int = 1_000_000,
+            height: Optional[int] = None,
+            topology: str = "bounded",
+            ):
+        """
+
+        Args:
+            num_of_cells (int): Number of cells across the board window.
+            live_conditions (Condition): the number of neighbours around a cell where you live.
+            birth_condition (Condition): number of neighbours which a cell is born.
+            cache_size (int): Number of canonical nodes kept before the caches are rebuilt from the
+                              current pattern.
+            height (int, Optional): Number of cells down the board window. Default is num_of_cells.
+            topology (str): Only 'bounded', the plane has no edges to join.
+        """
+        if 0 in birth_condition:
+            raise ValueError(f"{self.__class__.__name__} can't run rules where a cell is born with 0 neighbours.")
+        if check_topology(topology) != "bounded":
+            raise ValueError(f"{self.__class__.__name__} runs on an unbounded plane, it can't use the {topology} topology.")
+        self.num_of_runs = num_of_runs
+        self.board_size = self.width = num_of_cells
+        self.height: int = num_of_cells if height is None else height
+        self.topology: str = topology
+        self.birth_condition = birth_condition
+        self.birth_condition_set = self.birth_condition.contains
+        logger.debug(f"Birth condition: {self.birth_condition_set}")
+        self.live_condition = live_conditions
+        self.live_condition_set = self.live_condition.contains
+        logger.debug(f"Live condition: {self.live_condition_set}")
+        self.loading_bar: bool = loading_bar
+        self.cache_size: int = cache_size
+
+        self.off: Node = Node(0, None, None, None, None, 0)
+        self.on: Node = Node(0, None, None, None, None, 1)
+        self._joins: dict[tuple[Node, Node, Node, Node], Node] = dict()
+        self._successors: dict[tuple[Node, int], Node] = dict()
+        self._empties: list[Node] = [self.off]
+        self._digests: dict[Node, bytes] = dict()
+
+        self.root: Node = self.off
+        self.origin: Position = Position(0, 0)
+        self.reset()
+        logger.success("Board initialised: ")
+
+    def __len__(self):
+        return self.width * self.height
+
+    @property
+    def population(self) -> int:
+        return self.root.n
+
+    # Quadtree
+
+    def join(self, a: Node, b: Node, c: Node, d: Node) -> Node:
+        """
+        Canonical node with the four given quadrants.
+        """
+        key = (a, b, c, d)
+        node = self._joins.get(key)
+        if node is None:
+            node = Node(a.k + 1, a, b, c, d, a.n + b.n + c.n + d.n)
+            self._joins[key] = node
+        return node
+
+    def empty(self, k: int) -> Node:
+        """
+        Canonical empty node of level k.
+        """
+        while len(self._empties) <= k:
+            smaller = self._empties[-1]
+            self._empties.append(self.join(smaller, smaller, smaller, smaller))
+        return self._empties[k]
+
+    def centre(self, node: Node) -> Node:
+        """
+        Node one level up with the given node in the middle, surrounded by empty space.
+        """
+        z = self.empty(node.k - 1)
+        return self.join(
+            self.join(z, z, z, node.a),
+            self.join(z, z, node.b, z),
+            self.join(z, node.c, z, z),
+            self.join(node.d, z, z, z),
+            )
+
+    def _life_4x4(self, node: Node) -> Node:
+        """
+        Centre 2x2 of a level 2 node after one generation.
+        """
+        grid = (
+            (node.a.a.n, node.a.b.n, node.b.a.n, node.b.b.n),
+            (node.a.c.n, node.a.d.n, node.b.c.n, node.b.d.n),
+            (node.c.a.n, node.c.b.n, node.d.a.n, node.d.b.n),
+            (node.c.c.n, node.c.d.n, node.d.c.n, node.d.d.n),
+            )
+
+        def step(x: int, y: int) -> Node:
+            num_alive = sum(grid[y + offset.y][x + offset.x] for offset in NEIGHBOURS_DEFAULT)
+            if grid[y][x]:
+                return self.on if num_alive in self.live_condition_set else self.off
+            return self.on if num_alive in self.birth_condition_set else self.off
+
+        return self.join(step(1, 1), step(2, 1), step(1, 2), step(2, 2))
+
+    def successor(self, node: Node, j: Optional[int] = None) -> Node:
+        """
+        Centre of a node, one level down, advanced 2**j generations.
+
+        Args:
+            node (Node): Node of level 2 or more.
+            j (int, Optional): log2 of the generations to advance, capped at node.k - 2.
+                               Default is node.k - 2.
+
+        Returns:
+            Node of level node.k - 1
+        """
+        j = node.k - 2 if j is None else min(j, node.k - 2)
+        key = (node, j)
+        result = self._successors.get(key)
+        if result is not None:
+            return result
+
+        if node.n == 0:
+            result = node.a
+        elif node.k == 2:
+            result = self._life_4x4(node)
+        else:
+            a, b, c, d = node.a, node.b, node.c, node.d
+            join, successor = self.join, self.successor
+            c1 = successor(a, j)
+            c2 = successor(join(a.b, b.a, a.d, b.c), j)
+            c3 = successor(b, j)
+            c4 = successor(join(a.c, a.d, c.a, c.b), j)
+            c5 = successor(join(a.d, b.c, c.b, d.a), j)
+            c6 = successor(join(b.c, b.d, d.a, d.b), j)
+            c7 = successor(c, j)
+            c8 = successor(join(c.b, d.a, c.d, d.c), j)
+            c9 = successor(d, j)
+            if j < node.k - 2:
+                result = join(
+                    join(c1.d, c2.c, c4.b, c5.a),
+                    join(c2.d, c3.c, c5.b, c6.a),
+                    join(c4.d, c5.c, c7.b, c8.a),
+                    join(c5.d, c6.c, c8.b, c9.a),
+                    )
+            else:
+                result = join(
+                    successor(join(c1, c2, c4, c5), j),
+                    successor(join(c2, c3, c5, c6), j),
+                    successor(join(c4, c5, c7, c8), j),
+                    successor(join(c5, c6, c8, c9), j),
+                    )
+        self._successors[key] = result
+        return result
+
+    def _is_padded(self, node: Node) -> bool:
+        """
+        True if all the population sits in the inner half of the node.
+        """
+        return node.k >= 3 and node.n == node.a.d.n + node.b.c.n + node.c.b.n + node.d.a.n
+
+    def _expand(self) -> HashLifeBoard:
+        """
+        Grow the root by one level, keeping it centred on the same cells.
+        """
+        half = 1 << (self.root.k - 1)
+        self.root = self.centre(self.root)
+        self.origin = Position(self.origin.x - half, self.origin.y - half)
+        return self
+
+    def _collect(self) -> HashLifeBoard:
+        """
+        Evict the node caches, keeping only the nodes of the current root.
+        """
+        logger.debug(f"Evicting {len(self._joins):,} nodes and {len(self._successors):,} results.")
+        self._joins = dict()
+        self._successors = dict()
+        self._empties = [self.off]
+        self._digests = dict()
+        interned: dict[int, Node] = {id(self.off): self.off, id(self.on): self.on}
+
+        def intern(node: Node) -> Node:
+            new = interned.get(id(node))
+            if new is None:
+                new = self.join(intern(node.a), intern(node.b), intern(node.c), intern(node.d))
+                interned[id(node)] = new
+            return new
+
+        self.root = intern(self.root)
+        return self
+
+    def digest(self, node: Node) -> bytes:
+        """
+        Hash of the cells of a node, equal nodes hash the same across cache rebuilds.
+        """
+        digest = self._digests.get(node)
+        if digest is None:
+            if node.k == 0:
+                digest = bytes([node.n])
+            else:
+                digest = hash_bytes(b"".join(map(self.digest, (node.a, node.b, node.c, node.d))))
+            self._digests[node] = digest
+        return digest
+
+    @Timer.span("jump")
+    def jump(self, j: int) -> HashLifeBoard:
+        """
+        Advance the board 2**j generations.
+
+        Returns:
+            Self
+        """
+        while self.root.k < j + 2 or not self._is_padded(self.root):
+            self._expand()
+        self.root = self.successor(self.centre(self.root), j)
+        self.generation_number += 1 << j
+        if len(self._joins) > self.cache_size:
+            self._collect()
+        return self
+
+    # Board API
+
+    def set_random_board(self, random_seed: Optional[int] = None) -> HashLifeBoard:
+        """
+        Sets every cell in the board to a random state.
+
+        Uses the same draw as ArrayBoard so a seed gives the same board on both.
+
+        Args:
+            random_seed (int, Optional): Random seed value, if no seed is given will use a random value.
+                                         Default is None.
+
+        Returns:
+            Self
+        """
+        if random_seed is None:
+            random_seed = randint(0, 100)
+        logger.info(f"Random seed: {random_seed}")
+        self.seed = random_seed
+
+        random = np.random.default_rng(random_seed)
+        grid = self.to_grid() ^ random.integers(0, 2, size=(self.height, self.width), dtype=np.uint8)
+        return self.load_grid(grid)
+
+    def reset(self) -> HashLifeBoard:
+        self.root = self.empty(max(3, (max(self.width, self.height) - 1).bit_length()))
+        self.origin = Position(0, 0)
+        return self
+
+    @Timer.span("generation")
+    def generation(self) -> HashLifeBoard:
+        """
+        One generation.
+
+        Returns:
+            Self
+        """
+        return self.jump(0)
+
+    def run_for_set_amount(
+            self, runs: Optional[int] = None, stop_on_cycle: bool = False, checkpoint: Optional[Checkpoint] = None
+            ):
+        runs = self.num_of_runs if runs is None else runs
+        self.cycle = None
+        if stop_on_cycle:
+            self.cycle = run_until_cycle(self, runs, loading_bar=self.loading_bar, checkpoint=checkpoint)
+            return
+        if checkpoint is not None:
+            run_with_checkpoints(self, runs, checkpoint, loading_bar=self.loading_bar)
+            return
+        jumps = [j for j in range(runs.bit_length()) if runs >> j & 1]
+        match self.loading_bar:
+            case True:
+                for j in progress(jumps):
+                    self.jump(j)
+            case False:
+                for j in jumps:
+                    self.jump(j)
+
+    def get_state(self, cell: Position) -> bool:
+        x, y = cell.x - self.origin.x, cell.y - self.origin.y
+        node = self.root
+        if not (0 <= x < 1 << node.k and 0 <= y < 1 << node.k):
+            return False
+        while node.k > 0 and node.n:
+            half = 1 << (node.k - 1)
+            if y < half:
+                node = node.a if x < half else node.b
+            else:
+                node = node.c if x < half else node.d
+            x, y = x % half, y % half
+        return bool(node.n)
+
+    def state_hash(self) -> bytes:
+        """
+        Hash of every alive cell on the plane, off the board window too.
+
+        The root is trimmed to the smallest node still holding the population first, so the same cells
+        hash the same however far the root has been expanded.
+        """
+        if self.root.n == 0:
+            return hash_bytes(b"")
+        root, origin = self.root, self.origin
+        while self._is_padded(root):
+            quarter = 1 << (root.k - 2)
+            root = self.join(root.a.d, root.b.c, root.c.b, root.d.a)
+            origin = Position(origin.x + quarter, origin.y + quarter)
+        return hash_bytes(self.digest(root) + np.array([root.k, *origin], dtype=np.int64).tobytes())
+
+    def set_state(self, cell: Position, is_alive: bool) -> HashLifeBoard:
+        while not (0 <= cell.x - self.origin.x < 1 << self.root.k and 0 <= cell.y - self.origin.y < 1 << self.root.k):
+            self._expand()
+
+        def put(node: Node, x: int, y: int) -> Node:
+            if node.k == 0:
+                return self.on if is_alive else self.off
+            half = 1 << (node.k - 1)
+            a, b, c, d = node.a, node.b, node.c, node.d
+            if y < half:
+                if x < half:
+                    a = put(a, x, y)
+                else:
+                    b = put(b, x - half, y)
+            elif x < half:
+                c = put(c, x, y - half)
+            else:
+                d = put(d, x - half, y - half)
+            return self.join(a, b, c, d)
+
+        self.root = put(self.root, cell.x - self.origin.x, cell.y - self.origin.y)
+        return self
+
+    def toggle_cell(self, cell: Position) -> HashLifeBoard:
+        return self.set_state(cell, not self.get_state(cell))
+
+    def __iter__(self) -> Generator[tuple[Position, CellView], None, None]:
+        for j in range(self.height):
+            for i in range(self.width):
+                yield Position(i, j), CellView(i, j, self)
+
+    # Import and export
+
+    def alive_cells(self, window: Optional[Window] = None) -> Generator[Position, None, None]:
+        """
+        Every alive cell inside the board window, or inside window when given.
+        """
+        if window is None:
+            window = Window(0, 0, self.width, self.height)
+        left, top = window.x, window.y
+        right, bottom = window.x + window.width, window.y + window.height
+
+        def walk(node: Node, x: int, y: int) -> Generator[Position, None, None]:
+            width = 1 << node.k
+            if node.n == 0 or x >= right or y >= bottom or x + width <= left or y + width <= top:
+                return
+            if node.k == 0:
+                yield Position(x, y)
+                return
+            half = width >> 1
+            yield from walk(node.a, x, y)
+            yield from walk(node.b, x + half, y)
+            yield from walk(node.c, x, y + half)
+            yield from walk(node.d, x + half, y + half)
+
+        yield from walk(self.root, self.origin.x, self.origin.y)
+
+    def save(self, path: Path | str) -> HashLifeBoard:
+        """
+        Write the board to a snapshot file.
+        """
+        save_board(self, path)
+        return self
+
+    @classmethod
+    def load(cls, path: Path | str, **kwargs) -> HashLifeBoard:
+        """
+        New board from a snapshot file, the size and rules come from the file and kwargs go to the constructor.
+        """
+        return load_board(cls, path, **kwargs)
+
+    def load_snapshot(self, snapshot: Snapshot) -> HashLifeBoard:
+        return self.load_grid(snapshot.grid())
+
+    def to_grid(self, window: Optional[Window] = None) -> np.ndarray:
+        """
+        The board window as a uint8 array, grid[y, x].
+
+        Args:
+            window (Window, Optional): Only walk the part of the tree in this window. Default is the whole board.
+        """
+        if window is None:
+            window = Window(0, 0, self.width, self.height)
+        grid = np.zeros((window.height, window.width), dtype=np.uint8)
+        left, top = window.x, window.y
+        right, bottom = window.x + window.width, window.y + window.height
+        blocks: dict[Node, np.ndarray] = dict()
+
+        def cells(node: Node) -> np.ndarray:
+            block = blocks.get(node)
+            if block is None:
+                if node.k == 0:
+                    block = np.array([[node.n]], dtype=np.uint8)
+                else:
+                    block = np.block([[cells(node.a), cells(node.b)], [cells(node.c), cells(node.d)]])
+                blocks[node] = block
+            return block
+
+        def walk(node: Node, x: int, y: int):
+            width = 1 << node.k
+            if node.n == 0 or x >= right or y >= bottom or x + width <= left or y + width <= top:
+                return
+            if node.k <= 2:
+                # Small nodes repeat a lot, paste their cells as one block.
+                x0, y0 = max(x, left), max(y, top)
+                x1, y1 = min(x + width, right), min(y + width, bottom)
+                grid[y0 - top:y1 - top, x0 - left:x1 - left] = cells(node)[y0 - y:y1 - y, x0 - x:x1 - x]
+                return
+            half = width >> 1
+            walk(node.a, x, y)
+            walk(node.b, x + half, y)
+            walk(node.c, x, y + half)
+            walk(node.d, x + half, y + half)
+
+        walk(self.root, self.origin.x, self.origin.y)
+        return grid
+
+    def set_alive(self, ys: np.ndarray, xs: np.ndarray) -> HashLifeBoard:
+        """
+        Set the cells at (xs[i], ys[i]) alive. The tree is rebuilt from the board window, so
+        set as many cells at once as possible.
+
+        Returns:
+            Self
+        """
+        grid = self.to_grid()
+        grid[ys, xs] = 1
+        return self.load_grid(grid)
+
+    def load_grid(self, grid: np.ndarray) -> HashLifeBoard:
+        """
+        Replace the plane with the cells of a grid[y, x] array placed at (0, 0).
+
+        The tree is built bottom up, each level pairs up 2x2 blocks of node ids and only joins the
+        distinct blocks.
+
+        Returns:
+            Self
+        """
+        k = max(3, (max(grid.shape) - 1).bit_length())
+        ids = np.zeros((1 << k, 1 << k), dtype=np.int64)
+        ids[:grid.shape[0], :grid.shape[1]] = grid != 0
+        nodes: list[Node] = [self.off, self.on]
+        for _ in range(k):
+            quads = np.stack(
+                (ids[0::2, 0::2], ids[0::2, 1::2], ids[1::2, 0::2], ids[1::2, 1::2]), axis=-1
+                )
+            unique, inverse = np.unique(quads.reshape(-1, 4), axis=0, return_inverse=True)
+            nodes = [self.join(nodes[a], nodes[b], nodes[c], nodes[d]) for a, b, c, d in unique.tolist()]
+            ids = inverse.reshape(quads.shape[:2])
+        self.root = nodes[int(ids[0, 0])]
+        self.origin = Position(0, 0)
+        return self
+
+    @classmethod
+    def from_board(cls, board, **kwargs) -> HashLifeBoard:
+        """
+        HashLifeBoard with the size, rules and cells of another board.
+        """
+        kwargs.setdefault("live_conditions", board.live_condition)
+        kwargs.setdefault("birth_condition", board.birth_condition)
+        kwargs.setdefault("num_of_runs", board.num_of_runs)
+        kwargs.setdefault("height", board.height)
+        hashlife = cls(board.width, **kwargs)
+        grid = np.zeros((board.height, board.width), dtype=np.uint8)
+        for position, cell in iter(board):
+            grid[position.y, position.x] = cell.is_alive
+        return hashlife.load_grid(grid)
+
+    def to_board(self, board_type: type = Board):
+        """
+        Export the board window into a regular board.
+
+        Args:
+            board_type (type): Board class to build. Default is Board.
+
+        Returns:
+            board_type instance with the alive cells of this board.
+        """
+        board = board_type(
+            self.width,
+            height=self.height,
+            live_conditions=self.live_condition,
+            birth_condition=self.birth_condition,
+            num_of_runs=self.num_of_runs,
+            loading_bar=self.loading_bar,
+            )
+        for cell in self.alive_cells():
+            board.set_state(cell, True)
+        return board
@@ -0,0 +1,201 @@
+"""
+history
+
+Generation history kept in an append-only file. Every keyframe_every generations the whole
+grid is stored bit-packed, the generations in between only store the flat indices of the
+cells that flipped. A second append-only file indexes the records, so seeking to any
+generation reads one keyframe and at most keyframe_every - 1 deltas.
+
+    history file  16 byte header (b"CGHI", version u2, reserved u2, width u4, height u4)
+                  then records of generation u8, kind u1, length u4 and length bytes
+    index file    generation u8, offset u8, kind u1 for each record
+
+Boards that keep the cells a generation changed, like Board, have their deltas written from
+those. The other engines are diffed against a copy of the last grid recorded.
+
+Recording a generation that has already been recorded, after stepping back and changing the
+board, starts a new branch. The records after it are dropped from the index in memory but
+stay in the files, and a reader replaying the index drops them the same way.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import bisect
+import struct
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import numpy as np
+
+from .util import logger
+
+
+MAGIC: bytes = b"CGHI"
+VERSION: int = 1
+HEADER = struct.Struct("<4sHHII")
+RECORD = struct.Struct("<QBI")
+INDEX = np.dtype([("generation", "<u8"), ("offset", "<u8"), ("kind", "u1")])
+KEYFRAME: int = 0
+DELTA: int = 1
+
+
+class History:
+    """
+    Records a board's generations and seeks back to any of them.
+    """
+
+    def __init__(self, path: Path | str, keyframe_every: int = 64):
+        """
+
+        Args:
+            path (Path): History file, the index is written next to it with '.idx' added. Existing files are
+                         appended to.
+            keyframe_every (int): Generations between full grids.
+        """
+        if keyframe_every <= 0:
+            raise ValueError(f"keyframe_every must be at least 1, got {keyframe_every}.")
+        self.path = Path(path)
+        self.index_path = self.path.with_name(f"{self.path.name}.idx")
+        self.keyframe_every = keyframe_every
+        self.shape: Optional[tuple[int, int]] = None
+        self.first: int = 0
+        self.offsets: list[int] = list()
+        self.keyframes: list[int] = list()
+        self._previous: Optional[np.ndarray] = None
+        self._source: Optional[tuple[int, int]] = None
+        self._file: Optional[BinaryIO] = None
+        self._index: Optional[BinaryIO] = None
+        if self.path.exists() and self.path.stat().st_size:
+            self._read_index()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def last(self) -> int:
+        """
+        Last generation recorded, first - 1 when nothing has been.
+        """
+        return self.first + len(self.offsets) - 1
+
+    def __contains__(self, generation: int) -> bool:
+        return self.first <= generation <= self.last
+
+    def _read_index(self):
+        with self.path.open("rb") as file:
+            magic, version, _, width, height = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"'{self.path}' is not a generation history.")
+        self.shape = (height, width)
+        for generation, offset, kind in np.fromfile(self.index_path, dtype=INDEX).tolist():
+            self._add(generation, offset, kind)
+
+    def _add(self, generation: int, offset: int, kind: int):
+        if not self.offsets or not self.first <= generation <= self.last + 1:
+            if kind != KEYFRAME:
+                raise ValueError(f"'{self.path}' has a delta for generation {generation:,} without a keyframe.")
+            self.first = generation
+            self.offsets.clear()
+            self.keyframes.clear()
+        # A generation recorded again is a new branch, drop everything after it.
+        position = generation - self.first
+        del self.offsets[position:]
+        del self.keyframes[bisect.bisect_left(self.keyframes, position):]
+        self.offsets.append(offset)
+        if kind == KEYFRAME:
+            self.keyframes.append(position)
+
+    def _open(self, shape: tuple[int, int]):
+        if self.shape is not None and self.shape != shape:
+            raise ValueError(f"'{self.path}' holds {self.shape[1]}x{self.shape[0]} boards, got {shape[1]}x{shape[0]}.")
+        self._file = self.path.open("ab")
+        self._index = self.index_path.open("ab")
+        if self.shape is None:
+            self.shape = shape
+            self._file.write(HEADER.pack(MAGIC, VERSION, 0, shape[1], shape[0]))
+
+    def update(self, board) -> History:
+        """
+        Record the board's current generation. A board keeping changed that has only run a generation
+        since the last one recorded is written as a delta of those cells, without reading its grid.
+
+        Returns:
+            Self
+        """
+        changed = getattr(board, "changed", None)
+        if changed is None:
+            return self.record(board.to_grid(), board.generation_number)
+        source, self._source = self._source, (id(board), board.edits)
+        self._previous = None
+        if source == self._source and self.follows(board.generation_number):
+            flat = np.array(changed, dtype=np.int64).reshape(-1, 2) @ np.array([1, board.width])
+            return self._write(board.generation_number, DELTA, flat.astype("<u4").tobytes())
+        grid = board.to_grid()
+        if self._file is None:
+            self._open(grid.shape)
+        return self._write(board.generation_number, KEYFRAME, self.keyframe(grid))
+
+    def follows(self, generation: int) -> bool:
+        """
+        Whether generation can be a delta on the last one recorded.
+        """
+        return self._file is not None and generation == self.last + 1 and generation % self.keyframe_every != 0
+
+    @staticmethod
+    def keyframe(grid: np.ndarray) -> bytes:
+        return np.packbits(grid != 0, bitorder="little").tobytes()
+
+    def record(self, grid: np.ndarray, generation: int) -> History:
+        """
+        Record a grid[y, x] as a generation, a delta when it follows the last one recorded.
+
+        Returns:
+            Self
+        """
+        if self._file is None:
+            self._open(grid.shape)
+        self._source = None
+        if self._previous is not None and self.follows(generation):
+            self._write(generation, DELTA, np.flatnonzero(grid != self._previous).astype("<u4").tobytes())
+        else:
+            self._write(generation, KEYFRAME, self.keyframe(grid))
+        self._previous = grid.copy()
+        return self
+
+    def _write(self, generation: int, kind: int, payload: bytes) -> History:
+        offset = self._file.tell()
+        self._file.write(RECORD.pack(generation, kind, len(payload)))
+        self._file.write(payload)
+        self._file.flush()
+        self._index.write(np.array([(generation, offset, kind)], dtype=INDEX).tobytes())
+        self._index.flush()
+        self._add(generation, offset, kind)
+        return self
+
+    def seek(self, generation: int) -> np.ndarray:
+        """
+        The grid[y, x] of a recorded generation, rebuilt from the keyframe before it.
+        """
+        if generation not in self:
+            raise IndexError(f"Generation {generation:,} isn't in the history, {self.first:,} to {self.last:,}.")
+        position = generation - self.first
+        start = self.keyframes[bisect.bisect_right(self.keyframes, position) - 1]
+        height, width = self.shape
+        with self.path.open("rb") as file:
+            file.seek(self.offsets[start])
+            _, _, length = RECORD.unpack(file.read(RECORD.size))
+            bits = np.frombuffer(file.read(length), dtype=np.uint8)
+            grid = np.unpackbits(bits, count=height * width, bitorder="little")
+            for offset in self.offsets[start + 1:position + 1]:
+                file.seek(offset)
+                _, _, length = RECORD.unpack(file.read(RECORD.size))
+                grid[np.frombuffer(file.read(length), dtype="<u4")] ^= 1
+        return grid.reshape(height, width)
+
+    def close(self):
+        for file in (self._file, self._index):
+            if file is not None:
+                file.close()
+        self._file = self._index = None
@@ -0,0 +1,163 @@
+"""
+neighbourhood
+
+Neighbourhoods larger than the eight cell Moore one, counted with summed-area tables so a
+generation costs the same whatever the radius.
+
+    moore         every cell within radius in x and y, a box
+    von_neumann   every cell within radius steps along x and y, a diamond
+    hex           a hexagonal grid drawn on the square one, the cells within radius steps
+                  along x, y and the x = y diagonal, so (1, -1) and (-1, 1) aren't neighbours
+
+A box is four lookups in the summed-area table of the grid. Diamonds and hexagons are added up
+a row at a time from row prefix sums: their vertical edges come from the summed-area table and
+their diagonal edges from the row prefix sums summed again along each diagonal, so each is
+eight lookups.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .util import Position, logger
+from .topology import pad
+
+
+KINDS: tuple[str, ...] = ("moore", "von_neumann", "hex")
+
+
+class Neighbourhood(NamedTuple):
+    """
+    Cells counted around each cell. middle counts the cell itself as well.
+    """
+    kind: str = "moore"
+    radius: int = 1
+    middle: bool = False
+
+    @property
+    def size(self) -> int:
+        """
+        Number of cells counted, the largest possible count.
+        """
+        r = self.radius
+        match self.kind:
+            case "moore":
+                cells = (2 * r + 1) ** 2
+            case "von_neumann":
+                cells = 2 * r * (r + 1) + 1
+            case "hex":
+                cells = 3 * r * (r + 1) + 1
+            case _:
+                raise ValueError(f"neighbourhood: '{self.kind}' isn't one of {', '.join(KINDS)}.")
+        return cells if self.middle else cells - 1
+
+    def contains(self, offset: Position) -> bool:
+        dx, dy = offset
+        match self.kind:
+            case "moore":
+                inside = max(abs(dx), abs(dy)) <= self.radius
+            case "von_neumann":
+                inside = abs(dx) + abs(dy) <= self.radius
+            case _:
+                inside = max(abs(dx), abs(dy), abs(dx - dy)) <= self.radius
+        return inside and (self.middle or offset != (0, 0))
+
+    def offsets(self) -> list[Position]:
+        span = range(-self.radius, self.radius + 1)
+        return [Position(dx, dy) for dy in span for dx in span if self.contains(Position(dx, dy))]
+
+
+MOORE = Neighbourhood()
+
+
+def summed_area(grid: np.ndarray) -> np.ndarray:
+    """
+    table[y, x] is the sum of grid[:y, :x], one larger than grid in both axes.
+    """
+    table = np.zeros((grid.shape[0] + 1, grid.shape[1] + 1), dtype=np.int32)
+    np.cumsum(grid, axis=0, dtype=np.int32, out=table[1:, 1:])
+    np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+    return table
+
+
+def count_moore(padded: np.ndarray, radius: int, height: int, width: int) -> np.ndarray:
+    table = summed_area(padded)
+    side = 2 * radius + 1
+    top, bottom = slice(0, height), slice(side, side + height)
+    left, right = slice(0, width), slice(side, side + width)
+    return table[bottom, right] - table[top, right] - table[bottom, left] + table[top, left]
+
+
+def diagonal_prefix(prefix: np.ndarray, step: int) -> np.ndarray:
+    """
+    Running sums of prefix down its diagonals, table[y, x] = prefix[y, x] + table[y - 1, x - step].
+    """
+    table = prefix.copy()
+    for row in range(1, table.shape[0]):
+        if step > 0:
+            table[row, step:] += table[row - 1, :-step]
+        else:
+            table[row, :step] += table[row - 1, -step:]
+    return table
+
+
+def edge_tables(padded: np.ndarray, radius: int, height: int, width: int):
+    """
+    The column sums and diagonal sums of the row prefix sums of a padded grid, and at(table, dy, dx) to read
+    table at (x + dx, y + dy) for every cell (x, y).
+    """
+    # Two more dead rows above and columns either side keep every lookup in range.
+    grid = np.pad(padded, ((2, 0), (2, 2))).astype(np.int32)
+    prefix = np.cumsum(grid, axis=1)
+    offset = radius + 2
+
+    def at(table: np.ndarray, dy: int, dx: int) -> np.ndarray:
+        return table[offset + dy:offset + dy + height, offset + dx:offset + dx + width]
+
+    return np.cumsum(prefix, axis=0), diagonal_prefix(prefix, 1), diagonal_prefix(prefix, -1), at
+
+
+def count_von_neumann(padded: np.ndarray, radius: int, height: int, width: int) -> np.ndarray:
+    r = radius
+    columns, diagonal, anti_diagonal, at = edge_tables(padded, radius, height, width)
+    # Rows 0 to r below: from x - r + dy to x + r - dy. Rows -r to -1 above: from x - r - dy to x + r + dy.
+    below = at(anti_diagonal, r, 0) - at(anti_diagonal, -1, r + 1) - at(diagonal, r, -1) + at(diagonal, -1, -r - 2)
+    above = at(diagonal, -1, r - 1) - at(diagonal, -r - 1, -1) - at(anti_diagonal, -1, -r) + at(anti_diagonal, -r - 1, 0)
+    return below + above
+
+
+def count_hex(padded: np.ndarray, radius: int, height: int, width: int) -> np.ndarray:
+    r = radius
+    columns, diagonal, _, at = edge_tables(padded, radius, height, width)
+    # Rows 0 to r below: from x + dy - r to x + r. Rows -r to -1 above: from x - r to x + r + dy.
+    below = at(columns, r, r) - at(columns, -1, r) - at(diagonal, r, -1) + at(diagonal, -1, -r - 2)
+    above = at(diagonal, -1, r - 1) - at(diagonal, -r - 1, -1) - at(columns, -1, -r - 1) + at(columns, -r - 1, -r - 1)
+    return below + above
+
+
+COUNTERS = {"moore": count_moore, "von_neumann": count_von_neumann, "hex": count_hex}
+
+
+def count_cells(grid: np.ndarray, neighbourhood: Neighbourhood, topology: str, out: np.ndarray) -> np.ndarray:
+    """
+    Number of alive cells in the neighbourhood of every cell of a 0 or 1 grid[y, x].
+
+    Args:
+        grid (np.ndarray): 0 or 1 grid.
+        neighbourhood (Neighbourhood): Cells to count.
+        topology (str): 'bounded', 'torus' or 'klein'.
+        out (np.ndarray): Array the shape of grid to write the counts into.
+
+    Returns:
+        out
+    """
+    height, width = grid.shape
+    padded = pad(grid, neighbourhood.radius, topology)
+    out[...] = COUNTERS[neighbourhood.kind](padded, neighbourhood.radius, height, width)
+    if not neighbourhood.middle:
+        out -= grid
+    return out
@@ -0,0 +1,270 @@
+"""
+parallel_board
+
+Multi-core ArrayBoard. The grid lives in two padded shared memory buffers, each worker
+process owns a horizontal band of rows and steps it from one buffer into the other. The halo
+rows above and below a band are read straight out of the shared buffer, so only the number of
+generations to run is ever sent to the workers. While counting is on, each worker also writes
+the births and deaths of its band to a shared array. On a torus or Klein bottle each worker also
+fills the border next to its own rows, and the first and last bands fill the bottom and top
+border rows.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Barrier
+from typing import Optional
+
+import numpy as np
+
+from .cycle import run_until_cycle
+from .snapshot import Checkpoint, run_with_checkpoints
+from .util import Condition, logger, progress
+from ..performance.timer import Timer
+from .array_board import ArrayBoard, count_changes, neighbourhoods
+from .rules import Rule
+from .neighbourhood import MOORE
+from .topology import fill_padding, wrap_columns, wrap_row
+
+
+def split_rows(rows: int, bands: int) -> list[tuple[int, int]]:
+    """
+    Split rows into near equal [start, end) bands.
+    """
+    edges = np.linspace(0, rows, bands + 1).astype(int).tolist()
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def step_band(source: np.ndarray, target: np.ndarray, start: int, end: int, rule: np.ndarray,
+              counts: np.ndarray, topology: str = "bounded") -> np.ndarray:
+    """
+    One generation for rows [start, end) of a padded buffer.
+
+    Args:
+        source (np.ndarray): Padded buffer holding the current generation.
+        target (np.ndarray): Padded buffer to write the next generation into.
+        start (int): First board row of the band.
+        end (int): Row after the last board row of the band.
+        rule (np.ndarray): rule[state, neighbourhood] -> next state.
+        counts (np.ndarray): Scratch array of shape (end - start, width).
+        topology (str): Fill the border of target next to the band for this topology. Default is 'bounded'.
+
+    Returns:
+        target
+    """
+    neighbourhoods(source[start:end + 2], counts, rule)
+    target[start + 1:end + 1, 1:-1] = rule[source[start + 1:end + 1, 1:-1], counts]
+    if topology != "bounded":
+        wrap_columns(target, slice(start + 1, end + 1))
+        height = target.shape[0] - 2
+        if end == height:
+            wrap_row(target, -2, 0, topology)
+        if start == 0:
+            wrap_row(target, 1, -1, topology)
+    return target
+
+
+def _band_worker(names: tuple[str, str], shape: tuple[int, int], rule: np.ndarray, band: tuple[int, int],
+                 topology: str, start_barrier: Barrier, step_barrier: Barrier, done_barrier: Barrier, command,
+                 source, counting, changes, index: int):
+    shared = [SharedMemory(name=name) for name in names]
+    try:
+        buffers = [np.ndarray(shape, dtype=np.uint8, buffer=memory.buf) for memory in shared]
+        start, end = band
+        counts = np.zeros((end - start, shape[1] - 2), dtype=np.uint8)
+        rows = slice(start + 1, end + 1)
+        while True:
+            start_barrier.wait()
+            runs = command.value
+            if runs < 0:
+                break
+            current = source.value
+            for _ in range(runs):
+                step_band(buffers[current], buffers[1 - current], start, end, rule, counts, topology)
+                if counting.value:
+                    changes[2 * index:2 * index + 2] = count_changes(
+                        buffers[current][rows, 1:-1], buffers[1 - current][rows, 1:-1]
+                        )
+                step_barrier.wait()
+                current = 1 - current
+            done_barrier.wait()
+        del buffers
+    finally:
+        for memory in shared:
+            memory.close()
+
+
+def _shutdown(processes: list, start_barrier: Barrier, command, shared: list[SharedMemory]):
+    command.value = -1
+    try:
+        start_barrier.wait(timeout=5)
+    except Exception:
+        ...
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+    for memory in shared:
+        try:
+            memory.close()
+        except BufferError:
+            # The board's arrays still point into the buffer when run at exit.
+            ...
+        memory.unlink()
+
+
+class ParallelBoard(ArrayBoard):
+    """
+    ArrayBoard stepped by a pool of worker processes over shared memory.
+
+    Gives the same cells as ArrayBoard and Board every generation.
+    """
+
+    def __init__(
+            self,
+            num_of_cells: int,
+            live_conditions: Condition = Condition(2, 3),
+            birth_condition: Condition = Condition(3),
+            num_of_runs: int = 0,
+            loading_bar: bool = False,
+            height: Optional[int] = None,
+            topology: str = "bounded",
+            rule: Optional[Rule] = None,
+            workers: Optional[int] = None,
+            ):
+        """
+
+        Args:
+            num_of_cells (int): Number of cells across the board.
+            live_conditions (Condition): the number of neighbours around a cell where you live.
+            birth_condition (Condition): number of neighbours which a cell is born.
+            height (int, Optional): Number of cells down the board. Default is num_of_cells.
+            topology (str): 'bounded', 'torus' or 'klein'. Default is 'bounded'.
+            rule (Rule, Optional): Generations or non-totalistic rule, replaces the conditions. Default is None.
+            workers (int, Optional): Number of worker processes. Default is the number of cpus.
+        """
+        super().__init__(
+            num_of_cells, live_conditions, birth_condition, num_of_runs, loading_bar, height=height, topology=topology,
+            rule=rule,
+            )
+        if self.neighbourhood != MOORE:
+            raise ValueError(f"The parallel engine only counts the Moore neighbourhood, {self.rule_name} needs numpy.")
+        self.workers: int = max(1, min(workers or os.cpu_count() or 1, self.height))
+        self.bands: list[tuple[int, int]] = split_rows(self.height, self.workers)
+        logger.debug(f"Workers: {self.workers}, bands: {self.bands}")
+
+        shape = (self.height + 2, self.width + 2)
+        self._shared: list[SharedMemory] = [SharedMemory(create=True, size=shape[0] * shape[1]) for _ in range(2)]
+        self._buffers: list[np.ndarray] = [
+            np.ndarray(shape, dtype=np.uint8, buffer=memory.buf) for memory in self._shared
+            ]
+        for buffer in self._buffers:
+            buffer[...] = 0
+        self._current: int = 0
+        self.board = self._buffers[self._current][1:-1, 1:-1]
+
+        context = multiprocessing.get_context()
+        self._start_barrier = context.Barrier(self.workers + 1)
+        self._step_barrier = context.Barrier(self.workers)
+        self._done_barrier = context.Barrier(self.workers + 1)
+        self._command = context.Value("q", 0, lock=False)
+        self._source = context.Value("b", 0, lock=False)
+        self._counting = context.Value("b", 0, lock=False)
+        # Births then deaths of each band's last generation.
+        self._changes = context.Array("q", 2 * self.workers, lock=False)
+        names = tuple(memory.name for memory in self._shared)
+        self._processes = [
+            context.Process(
+                target=_band_worker,
+                args=(names, shape, self.rule, band, self.topology, self._start_barrier, self._step_barrier,
+                      self._done_barrier, self._command, self._source, self._counting, self._changes, index),
+                daemon=True,
+                )
+            for index, band in enumerate(self.bands)
+            ]
+        for process in self._processes:
+            process.start()
+        self._finalizer = weakref.finalize(
+            self, _shutdown, self._processes, self._start_barrier, self._command, self._shared
+            )
+
+    def close(self):
+        """
+        Stop the workers and release the shared memory.
+        """
+        self._finalizer()
+
+    @property
+    def counting(self) -> bool:
+        return bool(self._counting.value)
+
+    @counting.setter
+    def counting(self, value: bool):
+        self._counting.value = bool(value)
+
+    @property
+    def counts(self) -> tuple[int, int]:
+        """
+        Births and deaths of the last generation, summed over the bands.
+        """
+        changes = self._changes[:]
+        return sum(changes[::2]), sum(changes[1::2])
+
+    @Timer.span("step")
+    def step(self, runs: int) -> ParallelBoard:
+        """
+        Run the workers for a number of generations, timed as one step whatever the number.
+
+        Returns:
+            Self
+        """
+        if runs <= 0:
+            return self
+        # Cells set from this process since the last step aren't in the border yet.
+        fill_padding(self._buffers[self._current], self.topology)
+        self._command.value = runs
+        self._source.value = self._current
+        self._start_barrier.wait()
+        self._done_barrier.wait()
+        self._current = (self._current + runs) % 2
+        self.board = self._buffers[self._current][1:-1, 1:-1]
+        self.generation_number += runs
+        return self
+
+    @Timer.span("generation")
+    def generation(self) -> ParallelBoard:
+        """
+        One generation.
+
+        Returns:
+            Self
+        """
+        return self.step(1)
+
+    def run_for_set_amount(
+            self, runs: Optional[int] = None, stop_on_cycle: bool = False, checkpoint: Optional[Checkpoint] = None
+            ):
+        runs = self.num_of_runs if runs is None else runs
+        self.cycle = None
+        if stop_on_cycle:
+            self.cycle = run_until_cycle(self, runs, loading_bar=self.loading_bar, checkpoint=checkpoint)
+            return
+        if checkpoint is not None:
+            run_with_checkpoints(self, runs, checkpoint, loading_bar=self.loading_bar)
+            return
+        match self.loading_bar:
+            case True:
+                for _ in progress(range(runs)):
+                    self.generation()
+            case False if Timer.hooked("generation"):
+                # The per-generation metrics only see generations run one at a time.
+                for _ in range(runs):
+                    self.generation()
+            case False:
+                self.step(runs)
@@ -0,0 +1,211 @@
+"""
+patterns
+
+Streaming readers for RLE, plaintext (.cells) and Life 1.06 pattern files.
+
+Files are read a line at a time and turned into runs of alive cells, (x, y, length). The runs
+are clipped to the board and written into its storage in batches of at most batch_cells cells,
+so memory stays bounded however large the pattern is. A rule in an RLE header that isn't the
+board's is warned about, the pattern is still placed and run with the board's rule.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Generator, Iterable, Optional, TextIO
+
+import numpy as np
+
+from .util import Position, logger
+from .rules import Rule
+from .snapshot import board_rule
+
+
+Run = tuple[int, int, int]
+RLE_TOKEN = re.compile(r"(\d*)([A-Za-z.$!])")
+# Golly adds the bounded grid after a ':', e.g. B3/S23:T100,100.
+RLE_RULE = re.compile(r"rule\s*=\s*([^:\s]+)", re.IGNORECASE)
+
+
+def check_rle_rule(header: str, rule: Optional[Rule]):
+    """
+    Warn when an RLE header names a rule other than the board's.
+    """
+    if rule is None or (match := RLE_RULE.search(header)) is None:
+        return
+    try:
+        pattern_rule = Rule.parse(match.group(1))
+    except ValueError:
+        logger.warning(f"The pattern's rule '{match.group(1)}' isn't understood, it runs as {rule.name}.")
+        return
+    # Everything but the name, 23/3 and B3/S23 are the same rule.
+    if pattern_rule[1:] != rule[1:]:
+        logger.warning(f"The pattern is for {pattern_rule.name} but the board runs {rule.name}.")
+
+
+def rle_runs(lines: Iterable[str], rule: Optional[Rule] = None) -> Generator[Run, None, None]:
+    """
+    Runs of alive cells in an RLE pattern. 'b' and '.' are dead, any other letter is alive.
+
+    Args:
+        lines (Iterable[str]): Lines of the pattern file.
+        rule (Rule, Optional): Rule of the board, warned about if the header names another. Default is None.
+    """
+    x = y = 0
+    carry = ""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("x") and not carry and x == y == 0:
+            logger.debug(f"RLE header: {line}")
+            check_rle_rule(line, rule)
+            continue
+        text = carry + line
+        for digits, tag in RLE_TOKEN.findall(text):
+            count = int(digits) if digits else 1
+            if tag == "b" or tag == ".":
+                x += count
+            elif tag == "$":
+                x, y = 0, y + count
+            elif tag == "!":
+                return
+            else:
+                yield x, y, count
+                x += count
+        # A run count can be split over two lines.
+        carry = text[len(text.rstrip("0123456789")):]
+
+
+def plaintext_runs(lines: Iterable[str]) -> Generator[Run, None, None]:
+    """
+    Runs of alive cells in a plaintext pattern, '!' lines are comments and 'O' or '*' are alive.
+    """
+    y = 0
+    for line in lines:
+        if line.startswith("!"):
+            continue
+        for match in re.finditer(r"[O*]+", line):
+            yield match.start(), y, match.end() - match.start()
+        y += 1
+
+
+def life_106_runs(lines: Iterable[str]) -> Generator[Run, None, None]:
+    """
+    Alive cells of a Life 1.06 pattern, one 'x y' pair per line. Anything after the pair is ignored.
+
+    Raises:
+        ValueError: A line doesn't start with two integers.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            x, y = map(int, line.split()[:2])
+        except ValueError:
+            raise ValueError(f"Bad Life 1.06 line '{line}', expected 'x y'.") from None
+        yield x, y, 1
+
+
+def pattern_runs(file: TextIO, suffix: str = "", rule: Optional[Rule] = None) -> Generator[Run, None, None]:
+    """
+    Runs of alive cells from an open pattern file, the format is taken from the first line or the suffix.
+
+    Args:
+        file (TextIO): Open pattern file.
+        suffix (str): Suffix of the file name, e.g. '.rle'. Default is ''.
+        rule (Rule, Optional): Rule of the board, for RLE headers to be checked against. Default is None.
+    """
+    first = file.readline()
+    lines = _chain(first, file)
+    if first.startswith("#Life 1.06"):
+        return life_106_runs(lines)
+    if first.startswith("#Life 1.05"):
+        raise ValueError("Life 1.05 patterns aren't supported, convert to RLE or Life 1.06.")
+    if suffix == ".cells" or first.startswith("!"):
+        return plaintext_runs(lines)
+    if suffix == ".rle" or first.startswith(("#", "x")):
+        return rle_runs(lines, rule)
+    raise ValueError(f"Unknown pattern format{f' {suffix!r}' if suffix else ''}, expected .rle, .cells or Life 1.06.")
+
+
+def _chain(first: str, rest: Iterable[str]) -> Generator[str, None, None]:
+    yield first
+    yield from rest
+
+
+def place_runs(
+        board,
+        runs: Iterable[Run],
+        offset: Position = Position(0, 0),
+        batch_cells: int = 1 << 20,
+        batch_runs: int = 1 << 14,
+        ) -> int:
+    """
+    Set the cells of runs alive on a board of any engine, shifted by offset. Cells off the board are dropped.
+
+    Args:
+        board: Board with set_alive(ys, xs).
+        runs (Iterable[Run]): (x, y, length) runs of alive cells.
+        offset (Position): Board position of the pattern's (0, 0).
+        batch_cells (int): Max number of cells held before they are written to the board.
+        batch_runs (int): Max number of runs held before they are written to the board.
+
+    Returns:
+        Number of cells placed.
+    """
+    width, height = board.width, board.height
+    placed = dropped = 0
+    batch: list[Run] = list()
+    cells = 0
+    for x, y, length in runs:
+        x, y = x + offset.x, y + offset.y
+        start, end = max(x, 0), min(x + length, width)
+        if not 0 <= y < height or start >= end:
+            dropped += length
+            continue
+        dropped += length - (end - start)
+        batch.append((start, y, end - start))
+        cells += end - start
+        if cells >= batch_cells or len(batch) >= batch_runs:
+            placed += _write_batch(board, batch)
+            batch.clear()
+            cells = 0
+    placed += _write_batch(board, batch)
+    if dropped:
+        logger.warning(f"{dropped:,} cell/s of the pattern are off the board.")
+    return placed
+
+
+def _write_batch(board, batch: list[Run]) -> int:
+    if not batch:
+        return 0
+    x, y, length = np.array(batch, dtype=np.int64).T
+    total = int(length.sum())
+    starts = np.repeat(np.cumsum(length) - length, length)
+    xs = np.repeat(x, length) + np.arange(total) - starts
+    board.set_alive(np.repeat(y, length), xs)
+    return total
+
+
+def load_pattern(board, path: Path | str, offset: Position = Position(0, 0)) -> int:
+    """
+    Stream a pattern file onto a board.
+
+    Args:
+        board: Board of any engine.
+        path (Path): .rle, .cells or Life 1.06 file.
+        offset (Position): Board position of the pattern's top left, or (0, 0) for Life 1.06.
+
+    Returns:
+        Number of cells placed.
+    """
+    path = Path(path)
+    with path.open() as file:
+        placed = place_runs(board, pattern_runs(file, path.suffix.lower(), board_rule(board)), offset)
+    logger.info(f"Placed {placed:,} cell/s from '{path}' at {tuple(offset)}.")
+    return placed
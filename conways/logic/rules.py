@@ -0,0 +1,274 @@
+"""
+rules
+
+Rule strings compiled into transition tables, table[state, neighbourhood] -> next state.
+
+    B3/S23, B36/S23, B2/S        Life-like, the neighbourhood is the number of alive neighbours
+    23/3                         the same in S/B order
+    B2/S/C3, 345/2/4             Generations, C states where alive cells that don't survive decay
+                                 through C - 2 dying states before they are dead, and only alive
+                                 cells count as neighbours
+    B2-a/S12, B3/S23-q4z         non-totalistic (Hensel notation), letters after a count pick which
+                                 arrangements of that many neighbours count, '-' picks all but them
+    B2/S34H, B2/S013V            totalistic on the hexagonal or von Neumann neighbourhood
+    R5,C0,M1,S34..58,B34..45,NM  Larger-than-Life, radius R, C states (0 or 2 for two), M 1 when
+                                 the cell counts itself, survive and birth ranges and N the
+                                 neighbourhood, M Moore, N von Neumann or H hexagonal
+
+Non-totalistic tables are indexed by an 8 bit mask of which neighbours are alive, bit k for
+NEIGHBOUR_ORDER[k], so they have 256 columns instead of 9.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from .util import Condition, Position, logger
+from .neighbourhood import MOORE, Neighbourhood
+
+
+NEIGHBOUR_ORDER: tuple[Position, ...] = (
+    Position(-1, -1), Position(0, -1), Position(1, -1),
+    Position(-1, 0), Position(1, 0),
+    Position(-1, 1), Position(0, 1), Position(1, 1),
+    )
+COMPASS: dict[str, Position] = dict(zip(("NW", "N", "NE", "W", "E", "SW", "S", "SE"), NEIGHBOUR_ORDER))
+
+# One arrangement for each letter, the rest are its rotations and reflections. Counts 5 to 7 are
+# the complements of 3 to 1 with the same letters.
+HENSEL: dict[int, dict[str, str]] = {
+    1: {"c": "NW", "e": "N"},
+    2: {"c": "NW NE", "e": "N W", "k": "NE W", "a": "NW N", "i": "W E", "n": "NE SW"},
+    3: {
+        "c": "NW NE SW", "e": "N W E", "k": "N E SW", "a": "NW N W", "i": "NW N NE",
+        "n": "NW NE W", "y": "NW E SW", "q": "N NE SW", "j": "N NE W", "r": "NW W E",
+        },
+    4: {
+        "c": "NW NE SW SE", "e": "N W E S", "k": "NW N E SW", "a": "NW N NE W", "i": "NW NE W E",
+        "n": "NW N NE SW", "y": "NW NE E SW", "q": "N NE E SW", "j": "N W E SW", "r": "NW N W E",
+        "t": "NW W E SW", "w": "N NE W SW", "z": "NE W E SW",
+        },
+    }
+HENSEL_LETTERS: str = "cekainyqjrtwz"
+RULE_STRING = re.compile(
+    r"[Bb](?P<birth>[0-8cekainyqjrtwz-]*)/?[Ss](?P<survive>[0-8cekainyqjrtwz-]*)(?:/[CcGg]?(?P<states>\d+))?"
+    r"(?P<kind>[HhVv])?"
+    )
+SWAPPED_RULE_STRING = re.compile(
+    r"[Ss](?P<survive>[0-8cekainyqjrtwz-]*)/?[Bb](?P<birth>[0-8cekainyqjrtwz-]*)(?:/[CcGg]?(?P<states>\d+))?"
+    r"(?P<kind>[HhVv])?"
+    )
+BARE_RULE_STRING = re.compile(r"(?P<survive>[0-8]*)/(?P<birth>[0-8]*)(?:/(?P<states>\d+))?(?P<kind>[HhVv])?")
+LTL_RULE_STRING = re.compile(
+    r"R(?P<radius>\d+),C(?P<states>\d+),M(?P<middle>[01]),S(?P<survive>\d+\.\.\d+),B(?P<birth>\d+\.\.\d+)"
+    r"(?:,N(?P<kind>[MNH]))?",
+    re.IGNORECASE,
+    )
+LTL_KINDS: dict[str, str] = {"M": "moore", "N": "von_neumann", "H": "hex"}
+SUFFIX_KINDS: dict[str, str] = {"H": "hex", "V": "von_neumann"}
+HENSEL_TERM = re.compile(r"([0-8])(-?)([cekainyqjrtwz]*)")
+
+
+def mask(positions: Iterable[Position]) -> int:
+    return sum(1 << NEIGHBOUR_ORDER.index(position) for position in positions)
+
+
+def symmetries(positions: tuple[Position, ...]) -> set[int]:
+    """
+    Masks of every rotation and reflection of some neighbours.
+    """
+    masks = set()
+    for swap in (False, True):
+        for sx in (1, -1):
+            for sy in (1, -1):
+                masks.add(mask(
+                    Position(sx * p.y, sy * p.x) if swap else Position(sx * p.x, sy * p.y) for p in positions
+                    ))
+    return masks
+
+
+@lru_cache(maxsize=1)
+def hensel_masks() -> dict[tuple[int, str], frozenset[int]]:
+    """
+    Neighbour masks for each (count, letter) of Hensel notation.
+    """
+    masks: dict[tuple[int, str], frozenset[int]] = dict()
+    for count, letters in HENSEL.items():
+        for letter, names in letters.items():
+            masks[count, letter] = frozenset(symmetries(tuple(COMPASS[name] for name in names.split())))
+    for count in (5, 6, 7):
+        for letter in HENSEL[8 - count]:
+            masks[count, letter] = frozenset(0xFF ^ value for value in masks[8 - count, letter])
+    return masks
+
+
+def letters_for(count: int) -> str:
+    return "".join(letter for letter in HENSEL_LETTERS if (count, letter) in hensel_masks())
+
+
+def parse_neighbourhoods(spec: str, isotropic: bool, text: str) -> set[int]:
+    """
+    Parse the B or S half of a rule string into neighbour counts, or into neighbour masks when isotropic.
+    A count without letters is every arrangement of it.
+    """
+    terms = HENSEL_TERM.findall(spec)
+    if "".join("".join(term) for term in terms) != spec:
+        raise ValueError(f"rule: '{text}' has an unreadable part '{spec}'.")
+    found: set[int] = set()
+    for digit, minus, letters in terms:
+        count = int(digit)
+        if not isotropic:
+            found.add(count)
+            continue
+        allowed = letters_for(count)
+        if unknown := set(letters) - set(allowed):
+            raise ValueError(
+                f"rule: '{text}' uses '{''.join(sorted(unknown))}' for {count}, expected some of '{allowed}'."
+                )
+        if not letters:
+            found |= {value for value in range(256) if value.bit_count() == count}
+            continue
+        for letter in set(allowed) - set(letters) if minus else set(letters):
+            found |= hensel_masks()[count, letter]
+    return found
+
+
+def parse_range(span: str) -> frozenset[int]:
+    low, high = span.split("..")
+    return frozenset(range(int(low), int(high) + 1))
+
+
+class Rule(NamedTuple):
+    """
+    A parsed rule. birth and survive hold neighbour counts, or neighbour masks when isotropic is True.
+    """
+    name: str
+    birth: frozenset[int]
+    survive: frozenset[int]
+    states: int = 2
+    isotropic: bool = False
+    neighbourhood: Neighbourhood = MOORE
+
+    @classmethod
+    def parse(cls, text: str) -> Rule:
+        """
+        Parse a rule string, see the module docstring for the forms taken.
+        """
+        stripped = text.strip()
+        if match := LTL_RULE_STRING.fullmatch(stripped):
+            return cls._parse_larger(match, text)
+        for pattern in (RULE_STRING, SWAPPED_RULE_STRING, BARE_RULE_STRING):
+            if match := pattern.fullmatch(stripped):
+                break
+        else:
+            raise ValueError(f"rule: '{text}' is not a B/S, Generations, Hensel or Larger-than-Life rule string.")
+        states = int(match.group("states") or 2)
+        if states < 2 or states > 256:
+            raise ValueError(f"rule: '{text}' needs from 2 to 256 states, got {states}.")
+        isotropic = any(letter in HENSEL_LETTERS for letter in match.group("birth") + match.group("survive"))
+        suffix = (match.group("kind") or "").upper()
+        if isotropic and suffix:
+            raise ValueError(f"rule: '{text}', non-totalistic rules only use the Moore neighbourhood.")
+        neighbourhood = Neighbourhood(SUFFIX_KINDS[suffix]) if suffix else MOORE
+        birth = parse_neighbourhoods(match.group("birth"), isotropic, text)
+        survive = parse_neighbourhoods(match.group("survive"), isotropic, text)
+        name = f"B{match.group('birth')}/S{match.group('survive')}" + (f"/C{states}" if states > 2 else "") + suffix
+        return cls(name, frozenset(birth), frozenset(survive), states, isotropic, neighbourhood).checked(text)
+
+    @classmethod
+    def _parse_larger(cls, match: re.Match, text: str) -> Rule:
+        states = max(2, int(match.group("states")))
+        if states > 256:
+            raise ValueError(f"rule: '{text}' needs from 2 to 256 states, got {states}.")
+        radius = int(match.group("radius"))
+        if radius < 1:
+            raise ValueError(f"rule: '{text}' needs a radius of at least 1.")
+        kind = (match.group("kind") or "M").upper()
+        neighbourhood = Neighbourhood(LTL_KINDS[kind], radius, match.group("middle") == "1")
+        name = (f"R{radius},C{int(match.group('states'))},M{match.group('middle')},S{match.group('survive')},"
+                f"B{match.group('birth')},N{kind}")
+        return cls(
+            name, parse_range(match.group("birth")), parse_range(match.group("survive")), states,
+            neighbourhood=neighbourhood,
+            ).checked(text)
+
+    def checked(self, text: str) -> Rule:
+        """
+        Self, if every count can happen in the neighbourhood.
+        """
+        if self.isotropic:
+            return self
+        size = self.neighbourhood.size
+        if too_many := sorted(count for count in self.birth | self.survive if count > size):
+            raise ValueError(
+                f"rule: '{text}' uses {', '.join(map(str, too_many))} but the neighbourhood only has {size} cells."
+                )
+        return self
+
+    @classmethod
+    def from_conditions(cls, live_conditions: Condition, birth_condition: Condition) -> Rule:
+        birth = frozenset(count for count in birth_condition.contains if 0 <= count <= 8)
+        survive = frozenset(count for count in live_conditions.contains if 0 <= count <= 8)
+        return cls(f"B{''.join(map(str, sorted(birth)))}/S{''.join(map(str, sorted(survive)))}", birth, survive)
+
+    @property
+    def life_like(self) -> bool:
+        """
+        Two states, totalistic and the Moore neighbourhood, the rules every engine can run.
+        """
+        return self.states == 2 and not self.isotropic and self.neighbourhood == MOORE
+
+    @property
+    def live_conditions(self) -> Condition:
+        """
+        Neighbour counts a cell can survive with, any arrangement of them for an isotropic rule.
+        """
+        return Condition.from_counts(_counts(self.survive, self.isotropic))
+
+    @property
+    def birth_condition(self) -> Condition:
+        """
+        Neighbour counts a cell can be born with, any arrangement of them for an isotropic rule.
+        """
+        return Condition.from_counts(_counts(self.birth, self.isotropic))
+
+    def table(self) -> np.ndarray:
+        """
+        Compile the rule, table[state, neighbourhood] -> next state as uint8.
+
+        States are 0 dead, 1 alive and 2 up to states - 1 dying. The neighbourhood is the number of alive
+        neighbours, or the neighbour mask for an isotropic rule.
+        """
+        table = np.zeros((self.states, 256 if self.isotropic else self.neighbourhood.size + 1), dtype=np.uint8)
+        table[0, sorted(self.birth)] = 1
+        table[1, :] = 2 % self.states
+        table[1, sorted(self.survive)] = 1
+        for state in range(2, self.states):
+            table[state, :] = (state + 1) % self.states
+        return table
+
+
+def _counts(keys: frozenset[int], isotropic: bool) -> set[int]:
+    return {key.bit_count() for key in keys} if isotropic else set(keys)
+
+
+def parse_rule(rule: str) -> tuple[Condition, Condition]:
+    """
+    Parse a Life-like rule string, e.g. 'B3/S23' for Conway's Game of Life.
+
+    Args:
+        rule (str): Birth digits after B and survival digits after S, in either order.
+
+    Returns:
+        live_conditions, birth_condition
+    """
+    parsed = Rule.parse(rule)
+    if not parsed.life_like:
+        raise ValueError(f"rule: '{rule}' is not a Life-like B/S rule string.")
+    return parsed.live_conditions, parsed.birth_condition
@@ -0,0 +1,246 @@
+"""
+snapshot
+
+Compact binary snapshots of a board, and checkpointing long runs into them.
+
+A snapshot is a 64 byte little endian header, the rule string, and the grid at one bit per
+cell. Each row is padded to whole 64 bit words, bit x % 8 of byte x // 8 is cell x, the same
+layout as BitBoard. A Generations rule keeps its dying cells, so with more than two states the
+grid is one byte per cell holding the state instead. The grid is opened with numpy.memmap so
+nothing is read until it is used.
+
+    magic        4s  b"CGOL"
+    version      u2
+    topology     u2  index in TOPOLOGIES, 0 bounded, 1 torus, 2 klein
+    width        u4
+    height       u4
+    generation   u8
+    seed         i8  -1 when the board wasn't seeded
+    survive      u2  bit n set when a cell with n alive neighbours survives
+    birth        u2  bit n set when a cell with n alive neighbours is born
+    states       u2
+    rule length  u2  bytes of the rule string after the header
+
+The rule string, e.g. B2/S/C3 or R5,C0,M1,S34..58,B34..45,NM, is padded to 8 bytes.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import inspect
+import os
+import struct
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from .util import Condition, Window, logger, progress
+from .rules import Rule
+from .topology import TOPOLOGIES, check_topology
+
+
+MAGIC: bytes = b"CGOL"
+VERSION: int = 1
+HEADER = struct.Struct("<4sHHIIQqHHHH")
+HEADER_SIZE: int = 64
+
+
+def condition_mask(condition: Condition) -> int:
+    return sum(1 << count for count in condition.contains if 0 <= count < 16)
+
+
+def mask_condition(mask: int) -> Condition:
+    return Condition.from_counts(count for count in range(16) if mask >> count & 1)
+
+
+def row_bytes(width: int) -> int:
+    return -(-width // 64) * 8
+
+
+def padded(length: int) -> int:
+    return -(-length // 8) * 8
+
+
+class Snapshot(NamedTuple):
+    """
+    A snapshot file opened with numpy.memmap, cells[y] is the packed row y.
+    """
+    width: int
+    height: int
+    live_conditions: Condition
+    birth_condition: Condition
+    generation: int
+    seed: Optional[int]
+    cells: np.ndarray
+    topology: str = "bounded"
+    rule: Optional[Rule] = None
+    states: int = 2
+
+    def grid(self, window: Optional[Window] = None) -> np.ndarray:
+        """
+        Unpack the cells as a uint8 grid[y, x], only the rows in window are read from disk. Dying cells of a
+        Generations rule keep their state.
+        """
+        if window is None:
+            window = Window(0, 0, self.width, self.height)
+        if self.states > 2:
+            return np.array(self.cells[window.rows, window.columns])
+        rows = np.unpackbits(self.cells[window.rows], axis=1, bitorder="little")
+        return rows[:, window.columns]
+
+
+def save_grid(
+        path: Path | str,
+        grid: np.ndarray,
+        live_conditions: Condition,
+        birth_condition: Condition,
+        generation: int = 0,
+        seed: Optional[int] = None,
+        topology: str = "bounded",
+        rule: Optional[Rule] = None,
+        ) -> Path:
+    """
+    Write a grid[y, x] to a snapshot file. With a rule of more than two states the grid holds the state of
+    each cell, otherwise any cell that isn't 0 is alive.
+
+    The file is written next to path first and then moved over it, so a run killed part way through a
+    checkpoint still leaves the previous one.
+
+    Returns:
+        Path written.
+    """
+    path = Path(path)
+    height, width = grid.shape
+    if rule is None:
+        rule = Rule.from_conditions(live_conditions, birth_condition)
+    if rule.states > 2:
+        packed = np.ascontiguousarray(grid, dtype=np.uint8)
+    else:
+        packed = np.zeros((height, row_bytes(width)), dtype=np.uint8)
+        bytes_ = np.packbits(grid != 0, axis=1, bitorder="little")
+        packed[:, :bytes_.shape[1]] = bytes_
+    name = rule.name.encode()
+    header = HEADER.pack(
+        MAGIC, VERSION, TOPOLOGIES.index(check_topology(topology)), width, height, generation,
+        -1 if seed is None else seed, condition_mask(live_conditions), condition_mask(birth_condition),
+        rule.states, len(name),
+        )
+    temporary = path.with_name(f"{path.name}.tmp")
+    with temporary.open("wb") as file:
+        file.write(header.ljust(HEADER_SIZE, b"\0"))
+        file.write(name.ljust(padded(len(name)), b"\0"))
+        file.write(packed.data)
+    os.replace(temporary, path)
+    return path
+
+
+def open_snapshot(path: Path | str) -> Snapshot:
+    """
+    Read the header of a snapshot file and memory map its cells.
+    """
+    path = Path(path)
+    with path.open("rb") as file:
+        header = file.read(HEADER_SIZE)
+        if len(header) < HEADER.size or header[:4] != MAGIC:
+            raise ValueError(f"'{path}' is not a board snapshot.")
+        (
+            _, version, topology, width, height, generation, seed, survive, birth, states, length
+            ) = HEADER.unpack_from(header)
+        if version != VERSION:
+            raise ValueError(f"'{path}' is snapshot version {version}, expected {VERSION}.")
+        if topology >= len(TOPOLOGIES):
+            raise ValueError(f"'{path}' has an unknown topology {topology}.")
+        rule = Rule.parse(file.read(length).decode())
+    offset = HEADER_SIZE + padded(length)
+    shape = (height, width) if states > 2 else (height, row_bytes(width))
+    cells = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=shape)
+    return Snapshot(
+        width, height, mask_condition(survive), mask_condition(birth), generation, None if seed < 0 else seed, cells,
+        TOPOLOGIES[topology], rule, states,
+        )
+
+
+def board_rule(board) -> Rule:
+    """
+    The rule a board of any engine runs, only the numpy and parallel engines run more than Life-like rules.
+    """
+    if (name := getattr(board, "rule_name", None)) is not None:
+        return Rule.parse(name)
+    return Rule.from_conditions(board.live_condition, board.birth_condition)
+
+
+def save_board(board, path: Path | str) -> Path:
+    """
+    Snapshot a board of any engine. Only the board window is saved, for HashLife any cells that have
+    left it are dropped.
+    """
+    rule = board_rule(board)
+    path = save_grid(
+        path, board.board if rule.states > 2 else board.to_grid(), board.live_condition, board.birth_condition,
+        board.generation_number, board.seed, getattr(board, "topology", "bounded"), rule,
+        )
+    logger.debug(f"Saved generation {board.generation_number:,} to '{path}'.")
+    return path
+
+
+def load_board(board_type, path: Path | str, **kwargs):
+    """
+    Make a board of board_type from a snapshot.
+
+    Args:
+        board_type: Engine class, takes (num_of_cells, live_conditions=, birth_condition=, height=, **kwargs).
+        path (Path): Snapshot file.
+        **kwargs: Passed on to the engine, e.g. num_of_runs. A height is replaced by the snapshot's, a topology,
+                  conditions or a rule replace the snapshot's.
+
+    Raises:
+        ValueError: The snapshot's rule isn't Life-like and board_type can't run it.
+
+    Returns:
+        The new board, at the snapshot's generation.
+    """
+    snapshot = open_snapshot(path)
+    kwargs["height"] = snapshot.height
+    if not {"live_conditions", "birth_condition", "rule"} & kwargs.keys():
+        kwargs["live_conditions"] = snapshot.rule.live_conditions
+        kwargs["birth_condition"] = snapshot.rule.birth_condition
+        if not snapshot.rule.life_like:
+            if "rule" not in inspect.signature(board_type).parameters:
+                raise ValueError(f"'{path}' runs {snapshot.rule.name}, which {board_type.__name__} can't run.")
+            kwargs["rule"] = snapshot.rule
+    kwargs.setdefault("topology", snapshot.topology)
+    board = board_type(snapshot.width, **kwargs)
+    board.load_snapshot(snapshot)
+    board.generation_number = snapshot.generation
+    board.seed = snapshot.seed
+    logger.info(f"Loaded generation {snapshot.generation:,} from '{path}'.")
+    return board
+
+
+class Checkpoint(NamedTuple):
+    """
+    Save the board to path every so many generations.
+    """
+    path: Path
+    every: int
+
+    def due(self, generation: int) -> bool:
+        return self.every > 0 and generation % self.every == 0
+
+    def update(self, board) -> Checkpoint:
+        if self.due(board.generation_number):
+            save_board(board, self.path)
+        return self
+
+
+def run_with_checkpoints(board, runs: int, checkpoint: Checkpoint, loading_bar: bool = False):
+    """
+    Run a board for runs generations, saving a checkpoint whenever its generation number is a multiple
+    of checkpoint.every.
+    """
+    generations = progress(range(runs)) if loading_bar else range(runs)
+    for _ in generations:
+        board.generation()
+        checkpoint.update(board)
@@ -0,0 +1,278 @@
+"""
+sparse_board
+
+Board that only stores the alive cells. Positions are packed into a single int,
+key = y * stride + x, with stride two wider than the board so the neighbours of
+an edge cell fall into a gutter and never alias onto the opposite edge. On a torus or
+Klein bottle the edge cells are copied into the gutter before counting, the same as the
+border of ArrayBoard.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import itertools
+from collections import Counter
+from pathlib import Path
+from random import randint
+from typing import Generator, Iterable, Optional
+
+import numpy as np
+
+from .cycle import Cycle, hash_bytes, run_until_cycle
+from .util import Condition, NEIGHBOURS_DEFAULT, Position, Window, logger, progress
+from ..performance.timer import Timer
+from .cell import CellView
+from .snapshot import Checkpoint, Snapshot, load_board, run_with_checkpoints, save_board
+from .rules import Rule
+from .topology import check_topology, ghost_cells
+
+
+class SparseBoard:
+    """
+    Board whose cost per generation scales with the population, not the area.
+    """
+
+    cycle: Optional[Cycle] = None
+    generation_number: int = 0
+    seed: Optional[int] = None
+
+    def __init__(
+            self,
+            num_of_cells: int,
+            live_conditions: Condition = Condition(2, 3),
+            birth_condition: Condition = Condition(3),
+            num_of_runs: int = 0,
+            loading_bar: bool = False,
+            height: Optional[int] = None,
+            topology: str = "bounded",
+            ):
+        """
+
+        Args:
+            num_of_cells (int): Number of cells across the board.
+            live_conditions (Condition): the number of neighbours around a cell where you live.
+            birth_condition (Condition): number of neighbours which a cell is born.
+            height (int, Optional): Number of cells down the board. Default is num_of_cells.
+            topology (str): 'bounded', 'torus' or 'klein'. Default is 'bounded'.
+        """
+        if 0 in birth_condition:
+            raise ValueError(f"{self.__class__.__name__} can't run rules where a cell is born with 0 neighbours.")
+        self.num_of_runs = num_of_runs
+        self.board_size = self.width = num_of_cells
+        self.height: int = num_of_cells if height is None else height
+        self.topology: str = check_topology(topology)
+        self.stride = num_of_cells + 2
+        self.offsets: tuple[int, ...] = tuple(offset.y * self.stride + offset.x for offset in NEIGHBOURS_DEFAULT)
+        self.live: set[int] = set()
+        self.alive_neighbours: Counter[int] = Counter()
+        self.birth_condition = birth_condition
+        self.birth_condition_set = self.birth_condition.contains
+        logger.debug(f"Birth condition: {self.birth_condition_set}")
+        self.live_condition = live_conditions
+        self.live_condition_set = self.live_condition.contains
+        logger.debug(f"Live condition: {self.live_condition_set}")
+        # transitions[is_alive][alive_neighbours] -> next state
+        self.transitions: list[list[int]] = Rule.from_conditions(live_conditions, birth_condition).table().tolist()
+        self.loading_bar: bool = loading_bar
+        logger.success("Board initialised: ")
+
+    def __len__(self):
+        return self.width * self.height
+
+    @property
+    def population(self) -> int:
+        return len(self.live)
+
+    def key(self, cell: Position) -> int:
+        return cell.y * self.stride + cell.x
+
+    def position(self, key: int) -> Position:
+        y, x = divmod(key, self.stride)
+        return Position(x, y)
+
+    def set_random_board(self, random_seed: Optional[int] = None) -> SparseBoard:
+        """
+        Sets every cell in the board to a random state.
+
+        Uses the same draw as ArrayBoard so a seed gives the same board on both.
+
+        Args:
+            random_seed (int, Optional): Random seed value, if no seed is given will use a random value.
+                                         Default is None.
+
+        Returns:
+            Self
+        """
+        if random_seed is None:
+            random_seed = randint(0, 100)
+        logger.info(f"Random seed: {random_seed}")
+        self.seed = random_seed
+
+        random = np.random.default_rng(random_seed)
+        grid = random.integers(0, 2, size=(self.height, self.width), dtype=np.uint8)
+        y, x = np.nonzero(grid)
+        self.live ^= set((y.astype(np.int64) * self.stride + x).tolist())
+        return self
+
+    def reset(self) -> SparseBoard:
+        self.live.clear()
+        return self
+
+    @Timer.span("generation")
+    def generation(self) -> SparseBoard:
+        """
+        One generation.
+
+        Returns:
+            Self
+        """
+        self.check_state()
+        self.update_state()
+        self.generation_number += 1
+        return self
+
+    def run_for_set_amount(
+            self, runs: Optional[int] = None, stop_on_cycle: bool = False, checkpoint: Optional[Checkpoint] = None
+            ):
+        runs = self.num_of_runs if runs is None else runs
+        self.cycle = None
+        if stop_on_cycle:
+            self.cycle = run_until_cycle(self, runs, loading_bar=self.loading_bar, checkpoint=checkpoint)
+            return
+        if checkpoint is not None:
+            run_with_checkpoints(self, runs, checkpoint, loading_bar=self.loading_bar)
+            return
+        match self.loading_bar:
+            case True:
+                for _ in progress(range(runs)):
+                    self.generation()
+            case False:
+                for _ in range(runs):
+                    self.generation()
+
+    @Timer.span("check_state")
+    def check_state(self) -> SparseBoard:
+        """
+        Counts alive neighbours for every cell next to an alive cell.
+
+        Returns:
+            Self
+        """
+        offsets = self.offsets
+        live: Iterable[int] = self.live
+        if self.topology != "bounded":
+            live = itertools.chain(live, self.ghosts())
+        self.alive_neighbours = Counter(key + offset for key in live for offset in offsets)
+        return self
+
+    def ghosts(self) -> list[int]:
+        """
+        Keys of the copies of the alive edge cells in the gutter, for a torus or Klein bottle.
+        """
+        y, x = np.divmod(np.fromiter(self.live, dtype=np.int64, count=len(self.live)), self.stride)
+        y, x = ghost_cells(y, x, self.width, self.height, self.topology)
+        return (y * self.stride + x).tolist()
+
+    @Timer.span("update_state")
+    def update_state(self) -> SparseBoard:
+        """
+        Rebuild the alive set from the neighbour counts.
+
+        Only cells with at least one alive neighbour are counted, so alive cells missing from the count
+        have 0 neighbours.
+
+        Returns:
+            Self
+        """
+        live = self.live
+        stride = self.stride
+        size = self.width
+        limit = self.height * stride
+        transitions = self.transitions
+        new_live = {
+            key for key, num_alive in self.alive_neighbours.items()
+            if transitions[key in live][num_alive] and 0 <= key < limit and key % stride < size
+            }
+        if transitions[1][0]:
+            new_live |= live - self.alive_neighbours.keys()
+        self.live = new_live
+        return self
+
+    def toggle_cell(self, cell: Position) -> SparseBoard:
+        self.live ^= {self.key(cell)}
+        return self
+
+    def get_state(self, cell: Position) -> bool:
+        return self.key(cell) in self.live
+
+    def state_hash(self) -> bytes:
+        return hash_bytes(np.sort(np.fromiter(self.live, dtype=np.int64, count=len(self.live))).tobytes())
+
+    def set_state(self, cell: Position, is_alive: bool) -> SparseBoard:
+        if is_alive:
+            self.live.add(self.key(cell))
+        else:
+            self.live.discard(self.key(cell))
+        return self
+
+    def __iter__(self) -> Generator[tuple[Position, CellView], None, None]:
+        for j in range(self.height):
+            for i in range(self.width):
+                yield Position(i, j), CellView(i, j, self)
+
+    def save(self, path: Path | str) -> SparseBoard:
+        """
+        Write the board to a snapshot file.
+        """
+        save_board(self, path)
+        return self
+
+    @classmethod
+    def load(cls, path: Path | str, **kwargs) -> SparseBoard:
+        """
+        New board from a snapshot file, the size and rules come from the file and kwargs go to the constructor.
+        """
+        return load_board(cls, path, **kwargs)
+
+    def load_snapshot(self, snapshot: Snapshot) -> SparseBoard:
+        return self.load_grid(snapshot.grid())
+
+    def set_alive(self, ys: np.ndarray, xs: np.ndarray) -> SparseBoard:
+        """
+        Set the cells at (xs[i], ys[i]) alive.
+
+        Returns:
+            Self
+        """
+        self.live.update((ys.astype(np.int64) * self.stride + xs).tolist())
+        return self
+
+    def load_grid(self, grid: np.ndarray) -> SparseBoard:
+        """
+        Replace the board with the cells of a grid[y, x] array.
+
+        Returns:
+            Self
+        """
+        y, x = np.nonzero(grid)
+        self.live = set((y.astype(np.int64) * self.stride + x).tolist())
+        return self
+
+    def to_grid(self, window: Optional[Window] = None) -> np.ndarray:
+        """
+        The board as a uint8 array, grid[y, x].
+
+        Args:
+            window (Window, Optional): Only place the alive cells in this window. Default is the whole board.
+        """
+        if window is None:
+            window = Window(0, 0, self.width, self.height)
+        y, x = np.divmod(np.fromiter(self.live, dtype=np.int64, count=len(self.live)), self.stride)
+        y -= window.y
+        x -= window.x
+        inside = (0 <= y) & (y < window.height) & (0 <= x) & (x < window.width)
+        grid = np.zeros((window.height, window.width), dtype=np.uint8)
+        grid[y[inside], x[inside]] = 1
+        return grid
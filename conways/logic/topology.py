@@ -0,0 +1,101 @@
+"""
+topology
+
+Edges of a board. A bounded board has dead cells all the way round it, a torus joins the
+left edge to the right and the top to the bottom, and a Klein bottle joins the left to the
+right but flips the board left to right across the top and bottom.
+
+Engines with a padded grid fill the one cell border from the opposite edges once per
+generation and then count neighbours the same way for every topology.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from .util import logger
+
+
+TOPOLOGIES: tuple[str, ...] = ("bounded", "torus", "klein")
+
+
+def check_topology(topology: str) -> str:
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"topology: '{topology}' isn't one of {', '.join(TOPOLOGIES)}.")
+    return topology
+
+
+def wrap_columns(padded: np.ndarray, rows: slice = slice(1, -1)) -> np.ndarray:
+    """
+    Copy the first and last board columns of rows into the border on the opposite side.
+    """
+    padded[..., rows, 0] = padded[..., rows, -2]
+    padded[..., rows, -1] = padded[..., rows, 1]
+    return padded
+
+
+def wrap_row(padded: np.ndarray, source: int, target: int, topology: str) -> np.ndarray:
+    """
+    Copy padded row source, border columns included, into border row target. The Klein bottle
+    flips it left to right.
+    """
+    row = padded[..., source, :]
+    padded[..., target, :] = row[..., ::-1] if topology == "klein" else row
+    return padded
+
+
+def fill_padding(padded: np.ndarray, topology: str) -> np.ndarray:
+    """
+    Fill the one cell border on the last two axes of a padded grid for a topology. The border of a
+    bounded grid is left as it is, it should be all dead.
+
+    Returns:
+        padded
+    """
+    if topology == "bounded":
+        return padded
+    wrap_columns(padded)
+    wrap_row(padded, -2, 0, topology)
+    wrap_row(padded, 1, -1, topology)
+    return padded
+
+
+def ghost_cells(ys: np.ndarray, xs: np.ndarray, width: int, height: int, topology: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The copies of the edge cells among (xs, ys) that land in the border of a padded grid, the same
+    cells fill_padding would set.
+
+    Returns:
+        ys, xs of the copies, each from -1 to height or width.
+    """
+    if topology == "bounded" or not len(xs):
+        return ys[:0], xs[:0]
+    columns = [(ys, xs)]
+    for edge, image in ((0, width), (width - 1, -1)):
+        on_edge = xs == edge
+        columns.append((ys[on_edge], np.full(int(on_edge.sum()), image, dtype=xs.dtype)))
+    ys, xs = (np.concatenate(axis) for axis in zip(*columns))
+    copies = list(columns[1:])
+    for edge, image in ((0, height), (height - 1, -1)):
+        on_edge = ys == edge
+        flipped = width - 1 - xs[on_edge] if topology == "klein" else xs[on_edge]
+        copies.append((np.full(len(flipped), image, dtype=ys.dtype), flipped))
+    return tuple(np.concatenate(axis) for axis in zip(*copies))
+
+
+def pad(grid: np.ndarray, width: int, topology: str) -> np.ndarray:
+    """
+    Copy of grid[y, x] with a border width cells wide on every side filled for a topology, as fill_padding
+    does for one cell. The border can't be wider than the grid for a torus or Klein bottle.
+    """
+    if topology == "bounded":
+        return np.pad(grid, width)
+    if width > min(grid.shape):
+        raise ValueError(f"A {topology} {grid.shape[1]}x{grid.shape[0]} board can't wrap a border {width} wide.")
+    columns = np.pad(grid, ((0, 0), (width, width)), mode="wrap")
+    above, below = columns[-width:], columns[:width]
+    if topology == "klein":
+        above, below = above[:, ::-1], below[:, ::-1]
+    return np.concatenate((above, columns, below))
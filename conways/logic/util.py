@@ -10,12 +10,21 @@ import sys
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
-from typing import NamedTuple, Optional
+from typing import Iterable, NamedTuple, Optional
 import loguru
 from loguru import logger
-from icecream import ic
 
-logger.success(f"{__name__} importing...")
+
+class LogLevel:
+    """
+    Lowest level the log sinks take, set by Options.set_log_level. Lets a hot path skip building
+    messages or records that would only be dropped.
+    """
+    no: int = 0
+
+    @classmethod
+    def enabled(cls, level: str) -> bool:
+        return logger.level(level).no >= cls.no
 
 
 class Position(NamedTuple):
@@ -26,6 +35,24 @@ class Position(NamedTuple):
     y: int
 
 
+class Window(NamedTuple):
+    """
+    Rectangle of cells on the board, (x, y) is the top left cell.
+    """
+    x: int
+    y: int
+    width: int
+    height: int
+
+    @property
+    def rows(self) -> slice:
+        return slice(self.y, self.y + self.height)
+
+    @property
+    def columns(self) -> slice:
+        return slice(self.x, self.x + self.width)
+
+
 NEIGHBOURS_DEFAULT: set[Position] = {
     Position(1, 0),
     Position(1, 1),
@@ -73,8 +100,31 @@ class Condition:
         else:
             self.contains |= set(range(self.low, self.high + 1))
 
+    @classmethod
+    def from_counts(cls, counts: Iterable[int]) -> Condition:
+        """
+        Condition holding exactly the given counts, low and high are the smallest and largest.
+        """
+        counts = sorted(set(counts))
+        if not counts:
+            condition = cls(0)
+            condition.contains.clear()
+            return condition
+        condition = cls(counts[0], counts[-1])
+        condition.contains = set(counts)
+        return condition
+
     def __contains__(self, item):
         return item in self.contains
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.low}, {self.high}, {self.contains})"
+
+
+def progress(iterable: Iterable, total: Optional[int] = None) -> Iterable:
+    """
+    Wrap iterable in a tqdm loading bar, tqdm is only imported when a bar is shown.
+    """
+    from tqdm import tqdm
+
+    return tqdm(iterable, total=total)
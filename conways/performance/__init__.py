@@ -1,9 +1,36 @@
 """
 Performance Module
 
+Tools are imported the first time they are used, the engines only need the timer.
+
 Author: Zack Hankin
 Started: 4/02/2023
 """
-from .timer import Timer
+import importlib
+from typing import Any
+
+# Choices of --profile, kept here so the arguments can be parsed without importing the profiler.
+PROFILERS: tuple[str, ...] = ("cprofile", "sampling")
+
+MODULES: dict[str, str] = {
+    "Timer": "timer",
+    "MemoryReport": "memory",
+    "measure_construction": "memory",
+    "Sampler": "profiler",
+    "profile_run": "profiler",
+    "check_import_time": "import_time",
+    "Metrics": "metrics",
+    "GenerationRecord": "metrics",
+    }
+
+__all__: list[str] = ["PROFILERS", *MODULES]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{MODULES[name]}", __name__), name)
+
 
-__all__: list[str] = ['Timer']
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,113 @@
+"""
+import_time.py
+
+Import time budget. Imports a module in a fresh interpreter after the third party packages it
+can't do without (numpy and loguru), so only the time the package itself adds is measured, and
+fails when that is over budget or when a dependency only some runs need got imported with it.
+
+Usage: python -m conways import-time --module conways.logic --budget 30
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from conways.logic.util import logger
+
+BASELINE: tuple[str, ...] = ("numpy", "loguru")
+OPTIONAL: tuple[str, ...] = ("pygame", "pandas", "tqdm", "icecream", "pyarrow")
+MEASURE: str = """
+import json, sys, time
+start = time.perf_counter()
+{baseline}
+middle = time.perf_counter()
+import {module}
+end = time.perf_counter()
+print(json.dumps([middle - start, end - middle, [name for name in {optional!r} if name in sys.modules]]))
+"""
+
+
+class ImportTime(NamedTuple):
+    """
+    Seconds to import the baseline packages and then the module, and the optional packages it loaded.
+    """
+    module: str
+    baseline: float
+    seconds: float
+    loaded: list[str]
+
+
+def import_arg_parser() -> ArgumentParser:
+    """
+    Argument parser for the import-time entry point.
+
+    Returns:
+        ArgumentParser for use.
+    """
+    parser = argparse.ArgumentParser(prog="Conway's Game of Life import-time")
+    parser.add_argument(
+        "-m", "--module", help="Module to import. Default: conways.logic", metavar="module", default="conways.logic"
+        )
+    parser.add_argument(
+        "-b", "--budget", help="Most milliseconds the module may add after numpy and loguru. Default: 30",
+        type=float, metavar="float", default=30.0
+        )
+    parser.add_argument(
+        "-r", "--repeat", help="Fresh interpreters to time, the fastest counts. Default: 5",
+        type=int, metavar="int", default=5
+        )
+    return parser
+
+
+def measure_import(module: str, repeat: int = 5) -> ImportTime:
+    """
+    Time importing module in repeat fresh interpreters and keep the fastest.
+    """
+    code = MEASURE.format(
+        baseline="\n".join(f"import {name}" for name in BASELINE), module=module, optional=OPTIONAL
+        )
+    root = str(Path(__file__).resolve().parents[2])
+    environment = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, (root, os.environ.get("PYTHONPATH"))))}
+    environment.pop("CONWAYS_TIMING", None)
+    best: Optional[ImportTime] = None
+    for _ in range(max(1, repeat)):
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, env=environment, check=True
+            )
+        baseline, seconds, loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        if best is None or seconds < best.seconds:
+            best = ImportTime(module, baseline, seconds, loaded)
+    return best
+
+
+def check_import_time(args: Optional[list[str]] = None) -> int:
+    """
+    Run the import-time check.
+
+    Returns:
+        1 when the module is over budget or loaded an optional package, otherwise 0.
+    """
+    options = import_arg_parser().parse_args(args)
+    result = measure_import(options.module, options.repeat)
+    milliseconds = result.seconds * 1000
+    logger.success(
+        f"import {result.module}: {milliseconds:,.1f} ms after {', '.join(BASELINE)} "
+        f"({result.baseline * 1000:,.1f} ms), budget {options.budget:,.1f} ms."
+        )
+    failed = False
+    if milliseconds > options.budget:
+        logger.error(f"import {result.module} is {milliseconds - options.budget:,.1f} ms over budget.")
+        failed = True
+    if result.loaded:
+        logger.error(f"import {result.module} loaded {', '.join(result.loaded)}, they should only load when used.")
+        failed = True
+    return int(failed)
@@ -0,0 +1,72 @@
+"""
+memory.py
+
+Memory footprint of a board's construction.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import time
+import tracemalloc
+from typing import Any, NamedTuple
+
+from conways.logic.util import logger
+
+
+class MemoryReport(NamedTuple):
+    """
+    Bytes allocated and time taken to construct a board.
+    """
+    engine: str
+    cells: int
+    bytes: int
+    peak_bytes: int
+    construction_ns: int
+
+    @property
+    def bytes_per_cell(self) -> float:
+        return self.bytes / self.cells if self.cells else 0.0
+
+    def log(self) -> MemoryReport:
+        logger.success(f"Engine: {self.engine}, cells: {self.cells:,}")
+        logger.success(f"Memory: {self.bytes:,} B ({self.bytes_per_cell:,.2f} B/cell), peak {self.peak_bytes:,} B")
+        logger.success(f"Construction time: {self.construction_ns * 10 ** -6:,.2f} ms")
+        return self
+
+
+def measure_construction(board_type: type, *args, **kwargs) -> tuple[Any, MemoryReport]:
+    """
+    Construct a board twice, once while tracing the memory it allocates and once for timing.
+
+    Allocation tracing slows construction down several times over, so the board returned is the
+    untraced one. The traced board is closed before the second is built, so the parallel engine
+    never holds two worker pools and their shared memory at once. Memory held outside the Python allocators, like shared memory, isn't counted.
+
+    Args:
+        board_type (type): Board class to construct.
+        *args: Passed to board_type.
+        **kwargs: Passed to board_type.
+
+    Returns:
+        The board and its MemoryReport.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    traced = board_type(*args, **kwargs)
+    after, peak = tracemalloc.get_traced_memory()
+    if not tracing:
+        tracemalloc.stop()
+    if (close := getattr(traced, "close", None)) is not None:
+        close()
+    del traced
+
+    start = time.perf_counter_ns()
+    board = board_type(*args, **kwargs)
+    end = time.perf_counter_ns()
+    report = MemoryReport(board_type.__name__, len(board), after - before, peak - before, end - start)
+    return board, report
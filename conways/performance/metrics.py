@@ -0,0 +1,268 @@
+"""
+metrics.py
+
+Structured per-generation metrics. Every engine's generation span is hooked to make a
+GenerationRecord of the generation number, population, births, deaths and the ns the step took.
+Records are only made while metrics are on, and the stepping thread only reads counts the engines
+keep and puts the raw tuple on a queue. Board counts from the cells it changed, the numpy,
+bitpacked and parallel engines count births and deaths as they step while counting is on. Formatting and writing happen on a background thread, into a buffered
+.jsonl or .csv file and, at TRACE level, the log, so a run never waits on I/O for them.
+
+The parallel engine runs one generation at a time while metrics are on. HashLife still jumps
+many generations at once, so it has one record per jump, for the generation it ends on.
+
+Metrics are switched on with --metrics path on the command line, or at -vvv for the log alone.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import atexit
+import csv
+import functools
+import io
+import json
+import queue
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional, TextIO
+
+import numpy as np
+
+from conways.logic.util import logger, LogLevel
+from .timer import Timer
+
+
+BUFFER_SIZE: int = 1 << 16
+BATCH_SIZE: int = 1024
+
+
+class GenerationRecord(NamedTuple):
+    """
+    One generation of one board.
+    """
+    generation: int
+    population: int
+    births: int
+    deaths: int
+    step_ns: int
+
+
+def before_step(board: Any) -> Any:
+    """
+    What count_step needs of the board from before a generation, nothing for engines that keep the
+    cells they changed or count their births and deaths.
+    """
+    if hasattr(board, "changed") or hasattr(board, "counting"):
+        return None
+    if isinstance(live := getattr(board, "live", None), set):
+        return set(live)
+    return board.to_grid()
+
+
+def count_step(board: Any, before: Any) -> tuple[int, int, int]:
+    """
+    Population, births and deaths of the generation just run.
+
+    Args:
+        board: Board after the generation.
+        before: What before_step returned for it before the generation.
+    """
+    if before is None and hasattr(board, "changed"):
+        changed = board.changed
+        births = sum(board.get_state(cell) for cell in changed)
+        return board.population, births, len(changed) - births
+    if before is None:
+        return board.population, *board.counts
+    if isinstance(before, set):
+        live = board.live
+        return len(live), len(live - before), len(before - live)
+    alive, was_alive = board.to_grid() == 1, before == 1
+    births = int(np.count_nonzero(alive & ~was_alive))
+    deaths = int(np.count_nonzero(was_alive & ~alive))
+    return int(np.count_nonzero(alive)), births, deaths
+
+
+class MetricsWriter(threading.Thread):
+    """
+    Background thread writing the records put on its queue, a batch at a time, to a buffered file and
+    to the log at TRACE level.
+    """
+
+    def __init__(self, path: Optional[Path] = None, log: bool = False):
+        super().__init__(name="metrics", daemon=True)
+        self.path = path
+        self.log = log
+        self.queue: queue.SimpleQueue[Optional[GenerationRecord]] = queue.SimpleQueue()
+        self.written: int = 0
+
+    def put(self, record: GenerationRecord):
+        """
+        Queue a record, never blocks.
+        """
+        self.queue.put(record)
+
+    def batches(self):
+        """
+        Batches of the records queued, until close puts None.
+        """
+        while (record := self.queue.get()) is not None:
+            batch = [record]
+            try:
+                while len(batch) < BATCH_SIZE:
+                    if (record := self.queue.get_nowait()) is None:
+                        yield batch
+                        return
+                    batch.append(record)
+            except queue.Empty:
+                ...
+            yield batch
+
+    def open(self) -> Optional[TextIO]:
+        if self.path is None:
+            return None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return self.path.open("w", buffering=BUFFER_SIZE, newline="")
+
+    def run(self):
+        file = self.open()
+        write = self.writer(file)
+        trace = logger.trace
+        try:
+            for batch in self.batches():
+                if write is not None:
+                    write(batch)
+                if self.log:
+                    for record in batch:
+                        trace(
+                            "Generation {generation:,}: population {population:,}, births {births:,}, "
+                            "deaths {deaths:,}, step {step_ns:,} ns", **record._asdict()
+                            )
+                self.written += len(batch)
+        finally:
+            if file is not None:
+                file.close()
+
+    def writer(self, file: Optional[TextIO]) -> Optional[Callable[[list[GenerationRecord]], Any]]:
+        """
+        Function writing a batch to file, as CSV for a .csv path and JSON lines for anything else.
+        """
+        if file is None:
+            return None
+        if self.path.suffix == ".csv":
+            rows = csv.writer(file)
+            rows.writerow(GenerationRecord._fields)
+            return rows.writerows
+
+        def write(batch: list[GenerationRecord]):
+            buffer = io.StringIO()
+            for record in batch:
+                buffer.write(json.dumps(record._asdict()))
+                buffer.write("\n")
+            file.write(buffer.getvalue())
+
+        return write
+
+    def close(self) -> MetricsWriter:
+        """
+        Write what is still queued and wait for the thread to finish.
+        """
+        if self.is_alive():
+            self.queue.put(None)
+            self.join()
+        return self
+
+
+class Metrics:
+    """
+    Hooks the generation span of every engine with a to_grid, and HashLife's jump span, recording each call to a
+    MetricsWriter.
+    """
+
+    def __init__(self, path: Optional[Path] = None, log: Optional[bool] = None):
+        """
+        Args:
+            path (Path, Optional): .jsonl or .csv file to write the records to.
+            log (bool, Optional): Log the records at TRACE level. Default: when TRACE is logged.
+        """
+        self.writer = MetricsWriter(path, LogLevel.enabled("TRACE") if log is None else log)
+        # Boards part way through a recorded call, a generation that jumps isn't recorded twice.
+        self._stepping: set[int] = set()
+        # Boards counting their births and deaths for the records, switched off again by close.
+        self._counting: weakref.WeakSet = weakref.WeakSet()
+        self._jumped: bool = False
+
+    def observe(self, owner: type, function: Callable) -> Callable:
+        """
+        Timer hook wrapping a generation method to record each call.
+        """
+        if not hasattr(owner, "to_grid"):
+            return function
+        put = self.writer.put
+        stepping = self._stepping
+        counting = self._counting
+        clock = time.perf_counter_ns
+
+        @functools.wraps(function)
+        def wrapper(board, *args, **kwargs):
+            if id(board) in stepping:
+                return function(board, *args, **kwargs)
+            if not getattr(board, "counting", True):
+                board.counting = True
+                counting.add(board)
+            stepping.add(id(board))
+            try:
+                before = before_step(board)
+                start = clock()
+                result = function(board, *args, **kwargs)
+                step = clock() - start
+                put(GenerationRecord(board.generation_number, *count_step(board, before), step))
+                return result
+            finally:
+                stepping.discard(id(board))
+
+        return wrapper
+
+    def observe_jump(self, owner: type, function: Callable) -> Callable:
+        """
+        Timer hook wrapping HashLife's jump(j), one record covers all 2**j generations.
+        """
+        wrapper = self.observe(owner, function)
+
+        @functools.wraps(function)
+        def jump(board, j: int, *args, **kwargs):
+            if j and not self._jumped:
+                self._jumped = True
+                logger.warning("HashLife jumps many generations at once, its metrics have one record per jump.")
+            return wrapper(board, j, *args, **kwargs)
+
+        return jump
+
+    def enable(self) -> Metrics:
+        self.writer.start()
+        Timer.hook("generation", self.observe)
+        Timer.hook("jump", self.observe_jump)
+        return self
+
+    def close(self) -> Metrics:
+        """
+        Unhook the spans and finish writing.
+        """
+        if not self.writer.is_alive():
+            return self
+        Timer.unhook("generation", self.observe)
+        Timer.unhook("jump", self.observe_jump)
+        for board in list(self._counting):
+            board.counting = False
+        self._counting.clear()
+        self.writer.close()
+        if self.writer.path is not None and self.writer.written:
+            logger.success(f"{self.writer.written:,} generation record/s written to '{self.writer.path}'.")
+        return self
+
+    def close_at_exit(self) -> Metrics:
+        atexit.register(self.close)
+        return self
@@ -0,0 +1,165 @@
+"""
+profiler.py
+
+Profile a run, the way the files in profiling/ used to be made by hand.
+
+    cprofile   deterministic, every call is traced. Writes a timestamped .pstats file and, when
+               gprof2dot is installed, the call graph as .dot and .svg (with graphviz's dot).
+    sampling   statistical, a background thread looks at every thread's stack every few ms.
+               Writes the samples as folded stacks (.folded), the input of flamegraph.pl and
+               speedscope, and logs the functions seen most. Cheap enough to leave on for long runs.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Optional
+
+from conways.logic.util import logger
+from . import PROFILERS
+
+
+def stamped_path(directory: Path, suffix: str) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"log-{datetime.now():%Y%m%d-%H%M%S}{suffix}"
+
+
+def render_call_graph(stats: Path) -> Optional[Path]:
+    """
+    Render a .pstats file with gprof2dot, to .svg when graphviz is installed or .dot when it isn't.
+
+    Returns:
+        The file written, None when gprof2dot isn't installed.
+    """
+    try:
+        import gprof2dot
+    except ImportError:
+        logger.info("gprof2dot isn't installed, skipping the call graph.")
+        return None
+    graph = stats.with_suffix(".dot")
+    # yelp-gprof2dot only reads pstats and has no -f, gprof2dot needs to be told.
+    format_ = ["-f", "pstats"] if hasattr(gprof2dot, "formats") else []
+    subprocess.run(
+        [sys.executable, "-m", "gprof2dot", *format_, str(stats), "-o", str(graph)], check=True
+        )
+    if (dot := shutil.which("dot")) is None:
+        logger.info("graphviz's dot isn't installed, leaving the call graph as .dot.")
+        return graph
+    image = stats.with_suffix(".svg")
+    subprocess.run([dot, "-Tsvg", str(graph), "-o", str(image)], check=True)
+    return image
+
+
+def run_cprofile(function: Callable[[], Any], directory: Path) -> Any:
+    import cProfile
+
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(function)
+    finally:
+        stats = stamped_path(directory, ".pstats")
+        profile.dump_stats(stats)
+        logger.success(f"Profile written to '{stats}'.")
+        if (graph := render_call_graph(stats)) is not None:
+            logger.success(f"Call graph written to '{graph}'.")
+
+
+class Sampler(threading.Thread):
+    """
+    Background thread counting the stacks of every other thread every interval seconds.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        super().__init__(name="sampler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples: int = 0
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def fold(frame: Optional[FrameType], thread: str) -> str:
+        names: list[str] = list()
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+            frame = frame.f_back
+        names.append(thread)
+        return ";".join(reversed(names))
+
+    def run(self):
+        threads = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not self._stop_event.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == self.ident:
+                    continue
+                if ident not in threads:
+                    threads = {thread.ident: thread.name for thread in threading.enumerate()}
+                self.stacks[self.fold(frame, threads.get(ident, str(ident)))] += 1
+            self.samples += 1
+
+    def stop(self) -> Sampler:
+        self._stop_event.set()
+        self.join()
+        return self
+
+    def write(self, path: Path) -> Path:
+        """
+        Write the stacks in the folded format, 'outer;...;inner count' per line.
+        """
+        with path.open("w") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+        return path
+
+    def top(self, limit: int = 10) -> list[tuple[str, int]]:
+        """
+        Functions seen most at the top of a stack.
+        """
+        leaves: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(limit)
+
+
+def run_sampling(function: Callable[[], Any], directory: Path, interval: float) -> Any:
+    sampler = Sampler(interval)
+    sampler.start()
+    try:
+        return function()
+    finally:
+        sampler.stop()
+        stacks = sampler.write(stamped_path(directory, ".folded"))
+        logger.success(f"{sampler.samples:,} sample/s every {interval * 1000:g} ms written to '{stacks}'.")
+        total = sum(sampler.stacks.values()) or 1
+        for name, count in sampler.top():
+            logger.info(f"{count / total:7.2%} {name}")
+
+
+def profile_run(function: Callable[[], Any], profiler: str, directory: Path, interval: float = 0.005) -> Any:
+    """
+    Call function under a profiler and write out what it found.
+
+    Args:
+        function (Callable): Run to profile, e.g. ui.run.
+        profiler (str): 'cprofile' or 'sampling'.
+        directory (Path): Folder for the timestamped output files.
+        interval (float): Seconds between samples when sampling.
+
+    Returns:
+        What function returned.
+    """
+    match profiler:
+        case "cprofile":
+            return run_cprofile(function, directory)
+        case "sampling":
+            return run_sampling(function, directory, interval)
+    raise ValueError(f"profiler: '{profiler}' isn't one of {', '.join(PROFILERS)}.")
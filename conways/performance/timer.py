@@ -1,75 +1,246 @@
 """
 timer.py
 
+Named timing spans on the hot paths, generation, check_state, update_state, draw_cells and
+set_neighbours, and the multi-generation step of the parallel engine and jump of HashLife.
+Methods are marked with @Timer.span(name) and left untouched until timing is switched on, so
+they cost nothing when it is off. Once on, each call is timed into a fixed size HDR style
+histogram for its span, and a summary is logged at exit or dumped to JSON.
 
+Timing is switched on with --timing on the command line, Timer.enable(), or by setting the
+CONWAYS_TIMING environment variable to 1 or to a .json path to dump the summary to. Other
+instruments, like the per-generation metrics, hook a span by name and are wrapped around it
+whether timing is on or not.
 
 Author: Zack Hankin
 Started: 4/02/2023
 """
 from __future__ import annotations
-import time
-from typing import Any, Callable
+
+import atexit
 import functools
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
 from conways.logic.util import logger
-from icecream import ic
 
-logger.success(f"{__name__} importing...")
 
+SUB_BUCKET_BITS: int = 4
+SUB_BUCKETS: int = 1 << SUB_BUCKET_BITS
+MAX_BITS: int = 44
 
-class Timer:
+
+class Histogram:
+    """
+    Streaming log-linear histogram of ns values. Values under 2 * SUB_BUCKETS are counted exactly, larger
+    ones to within 1 / SUB_BUCKETS of their size, up to 2 ** MAX_BITS ns (about 4.9 hours).
+    """
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts: list[int] = [0] * ((MAX_BITS - SUB_BUCKET_BITS + 1) * SUB_BUCKETS)
+        self.count: int = 0
+        self.total: int = 0
+        self.min: int = 0
+        self.max: int = 0
+
+    def record(self, value: int) -> Histogram:
+        value = min(max(value, 0), (1 << MAX_BITS) - 1)
+        shift = max(0, value.bit_length() - SUB_BUCKET_BITS - 1)
+        self.counts[shift * SUB_BUCKETS + (value >> shift)] += 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+        return self
+
+    @staticmethod
+    def bucket_value(index: int) -> int:
+        """
+        Middle of the values counted in a bucket.
+        """
+        shift = max(0, index // SUB_BUCKETS - 1)
+        return ((index - shift * SUB_BUCKETS) << shift) + ((1 << shift) >> 1)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> int:
+        """
+        Value below which percent of the recorded values fall, to the histogram's precision.
+        """
+        if not self.count:
+            return 0
+        target = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(max(self.bucket_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count, "total_ns": self.total, "mean_ns": self.mean, "min_ns": self.min,
+            "p50_ns": self.percentile(50), "p95_ns": self.percentile(95), "p99_ns": self.percentile(99),
+            "max_ns": self.max,
+            }
+
+
+def timed(function: Callable, histogram: Histogram) -> Callable:
     """
-    Timer decorator for measuring runtimes in nanoseconds.
+    Wrap function to record how long each call takes into histogram.
+    """
+    record = histogram.record
+    clock = time.perf_counter_ns
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record(clock() - start)
+
+    return wrapper
 
-    Access times through 'times' property of the function/method.
+
+class Span:
+    """
+    Marks a method as a timing span. Replaced on its class by the plain method, or the timed and hooked
+    one, as soon as the class is made.
     """
 
-    cached_time: dict[str, list[int]] = dict()
+    def __init__(self, name: str, function: Callable):
+        self.name = name
+        self.function = function
 
-    def __init__(self, function: Callable[[...], ...]):
-        self.name = function.__name__
-        self.cached_time[self.name] = list()
-        self.function: Callable[[...], ...] = function
-        functools.update_wrapper(self, function)
+    def __set_name__(self, owner: type, attribute: str):
+        Timer.registered.append((owner, attribute, self))
+        setattr(owner, attribute, Timer.build(owner, self))
 
-    def __call__(self, *args, **kwargs) -> Any:
-        ic(*args, **kwargs)
-        start = time.perf_counter_ns()
 
-        result = self.function(*args, **kwargs)
-        end = time.perf_counter_ns()
-        self.cached_time[self.name].append(end - start)
-        return result
+class Timer:
+    """
+    Registry of the timing spans and their histograms.
+    """
+
+    enabled: bool = False
+    registered: list[tuple[type, str, Span]] = list()
+    histograms: dict[str, Histogram] = dict()
+    hooks: dict[str, list[Callable[[type, Callable], Callable]]] = dict()
 
-    # Todo: Fix this hack. Maybe run as a generator function or run the init. Or change to def then class.
     @staticmethod
-    def time(function):
-        Timer.cached_time[function.__name__] = list()
+    def span(name: str) -> Callable[[Callable], Span]:
+        """
+        Decorator marking a method as the span name, e.g. @Timer.span("generation").
+        """
+        return functools.partial(Span, name)
 
-        def wrapper(slf, *args, **kwargs):
-            start = time.perf_counter_ns()
-            result = function(slf, *args, **kwargs)
-            end = time.perf_counter_ns()
-            Timer.cached_time[function.__name__].append(end - start)
-            return result
+    @classmethod
+    def wrap(cls, span: Span) -> Callable:
+        return timed(span.function, cls.histograms.setdefault(span.name, Histogram()))
 
-        return wrapper
+    @classmethod
+    def build(cls, owner: type, span: Span) -> Callable:
+        """
+        The method to put on owner for span, timed when timing is on and then wrapped by its hooks.
+        """
+        function = cls.wrap(span) if cls.enabled else span.function
+        for hook in cls.hooks.get(span.name, ()):
+            function = hook(owner, function)
+        return function
+
+    @classmethod
+    def rebuild(cls) -> type[Timer]:
+        for owner, attribute, span in cls.registered:
+            setattr(owner, attribute, cls.build(owner, span))
+        return cls
+
+    @classmethod
+    def enable(cls) -> type[Timer]:
+        """
+        Start timing every span, including ones on classes made later.
+        """
+        cls.enabled = True
+        return cls.rebuild()
 
-    @property
-    def times(self) -> list[int]:
+    @classmethod
+    def disable(cls) -> type[Timer]:
         """
-        Returns:
-            List of run times in order.
+        Stop timing, the histograms and hooks are kept.
         """
-        return self.cached_time[self.name]
+        cls.enabled = False
+        return cls.rebuild()
 
+    @classmethod
+    def hook(cls, name: str, hook: Callable[[type, Callable], Callable]) -> type[Timer]:
+        """
+        Wrap every span called name with hook(owner, method), which returns the method to use instead.
+        """
+        cls.hooks.setdefault(name, list()).append(hook)
+        return cls.rebuild()
+
+    @classmethod
+    def hooked(cls, name: str) -> bool:
+        """
+        Whether anything hooks the span name, runs that skip it for speed should go through it.
+        """
+        return bool(cls.hooks.get(name))
+
+    @classmethod
+    def unhook(cls, name: str, hook: Callable[[type, Callable], Callable]) -> type[Timer]:
+        if hook in cls.hooks.get(name, ()):
+            cls.hooks[name].remove(hook)
+        return cls.rebuild()
 
-# class Demo:
-#
-#     @Timer
-#     def timeme(self):
-#         time.sleep(1)
-#
-#
-# d = Demo()
-#
-# d.timeme()
+    @classmethod
+    def summary(cls) -> dict[str, dict[str, Any]]:
+        return {name: histogram.summary() for name, histogram in sorted(cls.histograms.items()) if histogram.count}
+
+    @classmethod
+    def table(cls) -> str:
+        """
+        The summary as text, times in microseconds.
+        """
+        lines = [f"{'span':<16}{'calls':>12}{'total ms':>14}{'mean':>12}{'p50':>12}{'p95':>12}{'p99':>12}{'max':>12}"]
+        for name, summary in cls.summary().items():
+            lines.append(
+                f"{name:<16}{summary['count']:>12,}{summary['total_ns'] * 1e-6:>14,.2f}"
+                + "".join(f"{summary[key] * 1e-3:>12,.2f}" for key in ("mean_ns", "p50_ns", "p95_ns", "p99_ns", "max_ns"))
+                )
+        return "\n".join(lines)
+
+    @classmethod
+    def dump(cls, path: Path | str) -> Path:
+        path = Path(path)
+        path.write_text(json.dumps(cls.summary(), indent=2))
+        return path
+
+    @classmethod
+    def report(cls, path: Optional[Path | str] = None) -> type[Timer]:
+        """
+        Log the summary, or dump it to path as JSON.
+        """
+        if not cls.summary():
+            return cls
+        if path is None:
+            logger.success(f"Timing spans (us):\n{cls.table()}")
+        else:
+            logger.success(f"Timing spans written to '{cls.dump(path)}'.")
+        return cls
+
+    @classmethod
+    def report_at_exit(cls, path: Optional[Path | str] = None) -> type[Timer]:
+        atexit.register(cls.report, path)
+        return cls
+
+
+if timing := os.environ.get("CONWAYS_TIMING"):
+    Timer.enable().report_at_exit(timing if timing.endswith(".json") else None)
@@ -1,18 +1,32 @@
 """
 User Interface Module
 
+Each UI is imported the first time it is used, so a run only loads the dependencies of the one it
+picks, pygame for PygameUI and Recorder.
+
 Author: Zack Hankin
 Started: 3/02/2023
 """
+import importlib
+from typing import Any
 
-from .ui_args import Options
+MODULES: dict[str, str] = {
+    "Options": "ui_args",
+    "PygameUI": "pygame_ui",
+    "CLI": "cli_ui",
+    "Recorder": "recorder",
+    "Sweep": "sweep",
+    "Bench": "bench",
+    }
 
-__all__: list[str] = ["Options"]
+__all__: list[str] = list(MODULES)
 
-from .pygame_ui import PygameUI
 
-__all__ += ["PygameUI"]
+def __getattr__(name: str) -> Any:
+    if name not in MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{MODULES[name]}", __name__), name)
 
-from .cli_ui import CLI
 
-__all__ += ["CLI"]
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
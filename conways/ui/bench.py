@@ -0,0 +1,257 @@
+"""
+bench.py
+
+Benchmark suite over widths x densities x generations x engines. Every case is warmed up
+and then timed over repeated trials, one generation at a time, and the median and 95th
+percentile ns per generation and per cell update are written to a JSON file. Two result
+files can be compared, exiting with 1 when a case got slower than the threshold allows.
+
+Usage: python -m conways bench --widths 64 256 --densities 0.1 0.5 -o bench.json --baseline old.json
+       python -m conways bench --compare old.json new.json --threshold 0.1
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+from argparse import ArgumentParser
+from datetime import datetime
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+from loguru import logger
+
+from conways.logic import ENGINES
+from .ui_args import Options
+
+
+VERSION: int = 1
+
+
+class BenchCase(NamedTuple):
+    """
+    One cell of the benchmark matrix.
+    """
+    engine: str
+    width: int
+    density: float
+    generations: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.engine}/w{self.width}/d{self.density:g}/n{self.generations}"
+
+
+def percentiles(samples: np.ndarray) -> dict[str, float]:
+    return {"median": float(np.median(samples)), "p95": float(np.percentile(samples, 95))}
+
+
+def bench_arg_parser() -> ArgumentParser:
+    """
+    Argument parser for the bench entry point.
+
+    Returns:
+        ArgumentParser for use.
+    """
+    parser = argparse.ArgumentParser(prog="Conway's Game of Life bench")
+    parser.add_argument(
+        "-e", "--engines", help="Engines to time. Default: all of them",
+        nargs="+", choices=list(ENGINES), default=list(ENGINES)
+        )
+    parser.add_argument(
+        "-w", "--widths", help="Widths of grid. Default: 64 256", nargs="+", type=int, metavar="int", default=[64, 256]
+        )
+    parser.add_argument(
+        "-d", "--densities", help="Fraction of cells alive at the start. Default: 0.1 0.5",
+        nargs="+", type=float, metavar="float", default=[0.1, 0.5]
+        )
+    parser.add_argument(
+        "-n", "--generations", help="Generations timed per trial. Default: 20",
+        nargs="+", type=int, metavar="int", default=[20]
+        )
+    parser.add_argument(
+        "--warmup", help="Generations run before each trial is timed. Default: 3", type=int, metavar="int", default=3
+        )
+    parser.add_argument(
+        "--trials", help="Timed trials per case, each from a new board. Default: 5", type=int, metavar="int", default=5
+        )
+    parser.add_argument(
+        "--seed", help="Seed for the starting cells. Default: 1", type=int, metavar="int", default=1
+        )
+    parser.add_argument(
+        "-o", "--output", help="Results file. Default: bench.json", type=Path, metavar="path", default=Path("bench.json")
+        )
+    parser.add_argument(
+        "--baseline", help="Earlier results to compare this run against.", type=Path, metavar="path", default=None
+        )
+    parser.add_argument(
+        "--compare", help="Compare two results files without running anything.",
+        nargs=2, type=Path, metavar=("old", "new"), default=None
+        )
+    parser.add_argument(
+        "--threshold", help="Largest allowed slow down of the median ns per cell update, 0.1 is 10%%. Default: 0.1",
+        type=float, metavar="float", default=0.1
+        )
+    parser.add_argument("-v", "--verbose", action="count", default=0)
+    return parser
+
+
+def starting_cells(width: int, density: float, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    ys, xs of the cells alive at the start, each cell alive with probability density.
+    """
+    random = np.random.default_rng(seed)
+    return np.nonzero(random.random((width, width)) < density)
+
+
+def run_case(case: BenchCase, warmup: int, trials: int, seed: int) -> dict[str, Any]:
+    """
+    Time a case over its trials. Each trial builds and seeds a board, runs the warm up generations and
+    then times every generation on its own.
+
+    Returns:
+        Result for the JSON file.
+    """
+    ys, xs = starting_cells(case.width, case.density, seed)
+    samples = np.zeros((trials, case.generations), dtype=np.int64)
+    population = 0
+    for trial in range(trials):
+        board = ENGINES[case.engine](case.width)
+        try:
+            board.set_alive(ys, xs)
+            for _ in range(warmup):
+                board.generation()
+            for generation in range(case.generations):
+                start = time.perf_counter_ns()
+                board.generation()
+                samples[trial, generation] = time.perf_counter_ns() - start
+            population = board.population
+        finally:
+            if hasattr(board, "close"):
+                board.close()
+    cells = case.width * case.width
+    return {
+        **case._asdict(),
+        "key": case.key,
+        "cells": cells,
+        "starting_population": len(xs),
+        "final_population": population,
+        "ns_per_generation": percentiles(samples),
+        "ns_per_cell": percentiles(samples / cells),
+        "trial_ns": samples.sum(axis=1).tolist(),
+        }
+
+
+def machine() -> dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        }
+
+
+def load_results(path: Path) -> dict[str, dict[str, Any]]:
+    """
+    Results of a bench file by case key.
+    """
+    data = json.loads(Path(path).read_text())
+    if data.get("version") != VERSION:
+        raise ValueError(f"'{path}' is not a version {VERSION} bench file.")
+    return {result["key"]: result for result in data["results"]}
+
+
+def compare(old: dict[str, dict[str, Any]], new: dict[str, dict[str, Any]], threshold: float) -> list[str]:
+    """
+    Log the change in median ns per cell update of every case in both, and return the keys of the cases that
+    slowed down by more than threshold.
+    """
+    regressions: list[str] = list()
+    for key in sorted(old.keys() & new.keys()):
+        before = old[key]["ns_per_cell"]["median"]
+        after = new[key]["ns_per_cell"]["median"]
+        change = after / before - 1 if before else 0.0
+        message = f"{key:<40} {before:12,.3f} -> {after:12,.3f} ns/cell {change:+8.1%}"
+        if change > threshold:
+            regressions.append(key)
+            logger.warning(f"{message} regression")
+        else:
+            logger.info(message)
+    if missing := sorted(old.keys() ^ new.keys()):
+        logger.info(f"Only in one of the files: {', '.join(missing)}")
+    return regressions
+
+
+class Bench:
+    """
+    Runs the benchmark matrix and compares it with a baseline.
+    """
+
+    def __init__(self, args: Optional[list[str]] = None):
+        self.args = bench_arg_parser().parse_args(args)
+        level = Options.verbose_dict[min(self.args.verbose + 1, 3)]
+        try:
+            logger.remove()
+        except ValueError:
+            ...
+        logger.add(sys.stdout, level=level)
+        if self.args.trials <= 0 or self.args.warmup < 0 or min(self.args.generations) <= 0:
+            raise ValueError("--trials and --generations must be at least 1 and --warmup at least 0.")
+        self.cases: list[BenchCase] = [
+            BenchCase(engine, width, density, generations)
+            for engine, width, density, generations in itertools.product(
+                self.args.engines, self.args.widths, self.args.densities, self.args.generations
+                )
+            ]
+
+    def run(self) -> int:
+        if self.args.compare is not None:
+            return self.check(*self.args.compare)
+        logger.info(f"Starting {len(self.cases):,} case/s of {self.args.trials} trial/s.")
+        logger.disable("conways.logic")
+        results: list[dict[str, Any]] = list()
+        try:
+            for case in self.cases:
+                result = run_case(case, self.args.warmup, self.args.trials, self.args.seed)
+                results.append(result)
+                logger.info(
+                    f"{case.key:<40} {result['ns_per_generation']['median'] * 10 ** -6:10,.3f} ms/gen "
+                    f"{result['ns_per_cell']['median']:10,.3f} ns/cell (p95 {result['ns_per_cell']['p95']:,.3f})"
+                    )
+        finally:
+            logger.enable("conways.logic")
+        self.args.output.write_text(json.dumps({
+            "version": VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "machine": machine(),
+            "settings": {"warmup": self.args.warmup, "trials": self.args.trials, "seed": self.args.seed},
+            "results": results,
+            }, indent=2))
+        logger.success(f"Finished {len(self.cases):,} case/s, results in '{self.args.output}'.")
+        if self.args.baseline is None:
+            return 0
+        return self.check(self.args.baseline, self.args.output)
+
+    def check(self, old: Path, new: Path) -> int:
+        """
+        Compare two results files.
+
+        Returns:
+            1 when a case slowed down by more than the threshold, otherwise 0.
+        """
+        regressions = compare(load_results(old), load_results(new), self.args.threshold)
+        if regressions:
+            logger.error(f"{len(regressions)} case/s slower than '{old}' by more than {self.args.threshold:.0%}.")
+            return 1
+        logger.success(f"No case slower than '{old}' by more than {self.args.threshold:.0%}.")
+        return 0
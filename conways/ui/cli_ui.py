@@ -2,32 +2,47 @@
 cli_ui.py
 
 
-
 Author: Zack Hankin
 Started: 6/02/2023
 """
 from __future__ import annotations
 import sys
 import time
+from typing import Optional
 
-from icecream import ic
 from conways import Board, logger
-
-logger.success(f"{__name__} importing...")
+from conways.logic import Checkpoint
 
 
 class CLI:
-    def __init__(self, board, *, number_of_generations: int):
+    def __init__(
+            self,
+            board,
+            *,
+            number_of_generations: int,
+            stop_on_cycle: bool = False,
+            checkpoint: Optional[Checkpoint] = None,
+            ):
         self.number_of_generations = number_of_generations
+        self.stop_on_cycle = stop_on_cycle
+        self.checkpoint = checkpoint
         self._board: Board = board
         self.time_to_run: int = 0
 
     def run(self):
         logger.info(f"Starting {self.number_of_generations:,} generation/s.")
         start = time.perf_counter_ns()
-        self._board.run_for_set_amount()
+        self._board.run_for_set_amount(stop_on_cycle=self.stop_on_cycle, checkpoint=self.checkpoint)
         end = time.perf_counter_ns()
-        logger.success(f"Finished {self.number_of_generations:,} generation/s.")
+        if self.checkpoint is not None:
+            self._board.save(self.checkpoint.path)
+            logger.success(f"Saved generation {self._board.generation_number:,} to '{self.checkpoint.path}'.")
+        generations = self.number_of_generations
+        cycle = self._board.cycle
+        if cycle is not None:
+            generations = cycle.generations_run
+            logger.success(f"Stopped early, cycle of period {cycle.period} first seen at generation {cycle.first_seen:,}.")
+        logger.success(f"Finished {generations:,} generation/s.")
         self.time_to_run = end - start
         logger.success(f"Time taken: {self.time_to_run * 10 ** -6:,.2f} ms")
-        logger.success(f"Time taken/run: {(self.time_to_run * 10 ** -6) / self.number_of_generations:,.2f} ms/run")
+        logger.success(f"Time taken/run: {(self.time_to_run * 10 ** -6) / max(generations, 1):,.2f} ms/run")
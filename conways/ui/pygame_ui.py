@@ -2,7 +2,6 @@
 pygame_ui.py
 
 
-
 Author: Zack Hankin
 Started: 3/02/2023
 """
@@ -11,19 +10,22 @@ from __future__ import annotations
 import os
 import sys
 import time
-from typing import Generator, Optional, Protocol
+from functools import partial
+from typing import Callable, Generator, Optional, Protocol
 
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = os.environ.get(
     "PYGAME_HIDE_SUPPORT_PROMPT", "1"
     )
 
+import numpy as np
 import pygame
 from pygame.event import Event
 from pygame.font import Font
 
-from conways.logic import Position, logger, ALIVE_COLOUR, DEAD_COLOUR
-
-logger.success(f"{__name__} importing...")
+from conways.logic import History, Position, Window, logger
+from conways.performance.timer import Timer
+from .stepper import Stepper
+from .viewport import Frame, Viewport, render, shades
 
 
 # noinspection PyMissingOrEmptyDocstring
@@ -36,8 +38,9 @@ class Cell(Protocol):
 
 # noinspection PyMissingOrEmptyDocstring
 class Board(Protocol):
-    board: list[list[Cell]]
     board_size: int
+    width: int
+    height: int
     num_of_runs: int
 
     def generation(self) -> Board: ...
@@ -52,6 +55,10 @@ class Board(Protocol):
 
     def set_random_board(self, random_seed: Optional[int] = None) -> Board: ...
 
+    def to_grid(self, window: Optional[Window] = None) -> np.ndarray: ...
+
+    def load_grid(self, grid: np.ndarray) -> Board: ...
+
 
 class PygameFont(Font):
     """
@@ -94,9 +101,24 @@ class PygameFont(Font):
 class PygameUI:
     """
     Pygame UI for Conways Game of life.
+
+    Only the cells that changed since the last frame are drawn and updated on the display. When more
+    than max_dirty_rects changed the whole grid is blitted in one go instead. Engines that keep the
+    cells a generation changed, like Board, are drawn from those without reading the view, the others
+    are diffed against the last frame.
+
+    With generations_per_second set the generations run on a Stepper thread and each frame shows the
+    latest finished generation, skipping any in between.
+
+    Boards larger than the window are shown through a Viewport, the mouse wheel zooms and dragging with
+    the right button pans. Only the cells in view are read from the board.
+
+    With a History every generation is recorded, and while paused the left and right arrow keys step
+    back and forward through it.
     """
 
     __UI: PygameUI | None = None
+    max_dirty_rects: int = 2000
 
     def __new__(cls, *args, **kwargs):
         if not cls.__UI:
@@ -104,7 +126,16 @@ class PygameUI:
         else:
             return cls.__UI
 
-    def __init__(self, board: Board, *, height: int = 800, width: int = 800, fps: int = 60):
+    def __init__(
+            self,
+            board: Board,
+            *,
+            height: int = 800,
+            width: int = 800,
+            fps: int = 60,
+            generations_per_second: Optional[float] = None,
+            history: Optional[History] = None,
+            ):
         self.num_of_runs = board.num_of_runs
         self.running = True
         if not pygame.get_init():
@@ -119,17 +150,28 @@ class PygameUI:
         self.paused: bool = True if self.num_of_runs == 0 else False
         self.clock = pygame.time.Clock()
         self.background = pygame.color.Color(10, 10, 10)
-        self.cell_size = width // self._board.board_size
+        self.viewport = Viewport(self._board.width, width, height, self._board.height)
         self.toggle_cells: set[Position] = set()
         self.timer_font = PygameFont(position=Position(10, 10))
-        self.board: dict[Position, dict[str, Cell | pygame.rect.Rect]] = dict()
-        self.set_board()
+        self.drawn: Frame | None = None
+        self.drawn_generation: int = 0
+        self.edited: bool = True
+        self.history = history
+        self.stepper: Stepper | None = None
+        if generations_per_second is not None:
+            self.stepper = Stepper(
+                board, generations_per_second=generations_per_second, limit=self.num_of_runs, render=self.render_view,
+                on_generation=self.record,
+                )
 
     def run(self):
+        if self.stepper is not None:
+            return self.run_threaded()
         count = 0
         if self.num_of_runs != 0:
             my_iter = self.run_set_times()
             next(my_iter)
+        self.record()
         while self.running:
             count += 1
             event_list = pygame.event.get()
@@ -138,6 +180,7 @@ class PygameUI:
             if not self.paused:
                 self.clock.tick(self.fps)
                 self._board.generation()
+                self.record()
             else:
                 self.clock.tick()
                 self.toggle()
@@ -145,22 +188,52 @@ class PygameUI:
             if (self.num_of_runs != 0) and (count > self.num_of_runs):
                 next(my_iter)
                 self.running = False
-                logger.info(f"FPS: {self.clock.get_fps()}")
+                logger.info("FPS: {}", self.clock.get_fps())
+
+    def run_threaded(self):
+        """
+        Draw the latest generation from the stepper thread at the display fps.
+        """
+        if self.num_of_runs != 0:
+            my_iter = self.run_set_times()
+            next(my_iter)
+        self.record()
+        if not self.paused:
+            self.stepper.play()
+        self.stepper.start()
+        while self.running:
+            for event in pygame.event.get():
+                self.event_handler(event)
+            self.clock.tick(self.fps)
+            self.toggle()
+            self.update_display(self.stepper.latest())
+            if self.stepper.finished:
+                self.stepper.stop()
+                self.update_display()
+                next(my_iter)
+                self.running = False
+                logger.info("FPS: {}", self.clock.get_fps())
 
     def event_handler(self, event: Event):
         match event.type:
             case pygame.QUIT:
-                logger.debug(f"Pygame Event: {pygame.event.event_name(event.type)}")
+                logger.opt(lazy=True).debug("Pygame Event: {}", lambda: pygame.event.event_name(event.type))
                 self.quit()
             case pygame.KEYDOWN:
-                logger.debug(f"Pygame Event: {pygame.event.event_name(event.type)}")
+                logger.opt(lazy=True).debug("Pygame Event: {}", lambda: pygame.event.event_name(event.type))
                 self.event_keydown(event)
             case pygame.MOUSEMOTION:
-                if 1 in event.buttons and self.paused:
+                if event.buttons[2]:
+                    self.viewport.pan(event.rel)
+                    self.moved()
+                elif 1 in event.buttons and (self.paused or self.stepper):
                     self.mouse_moved_clicked(event)
+            case pygame.MOUSEWHEEL:
+                self.viewport.zoom(event.y, pygame.mouse.get_pos())
+                self.moved()
             case pygame.MOUSEBUTTONDOWN:
-                logger.debug(f"Pygame Event: {pygame.event.event_name(event.type)}")
-                if self.paused:
+                logger.opt(lazy=True).debug("Pygame Event: {}", lambda: pygame.event.event_name(event.type))
+                if self.paused or self.stepper:
                     self.click(event)
 
     def event_keydown(self, event):
@@ -171,34 +244,150 @@ class PygameUI:
             case pygame.K_SPACE:
 
                 self.paused = False if self.paused else True
+                if self.stepper:
+                    self.stepper.pause() if self.paused else self.stepper.play()
                 logger.info(f'State: {"Paused" if self.paused else "Playing"}')
             case pygame.K_n:
                 logger.info("Resetting Board")
-                self._board.reset()
+                self.change_board(self._board.reset)
             case pygame.K_r:
                 logger.info(f"Setting board to new random state.")
-                self._board.set_random_board()
+                self.change_board(self._board.set_random_board)
+            case pygame.K_LEFT if self.paused:
+                self.change_board(partial(self.step, -1))
+            case pygame.K_RIGHT if self.paused:
+                self.change_board(partial(self.step, 1))
+
+    def record(self):
+        if self.history is not None:
+            self.history.update(self._board)
+
+    def step(self, generations: int):
+        """
+        Step back or forward through the history, stepping forward past its end runs new generations.
+        """
+        target = self._board.generation_number + generations
+        if self.history is not None and target in self.history:
+            self._board.load_grid(self.history.seek(target))
+            self._board.generation_number = target
+        elif generations > 0:
+            for _ in range(generations):
+                self._board.generation()
+                self.record()
+        else:
+            logger.info(f"Generation {target:,} isn't in the history.")
+            return
+        logger.info(f"Generation: {self._board.generation_number:,}")
+
+    def change_board(self, command: Callable[[], object]):
+        """
+        Run a call that changes the board, queued between generations when the stepper is running.
+        """
+        self.edited = True
+        if self.stepper:
+            self.stepper.submit(command)
+        else:
+            command()
+
+    def moved(self):
+        """
+        The viewport changed, the stepper has to render the new view.
+        """
+        if self.stepper:
+            self.stepper.refresh()
 
     def quit(self):
         logger.debug(f"pygame quiting.")
+        if self.stepper:
+            self.stepper.stop()
+        if self.history is not None:
+            self.history.close()
         pygame.quit()
         sys.exit()
 
-    def update_display(self):
+    def render_view(self) -> Frame:
+        return render(self._board, self.viewport.view)
+
+    def dirty_cells(self) -> np.ndarray | None:
+        """
+        (y, x) rows in the view of the cells changed since the last frame, read from board.changed
+        without rendering the view.
+
+        Returns:
+            None when the engine doesn't keep changed, or since the last frame more than one generation
+            ran, the board was edited or the view moved.
+        """
+        drawn, changed = self.drawn, getattr(self._board, "changed", None)
+        if changed is None or drawn is None or self.stepper or self.edited or drawn.view != self.viewport.view:
+            return None
+        if drawn.view.block != 1:
+            return None
+        match self._board.generation_number - self.drawn_generation:
+            case 0:
+                return np.empty((0, 2), dtype=np.int64)
+            case 1:
+                window = drawn.view.window
+                xs, ys = np.array(changed, dtype=np.int64).reshape(-1, 2).T
+                xs, ys = xs - window.x, ys - window.y
+                inside = (0 <= xs) & (xs < window.width) & (0 <= ys) & (ys < window.height)
+                return np.column_stack((ys[inside], xs[inside]))
+        return None
+
+    def update_display(self, frame: Frame | None = None):
+        if frame is None and (dirty := self.dirty_cells()) is not None and len(dirty) <= self.max_dirty_rects:
+            if len(dirty):
+                self.drawn.image[dirty[:, 0], dirty[:, 1]] ^= 1
+                pygame.display.update(self.draw_cells(self.drawn, dirty))
+            self.drawn_generation = self._board.generation_number
+            return
+        if frame is None:
+            frame = self.render_view()
+        if frame.view != self.viewport.view:
+            return
+        if self.drawn is None or self.drawn.view != frame.view:
+            changed = None
+        else:
+            changed = np.argwhere(frame.image != self.drawn.image)
+        if changed is None or len(changed) > self.max_dirty_rects:
+            self.draw_grid(frame)
+            pygame.display.update()
+        elif len(changed):
+            pygame.display.update(self.draw_cells(frame, changed))
+        self.drawn = frame
+        self.drawn_generation = self._board.generation_number
+        self.edited = False
+
+    def draw_grid(self, frame: Frame):
+        """
+        Draw every block at once, the image is turned into a surface one pixel per block and scaled up.
+        """
+        view = frame.view
+        height, width = frame.image.shape
+        surface = pygame.surfarray.make_surface(shades(view.block)[frame.image.T])
+        surface = pygame.transform.scale(surface, (width * view.cell_size, height * view.cell_size))
         self.window.fill(self.background)
-        self.draw_cells()
-        pygame.display.update()
+        self.window.blit(surface, (-view.offset.x, -view.offset.y))
 
-    def draw_cells(self):
-        for cell in self.board.values():
+    @Timer.span("draw_cells")
+    def draw_cells(self, frame: Frame, changed: np.ndarray) -> list[pygame.Rect]:
+        """
+        Draw the changed blocks.
 
-            colour = ALIVE_COLOUR if cell['cell'].is_alive else DEAD_COLOUR
+        Args:
+            frame (Frame): Current frame.
+            changed (np.ndarray): (y, x) rows of the blocks to draw.
 
-            pygame.draw.rect(
-                surface=self.window,
-                color=colour,
-                rect=cell['rect']
-                )
+        Returns:
+            Rects drawn, to update on the display.
+        """
+        rects: list[pygame.Rect] = list()
+        colours = [tuple(colour) for colour in shades(frame.view.block).tolist()]
+        size, offset = frame.view.cell_size, frame.view.offset
+        for y, x in changed.tolist():
+            rect = pygame.Rect(size * x - offset.x, size * y - offset.y, size, size)
+            self.window.fill(colours[frame.image[y, x]], rect)
+            rects.append(rect)
+        return rects
 
     def run_set_times(self):
         logger.info(f"Starting {self.num_of_runs:,} generation/s.")
@@ -215,40 +404,26 @@ class PygameUI:
     def mouse_moved_clicked(self, event: Event):
         if event.buttons == (1, 0, 0):
             cell = self.cell_clicked(event.pos)
-            if cell not in self.toggle_cells:
+            if cell is not None and cell not in self.toggle_cells:
                 self.toggle_cells.add(cell)
 
     def click(self, event: Event):
         if event.button == 1:
             pos = Position(*event.pos)
             cell = self.cell_clicked(pos)
+            if cell is None:
+                return
             if cell not in self.toggle_cells:
                 self.toggle_cells.add(cell)
             else:
                 self.toggle_cells.remove(cell)
 
-    def cell_clicked(self, position: Position) -> Position:
+    def cell_clicked(self, position: Position) -> Optional[Position]:
         if not isinstance(position, Position):
             position = Position(*position)
-        return Position(
-            int(position.x // self.cell_size), int(position.y // self.cell_size)
-            )
+        return self.viewport.cell_at(position)
 
     def toggle(self):
         for cell in self.toggle_cells:
-            self._board.toggle_cell(cell)
+            self.change_board(partial(self._board.toggle_cell, cell))
         self.toggle_cells.clear()
-
-    def set_board(self):
-        position: Position
-        cell: Cell
-        for position, cell in iter(self._board):
-            self.board[position] = {
-                "cell": cell,
-                "rect": pygame.Rect(
-                    self.cell_size * cell.x,
-                    self.cell_size * cell.y,
-                    self.cell_size,
-                    self.cell_size,
-                    )
-                }
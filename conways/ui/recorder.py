@@ -0,0 +1,195 @@
+"""
+recorder.py
+
+Headless recorder, renders generations straight from the board state into RGB frames and
+hands them to a writer thread through a bounded queue. Videos and GIFs are piped to an
+ffmpeg process, anything else is a directory of PNG frames.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Protocol
+
+import numpy as np
+import pygame
+
+from conways.logic import logger, progress
+from .viewport import Viewport, render, shades
+
+
+VIDEO_SUFFIXES: tuple[str, ...] = (".mp4", ".mkv", ".webm", ".gif")
+
+
+# noinspection PyMissingOrEmptyDocstring
+class FrameWriter(Protocol):
+    def write(self, frame: np.ndarray): ...
+
+    def close(self): ...
+
+
+class PNGWriter:
+    """
+    Writes each frame to directory/frame_000000.png, no display is needed.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.count: int = 0
+
+    def write(self, frame: np.ndarray):
+        surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
+        pygame.image.save(surface, str(self.directory / f"frame_{self.count:06}.png"))
+        self.count += 1
+
+    def close(self):
+        ...
+
+
+class FFmpegWriter:
+    """
+    Pipes raw rgb24 frames into an ffmpeg process, the container is picked from the path suffix.
+    """
+
+    def __init__(self, path: Path, width: int, height: int, fps: int):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise ValueError(f"Writing '{path}' needs ffmpeg on the PATH, or record PNG frames to a directory.")
+        command = [
+            ffmpeg, "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+            ]
+        if path.suffix == ".gif":
+            command += ["-vf", "split[a][b];[a]palettegen[p];[b][p]paletteuse"]
+        else:
+            # yuv420p plays everywhere but needs even dimensions.
+            command += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p"]
+        command.append(str(path))
+        logger.debug(f"Encoder: {' '.join(command)}")
+        self.path = path
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, frame: np.ndarray):
+        self.process.stdin.write(np.ascontiguousarray(frame).data)
+
+    def close(self):
+        self.process.stdin.close()
+        code = self.process.wait()
+        if code:
+            raise RuntimeError(f"ffmpeg exited with code {code} writing '{self.path}'.")
+
+
+def open_writer(path: Path, width: int, height: int, fps: int) -> FrameWriter:
+    if path.suffix.lower() in VIDEO_SUFFIXES:
+        return FFmpegWriter(path, width, height, fps)
+    return PNGWriter(path)
+
+
+class Recorder:
+    """
+    Runs a set number of generations without a window, recording every k-th one.
+
+    Frames are the whole board fitted into frame_size pixels, zoomed out boards are shaded by density
+    the same as the Pygame viewport.
+    """
+
+    queue_size: int = 16
+
+    def __init__(
+            self,
+            board,
+            *,
+            path: Path,
+            number_of_generations: int,
+            every: int = 1,
+            fps: int = 30,
+            frame_size: int = 800,
+            ):
+        """
+
+        Args:
+            board: Board of any engine.
+            path (Path): .mp4, .mkv, .webm or .gif file, otherwise a directory for PNG frames.
+            number_of_generations (int): Number of generations to run.
+            every (int): Record every k-th generation, the starting board is always recorded.
+            fps (int): Frame rate of the video.
+            frame_size (int): Max width and height of the frames in pixels.
+        """
+        if number_of_generations <= 0:
+            raise ValueError("Recording needs a number of generations, set -n.")
+        if every <= 0:
+            raise ValueError(f"every must be at least 1, got {every}.")
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        self._board = board
+        self.path = path
+        self.number_of_generations = number_of_generations
+        self.every = every
+        self.fps = fps
+        self.view = Viewport(board.width, frame_size, frame_size, board.height).view
+        self.palette: np.ndarray = shades(self.view.block)
+        self.frames_written: int = 0
+        self.error: Optional[BaseException] = None
+        self.time_to_run: int = 0
+
+    def frame(self) -> np.ndarray:
+        """
+        The board as an RGB frame[y, x].
+        """
+        image = render(self._board, self.view).image
+        size = self.view.cell_size
+        if size > 1:
+            image = image.repeat(size, axis=0).repeat(size, axis=1)
+        return self.palette[image]
+
+    def _write(self, writer: FrameWriter, frames: queue.Queue[Optional[np.ndarray]]):
+        while (frame := frames.get()) is not None:
+            if self.error is not None:
+                continue
+            try:
+                writer.write(frame)
+                self.frames_written += 1
+            except BaseException as error:
+                self.error = error
+
+    def run(self):
+        first = self.frame()
+        height, width = first.shape[:2]
+        writer = open_writer(self.path, width, height, self.fps)
+        logger.info(f"Recording {self.number_of_generations:,} generation/s to '{self.path}', every {self.every}.")
+        frames: queue.Queue[Optional[np.ndarray]] = queue.Queue(maxsize=self.queue_size)
+        thread = threading.Thread(target=self._write, args=(writer, frames), name="recorder", daemon=True)
+        start = time.perf_counter_ns()
+        thread.start()
+        generations = range(1, self.number_of_generations + 1)
+        if self._board.loading_bar:
+            generations = progress(generations)
+        try:
+            frames.put(first)
+            for generation in generations:
+                if self.error is not None:
+                    break
+                self._board.generation()
+                if generation % self.every == 0:
+                    frames.put(self.frame())
+        finally:
+            frames.put(None)
+            thread.join()
+            writer.close()
+        if self.error is not None:
+            raise self.error
+        end = time.perf_counter_ns()
+        self.time_to_run = end - start
+        logger.success(f"Finished {self.number_of_generations:,} generation/s, {self.frames_written:,} frame/s.")
+        logger.success(f"Time taken: {self.time_to_run * 10 ** -6:,.2f} ms")
+        logger.success(
+            f"Time taken/run: {(self.time_to_run * 10 ** -6) / self.number_of_generations:,.2f} ms/run"
+            )
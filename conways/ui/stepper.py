@@ -0,0 +1,140 @@
+"""
+stepper.py
+
+Runs a board's generations on a background thread so the simulation isn't tied to the display's
+frame rate. Changes to the board are queued and applied between generations, and the UI reads
+the latest completed snapshot.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from conways.logic import logger
+
+
+class Stepper:
+    """
+    Background generation thread.
+
+    The snapshot is only copied out of the board after the UI has asked for a new one, so stepping at
+    full speed doesn't pay for a copy every generation.
+    """
+
+    def __init__(
+            self,
+            board,
+            *,
+            generations_per_second: float = 0,
+            limit: int = 0,
+            render: Optional[Callable[[], Any]] = None,
+            on_generation: Optional[Callable[[], object]] = None,
+            ):
+        """
+
+        Args:
+            board: Board of any engine.
+            generations_per_second (float): Target generation rate, 0 for as fast as possible.
+            limit (int): Stop after this many generations, 0 for no limit.
+            render (Callable, Optional): Makes a snapshot of the board. Default is board.to_grid.
+            on_generation (Callable, Optional): Called on the stepper thread after each generation.
+        """
+        self._board = board
+        self.generations_per_second = generations_per_second
+        self.limit = limit
+        self.generation: int = 0
+        self.render: Callable[[], Any] = board.to_grid if render is None else render
+        self.on_generation = on_generation
+        self.snapshot: Any = self.render()
+        self._commands: queue.SimpleQueue[Callable[[], object]] = queue.SimpleQueue()
+        self._wanted = threading.Event()
+        self._refresh = threading.Event()
+        self._playing = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stepper", daemon=True)
+
+    @property
+    def playing(self) -> bool:
+        return self._playing.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return bool(self.limit) and self.generation >= self.limit
+
+    def start(self) -> Stepper:
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def play(self) -> Stepper:
+        self._playing.set()
+        return self
+
+    def pause(self) -> Stepper:
+        self._playing.clear()
+        return self
+
+    def submit(self, command: Callable[[], object]) -> Stepper:
+        """
+        Queue a call that changes the board, run between generations.
+        """
+        self._commands.put(command)
+        return self
+
+    def latest(self) -> Any:
+        """
+        The most recent snapshot, and ask for a new one.
+        """
+        self._wanted.set()
+        return self.snapshot
+
+    def refresh(self) -> Stepper:
+        """
+        Make a new snapshot even if the board hasn't changed, e.g. after the render has.
+        """
+        self._refresh.set()
+        return self
+
+    def _apply_commands(self) -> bool:
+        applied = False
+        while True:
+            try:
+                command = self._commands.get_nowait()
+            except queue.Empty:
+                return applied
+            command()
+            applied = True
+
+    def _run(self):
+        interval = 1 / self.generations_per_second if self.generations_per_second else 0
+        deadline = time.perf_counter()
+        stale = False
+        while not self._stopped.is_set():
+            stale |= self._apply_commands()
+            if self._refresh.is_set():
+                self._refresh.clear()
+                stale = True
+            if self._playing.is_set() and not self.finished:
+                self._board.generation()
+                self.generation += 1
+                if self.on_generation is not None:
+                    self.on_generation()
+                stale = True
+                if interval:
+                    deadline = max(deadline + interval, time.perf_counter() - interval)
+                    time.sleep(max(0.0, deadline - time.perf_counter()))
+            else:
+                self._stopped.wait(timeout=0.005)
+            if stale and self._wanted.is_set():
+                self._wanted.clear()
+                self.snapshot = self.render()
+                stale = False
@@ -0,0 +1,227 @@
+"""
+sweep.py
+
+Batch runner for seeds x rules x widths, spread over a process pool. Each run's result is
+written to a CSV or Parquet file as soon as it finishes.
+
+Usage: python -m conways sweep --seeds 1-100 --rules B3/S23 B36/S23 --widths 50 100 -o out.csv
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+from loguru import logger
+
+from conways.logic import ENGINES, parse_rule, progress
+from .ui_args import Options
+
+
+class SweepRun(NamedTuple):
+    """
+    One run of a sweep.
+    """
+    engine: str
+    width: int
+    seed: int
+    rule: str
+    generations: int
+
+
+FIELDS: list[str] = [
+    *SweepRun._fields, "generations_run", "stable_at", "period", "population", "setup_ns", "elapsed_ns",
+    ]
+
+
+def parse_seeds(values: list[str]) -> list[int]:
+    """
+    Seeds from a list of ints and inclusive ranges, e.g. ['1-3', '10'] -> [1, 2, 3, 10].
+    """
+    seeds: list[int] = list()
+    for value in values:
+        low, _, high = value.partition("-")
+        seeds.extend(range(int(low), int(high or low) + 1))
+    return seeds
+
+
+def sweep_arg_parser() -> ArgumentParser:
+    """
+    Argument parser for the sweep entry point.
+
+    Returns:
+        ArgumentParser for use.
+    """
+    parser = argparse.ArgumentParser(prog="Conway's Game of Life sweep")
+    parser.add_argument(
+        "-s", "--seeds", help="Random seeds, ints or inclusive ranges like 1-100. Default: 1-10",
+        nargs="+", metavar="seed", default=["1-10"]
+        )
+    parser.add_argument(
+        "-r", "--rules", help="B/S rule strings. Default: B3/S23", nargs="+", metavar="rule", default=["B3/S23"]
+        )
+    parser.add_argument(
+        "-w", "--widths", help="Widths of grid. Default: 50", nargs="+", type=int, metavar="int", default=[50]
+        )
+    parser.add_argument(
+        "-n", help="Max number of generations per run. Default: 1000", type=int, metavar="int", default=1000
+        )
+    parser.add_argument(
+        "-e", "--engine", help="Board engine to run generations with. Default: numpy",
+        choices=[name for name in ENGINES if name != "parallel"], default="numpy"
+        )
+    parser.add_argument(
+        "--workers", help="Number of worker processes. Default: number of cpus",
+        type=int, metavar="int", default=os.cpu_count() or 1
+        )
+    parser.add_argument(
+        "-o", "--output", help="Results file, .csv or .parquet. Default: sweep.csv",
+        type=Path, metavar="path", default=Path("sweep.csv")
+        )
+    parser.add_argument(
+        "-l", "--loading", help="Enable loading bar over the runs.", action="store_true"
+        )
+    parser.add_argument("-v", "--verbose", action="count", default=0)
+    return parser
+
+
+def run_one(run: SweepRun) -> dict[str, Any]:
+    """
+    Run one board until it repeats a recent state or runs out of generations.
+
+    Returns:
+        Row of FIELDS.
+    """
+    live_conditions, birth_condition = parse_rule(run.rule)
+    start = time.perf_counter_ns()
+    board = ENGINES[run.engine](run.width, live_conditions, birth_condition)
+    board.set_random_board(run.seed)
+    setup = time.perf_counter_ns()
+
+    board.run_for_set_amount(run.generations, stop_on_cycle=True)
+    end = time.perf_counter_ns()
+
+    cycle = board.cycle
+    return {
+        **run._asdict(),
+        "generations_run": run.generations if cycle is None else cycle.generations_run,
+        "stable_at": None if cycle is None else cycle.first_seen,
+        "period": None if cycle is None else cycle.period,
+        "population": board.population,
+        "setup_ns": setup - start,
+        "elapsed_ns": end - setup,
+        }
+
+
+def _init_worker(quiet: bool):
+    if quiet:
+        logger.disable("conways")
+
+
+class ResultWriter:
+    """
+    Appends result rows to a CSV file, or to Parquet row groups when the path ends in .parquet.
+    """
+
+    def __init__(self, path: Path, batch: int = 1024):
+        self.path = path
+        self.batch = batch
+        self.rows: list[dict[str, Any]] = list()
+        self.parquet = path.suffix == ".parquet"
+        if self.parquet:
+            try:
+                import pyarrow.parquet
+            except ImportError as error:
+                raise ValueError(f"Writing '{path}' needs pyarrow installed.") from error
+            self._parquet_writer: Optional[pyarrow.parquet.ParquetWriter] = None
+        else:
+            self._file = path.open("w", newline="")
+            self._csv_writer = csv.DictWriter(self._file, fieldnames=FIELDS)
+            self._csv_writer.writeheader()
+
+    def write(self, row: dict[str, Any]) -> ResultWriter:
+        if not self.parquet:
+            self._csv_writer.writerow(row)
+            self._file.flush()
+            return self
+        self.rows.append(row)
+        if len(self.rows) >= self.batch:
+            self.flush()
+        return self
+
+    def flush(self) -> ResultWriter:
+        if not (self.parquet and self.rows):
+            return self
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet
+
+        frame = pd.DataFrame(self.rows, columns=FIELDS).astype({"stable_at": "Int64", "period": "Int64"})
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._parquet_writer is None:
+            self._parquet_writer = pyarrow.parquet.ParquetWriter(self.path, table.schema)
+        self._parquet_writer.write_table(table)
+        self.rows.clear()
+        return self
+
+    def close(self):
+        if self.parquet:
+            self.flush()
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+        else:
+            self._file.close()
+
+
+class Sweep:
+    """
+    Runs every combination of seeds, rules and widths over a process pool.
+    """
+
+    def __init__(self, args: Optional[list[str]] = None):
+        self.args = sweep_arg_parser().parse_args(args)
+        level = Options.verbose_dict[min(self.args.verbose, 3)]
+        try:
+            logger.remove()
+        except ValueError:
+            ...
+        logger.add(sys.stdout, level=level)
+        for rule in self.args.rules:
+            parse_rule(rule)
+        self.runs: list[SweepRun] = [
+            SweepRun(self.args.engine, width, seed, rule, self.args.n)
+            for width, rule, seed in itertools.product(
+                self.args.widths, self.args.rules, parse_seeds(self.args.seeds)
+                )
+            ]
+
+    def run(self) -> int:
+        logger.info(f"Starting {len(self.runs):,} run/s on {self.args.workers} worker/s.")
+        start = time.perf_counter_ns()
+        writer = ResultWriter(self.args.output)
+        try:
+            with ProcessPoolExecutor(
+                    max_workers=self.args.workers, initializer=_init_worker, initargs=(self.args.verbose < 2,)
+                    ) as executor:
+                futures = [executor.submit(run_one, run) for run in self.runs]
+                completed = as_completed(futures)
+                if self.args.loading:
+                    completed = progress(completed, total=len(futures))
+                for future in completed:
+                    writer.write(future.result())
+        finally:
+            writer.close()
+        end = time.perf_counter_ns()
+        logger.success(f"Finished {len(self.runs):,} run/s, results in '{self.args.output}'.")
+        logger.success(f"Time taken: {(end - start) * 10 ** -6:,.2f} ms")
+        return 0
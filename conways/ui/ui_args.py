@@ -2,7 +2,6 @@
 ui_args.py
 
 
-
 Author: Zack Hankin
 Started: 6/02/2023
 """
@@ -10,12 +9,16 @@ from __future__ import annotations
 import sys
 import argparse
 from argparse import ArgumentParser
+from pathlib import Path
+from typing import TYPE_CHECKING
 import loguru
 from loguru import logger
 
-from icecream import ic
+from conways.logic import ENGINES, MOORE, TOPOLOGIES, LogLevel, Rule
+from conways.performance import PROFILERS
 
-logger.success(f"{__name__} importing...")
+if TYPE_CHECKING:
+    from conways.logic import Checkpoint
 
 
 def arg_parser() -> ArgumentParser:
@@ -43,12 +46,116 @@ def arg_parser() -> ArgumentParser:
     parser.add_argument(
         "-w", "--width", help="Width of grid.", type=int, metavar="int", default=50
         )
+    parser.add_argument(
+        "--height", help="Height of grid. Default: the width", type=int, metavar="int", default=None
+        )
+    parser.add_argument(
+        "--topology", help="Edges of the grid, a torus wraps both ways and a Klein bottle flips the board left "
+                           "to right across the top and bottom. Default: bounded, or the snapshot's with --resume",
+        choices=TOPOLOGIES, default=None
+        )
     parser.add_argument(
         "-f", "--fps", help="Max FPS", type=int, metavar="int", default=60
         )
+    parser.add_argument(
+        "-g", "--gps", help="Run generations on a background thread at this many per second, 0 for as fast as "
+                            "possible. Default: one generation per frame",
+        type=float, metavar="float", default=None
+        )
     parser.add_argument(
         "-l", "--loading", help="Enable loading bar for set number of iterations.", action="store_true"
         )
+    parser.add_argument(
+        "-e", "--engine", help="Board engine to run generations with. Default: board",
+        choices=list(ENGINES), default="board"
+        )
+    parser.add_argument(
+        "--rule", help="Rule string, Life-like B3/S23, Generations B2/S/C3, non-totalistic B2-a/S12, hexagonal "
+                       "B2/S34H, von Neumann B2/S013V or Larger-than-Life R5,C0,M1,S34..58,B34..45,NM. Generations "
+                       "and non-totalistic rules run on the numpy or parallel engine, the other neighbourhoods on "
+                       "numpy. Default: B3/S23",
+        type=str, metavar="rule", default=None
+        )
+    parser.add_argument(
+        "--workers", help="Number of worker processes, runs the parallel engine when set. Default: 0",
+        type=int, metavar="int", default=0
+        )
+    parser.add_argument(
+        "--stop-on-cycle", help="Stop early once the board reaches a fixed point or cycle.", action="store_true"
+        )
+    parser.add_argument(
+        "--report-memory", help="Print the bytes per cell and construction time of the board.",
+        action="store_true"
+        )
+    parser.add_argument(
+        "--timing", help="Time generation, check_state, update_state, draw_cells, set_neighbours, step and jump "
+                         "and print a summary at exit, or write it to a .json path when one is given.",
+        nargs="?", type=Path, metavar="path", const="-", default=None
+        )
+    parser.add_argument(
+        "--metrics", help="Write the generation, population, births, deaths and step ns of every generation to a "
+                          ".jsonl or .csv file from a background thread. -vvv also logs them.",
+        type=Path, metavar="path", default=None
+        )
+    parser.add_argument(
+        "--profile", help="Profile the run, cprofile writes a .pstats file and call graph, sampling writes folded "
+                          "stacks for a flame graph and is cheap enough for long runs. Default: cprofile",
+        nargs="?", choices=PROFILERS, const="cprofile", default=None
+        )
+    parser.add_argument(
+        "--profile-dir", help="Folder for the profile files. Default: profiling",
+        type=Path, metavar="path", default=Path("profiling")
+        )
+    parser.add_argument(
+        "--sample-ms", help="Milliseconds between samples when sampling. Default: 5",
+        type=float, metavar="float", default=5.0
+        )
+    parser.add_argument(
+        "--pattern", help="Place an RLE, plaintext (.cells) or Life 1.06 pattern file on the board.",
+        type=Path, metavar="path", default=None
+        )
+    parser.add_argument(
+        "--at", help="Board position of the pattern's top left, or of (0, 0) for Life 1.06. Default: 0 0",
+        type=int, nargs=2, metavar=("x", "y"), default=[0, 0]
+        )
+    snapshot_group = parser.add_argument_group("Snapshots")
+    snapshot_group.add_argument(
+        "--checkpoint", help="Save the board to this snapshot file every --checkpoint-every generations and at "
+                             "the end of a CLI run.",
+        type=Path, metavar="path", default=None
+        )
+    snapshot_group.add_argument(
+        "--checkpoint-every", help="Generations between checkpoints. Default: 1000",
+        type=int, metavar="int", default=1000
+        )
+    snapshot_group.add_argument(
+        "--resume", help="Start from a snapshot file, its size, rules and topology replace -w. -n counts the "
+                         "generations already run.",
+        type=Path, metavar="path", default=None
+        )
+    history_group = parser.add_argument_group("History")
+    history_group.add_argument(
+        "--history", help="Record every generation of a Pygame run to this file, the arrow keys step back and "
+                          "forward through it while paused.",
+        type=Path, metavar="path", default=None
+        )
+    history_group.add_argument(
+        "--keyframe-every", help="Generations between full grids in the history. Default: 64",
+        type=int, metavar="int", default=64
+        )
+    record_group = parser.add_argument_group("Recording")
+    record_group.add_argument(
+        "--record", help="Run -n generations without a window and record them to a .mp4, .mkv, .webm or .gif "
+                         "(needs ffmpeg), or to a directory of PNG frames. --fps sets the video frame rate.",
+        type=Path, metavar="path", default=None
+        )
+    record_group.add_argument(
+        "--every", help="Record every k-th generation. Default: 1", type=int, metavar="int", default=1
+        )
+    record_group.add_argument(
+        "--frame-size", help="Max width and height of recorded frames in pixels. Default: 800",
+        type=int, metavar="int", default=800
+        )
 
     return parser
 
@@ -58,9 +165,32 @@ class Options:
     Object to hold the arguments passed in via the CLI.
     """
     fps: int
+    gps: float | None
     width: int
+    height: int | None
+    topology: str | None
     random: bool
     loading: bool
+    engine: str
+    rule: str | None
+    workers: int
+    report_memory: bool
+    timing: Path | None
+    metrics: Path | None
+    profile: str | None
+    profile_dir: Path
+    sample_ms: float
+    stop_on_cycle: bool
+    record: Path | None
+    pattern: Path | None
+    history: Path | None
+    keyframe_every: int
+    at: list[int]
+    checkpoint: Path | None
+    checkpoint_every: int
+    resume: Path | None
+    every: int
+    frame_size: int
     p: bool
     c: bool
     n: int
@@ -74,14 +204,57 @@ class Options:
         self.parser.parse_args(namespace=Options)
         self.set_ui()
         self.set_log_level()
+        self.set_engine()
 
     def set_ui(self) -> Options:
         if self.c:
             self.ui = "CLI"
         if self.p | (self.ui is None):
             self.ui = "pygame"
+        if self.record is not None:
+            self.ui = "record"
         return self
 
+    def set_engine(self) -> Options:
+        if self.workers > 0 and self.engine != "parallel":
+            logger.info(f"--workers given, using the parallel engine instead of {self.engine}.")
+            self.engine = "parallel"
+        rule = self.get_rule()
+        if rule is None or rule.life_like:
+            return self
+        engines = ("numpy", "parallel") if rule.neighbourhood == MOORE else ("numpy",)
+        if self.engine not in engines:
+            logger.info(f"{rule.name} isn't a Life-like rule, using the numpy engine instead of {self.engine}.")
+            self.engine = "numpy"
+        return self
+
+    def get_rule(self) -> Rule | None:
+        if self.rule is None:
+            return None
+        return Rule.parse(self.rule)
+
+    def engine_options(self) -> dict[str, int | Rule]:
+        """
+        Keyword arguments for the chosen engine on top of the ones every board takes.
+        """
+        options: dict[str, int | Rule] = dict()
+        if self.engine == "parallel" and self.workers > 0:
+            options["workers"] = self.workers
+        rule = self.get_rule()
+        if rule is not None:
+            options["live_conditions"] = rule.live_conditions
+            options["birth_condition"] = rule.birth_condition
+            if self.engine in ("numpy", "parallel"):
+                options["rule"] = rule
+        return options
+
+    def get_checkpoint(self) -> Checkpoint | None:
+        if self.checkpoint is None:
+            return None
+        from conways.logic import Checkpoint
+
+        return Checkpoint(self.checkpoint, self.checkpoint_every)
+
     def set_log_level(self) -> Options:
         if self.verbose > 3:
             self.verbose = 3
@@ -91,6 +264,8 @@ class Options:
             logger.remove()
         except ValueError:
             ...
-        logger.add(sys.stdout, level=self.log_level.name)
+        LogLevel.no = self.log_level.no
+        # At debug and trace the sink writes from loguru's own thread, so logging never blocks a run on I/O.
+        logger.add(sys.stdout, level=self.log_level.name, enqueue=self.verbose >= 2)
         logger.success(f"Log level set to {self.log_level.name.lower()}")
         return self
@@ -0,0 +1,168 @@
+"""
+viewport.py
+
+Camera onto a board that can be larger than the window. Only the cells in view are read
+from the board, and when zoomed out each screen block covers block x block cells and is
+shaded by how many of them are alive.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from conways.logic import ALIVE_COLOUR, DEAD_COLOUR, Position, Window, logger
+
+
+class View(NamedTuple):
+    """
+    What is on screen. Each block x block square of the window is drawn cell_size pixels across,
+    shifted up and left by offset pixels.
+    """
+    window: Window
+    cell_size: int
+    block: int
+    offset: Position
+
+
+class Frame(NamedTuple):
+    """
+    A view rendered from a board, image[y, x] is the palette index of each block.
+    """
+    view: View
+    image: np.ndarray
+
+
+@lru_cache(maxsize=16)
+def shades(block: int) -> np.ndarray:
+    """
+    Palette from dead to alive for 0 to block * block alive cells, [DEAD_COLOUR, ALIVE_COLOUR] for a block of 1.
+    """
+    density = np.linspace(0, 1, block * block + 1).reshape(-1, 1)
+    dead, alive = np.array(DEAD_COLOUR, dtype=float), np.array(ALIVE_COLOUR, dtype=float)
+    return np.rint(dead + density * (alive - dead)).astype(np.uint8)
+
+
+def density(grid: np.ndarray, block: int) -> np.ndarray:
+    """
+    Number of alive cells in each block x block square of grid[y, x], partial squares at the edges
+    count the missing cells as dead.
+    """
+    height, width = grid.shape
+    rows, columns = -(-height // block), -(-width // block)
+    if (rows * block, columns * block) != grid.shape:
+        padded = np.zeros((rows * block, columns * block), dtype=grid.dtype)
+        padded[:height, :width] = grid
+        grid = padded
+    return grid.reshape(rows, block, columns, block).sum(axis=(1, 3), dtype=np.uint32)
+
+
+def render(board, view: View) -> Frame:
+    """
+    Read the cells in view from a board of any engine.
+    """
+    grid = board.to_grid(view.window)
+    if view.block > 1:
+        grid = density(grid, view.block)
+    return Frame(view, grid)
+
+
+class Viewport:
+    """
+    Zoom and pan state.
+
+    Zoomed in each cell is cell_size pixels across, zoomed out each pixel is block cells across. Only one
+    of the two is above 1. (x, y) is the board position of the top left of the window in cells.
+    """
+
+    max_cell_size: int = 64
+
+    def __init__(self, board_size: int, width: int, height: int, board_height: Optional[int] = None):
+        """
+
+        Args:
+            board_size (int): Number of cells across the board.
+            width (int): Window width in pixels.
+            height (int): Window height in pixels.
+            board_height (int, Optional): Number of cells down the board. Default is board_size.
+        """
+        self.board_size = self.board_width = board_size
+        self.board_height: int = board_size if board_height is None else board_height
+        self.width = width
+        self.height = height
+        self.max_block: int = max(1, -(-self.board_width // width), -(-self.board_height // height))
+        self.cell_size: int = min(
+            self.max_cell_size, max(1, min(width // self.board_width, height // self.board_height))
+            )
+        self.block: int = self.max_block
+        self.x: float = 0
+        self.y: float = 0
+        logger.debug(f"Viewport: cell size {self.cell_size}, block {self.block}")
+
+    @property
+    def cells_per_pixel(self) -> float:
+        return self.block / self.cell_size
+
+    @property
+    def view(self) -> View:
+        """
+        The current view, the window is snapped to whole blocks when zoomed out.
+        """
+        block, size = self.block, self.cell_size
+        x, y = int(self.x), int(self.y)
+        x, y = x - x % block, y - y % block
+        offset = Position(int((self.x - x) * size), int((self.y - y) * size)) if block == 1 else Position(0, 0)
+        width = min(math.ceil((self.width + offset.x) * self.cells_per_pixel), self.board_width - x)
+        height = min(math.ceil((self.height + offset.y) * self.cells_per_pixel), self.board_height - y)
+        return View(Window(x, y, width, height), size, block, offset)
+
+    def clamp(self) -> Viewport:
+        self.x = min(max(0.0, self.x), max(0.0, self.board_width - self.width * self.cells_per_pixel))
+        self.y = min(max(0.0, self.y), max(0.0, self.board_height - self.height * self.cells_per_pixel))
+        return self
+
+    def pan(self, pixels: tuple[int, int]) -> Viewport:
+        """
+        Move the board with the mouse, by (x, y) pixels.
+        """
+        self.x -= pixels[0] * self.cells_per_pixel
+        self.y -= pixels[1] * self.cells_per_pixel
+        return self.clamp()
+
+    def zoom(self, steps: int, about: tuple[int, int]) -> Viewport:
+        """
+        Zoom in by steps, out when negative, halving or doubling the scale each step. The cell under
+        the pixel about stays where it is.
+        """
+        pointer_x = self.x + about[0] * self.cells_per_pixel
+        pointer_y = self.y + about[1] * self.cells_per_pixel
+        for _ in range(abs(steps)):
+            if steps > 0:
+                if self.block > 1:
+                    self.block //= 2
+                else:
+                    self.cell_size = min(self.max_cell_size, self.cell_size * 2)
+            elif self.cell_size > 1:
+                self.cell_size //= 2
+            else:
+                self.block = min(self.max_block, self.block * 2)
+        self.x = pointer_x - about[0] * self.cells_per_pixel
+        self.y = pointer_y - about[1] * self.cells_per_pixel
+        logger.debug(f"Zoom: cell size {self.cell_size}, block {self.block}")
+        return self.clamp()
+
+    def cell_at(self, pixel: tuple[int, int]) -> Optional[Position]:
+        """
+        Cell under a pixel of the window, None if it is off the board.
+        """
+        window, size, block, offset = self.view
+        x = window.x + (pixel[0] + offset.x) * block // size
+        y = window.y + (pixel[1] + offset.y) * block // size
+        if 0 <= x < self.board_width and 0 <= y < self.board_height:
+            return Position(x, y)
+        return None
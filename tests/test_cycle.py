@@ -0,0 +1,55 @@
+"""
+test_cycle
+
+Cycle detection on Generations rules, where dying cells are part of the state.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from conways.logic import ENGINES, Position, Rule
+
+
+@pytest.mark.parametrize("engine", ["numpy", "parallel"])
+def test_dying_cells_are_not_a_fixed_point(engine: str):
+    # A lone cell with no births or survival dies through states 2 and 3 and is gone at generation 3.
+    board = ENGINES[engine](8, rule=Rule.parse("B/S/C4"))
+    board.toggle_cell(Position(3, 3))
+    board.run_for_set_amount(10, stop_on_cycle=True)
+    assert (board.cycle.first_seen, board.cycle.period) == (3, 1)
+    assert not board.board.any()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_generations_cycle_is_real(seed: int):
+    board = ENGINES["numpy"](48, rule=Rule.parse("B35678/S5678/C9")).set_random_board(seed)
+    board.run_for_set_amount(200, stop_on_cycle=True)
+    assert board.cycle is not None
+    states = [board.board.copy()]
+    for _ in range(board.cycle.period):
+        board.generation()
+        states.append(board.board.copy())
+    assert np.array_equal(states[0], states[-1])
+
+
+def test_hashlife_glider_leaving_the_window_is_not_a_cycle():
+    # Once the glider is off the 16x16 window the window is empty every generation, the plane isn't.
+    board = ENGINES["hashlife"](16)
+    for x, y in ((1, 0), (2, 1), (0, 2), (1, 2), (2, 2)):
+        board.toggle_cell(Position(x, y))
+    board.run_for_set_amount(200, stop_on_cycle=True)
+    assert board.cycle is None
+    assert board.population == 5
+
+
+def test_hashlife_cycle_survives_expansion():
+    board = ENGINES["hashlife"](16, cache_size=64)
+    for x in (5, 6, 7):
+        board.toggle_cell(Position(x, 5))
+    board.jump(5)
+    board.run_for_set_amount(10, stop_on_cycle=True)
+    assert board.cycle == (0, 2)
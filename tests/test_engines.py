@@ -0,0 +1,69 @@
+"""
+test_engines
+
+Every engine gives the same cells as the numpy engine every generation, on every topology.
+
+Author: Zack Hankin
+Started: 17/10/2026
+"""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from conways.logic import ENGINES, TOPOLOGIES, BoardPool
+
+# Rectangular and more than one BitBoard word wide.
+HEIGHT, WIDTH = 60, 70
+GENERATIONS = 20
+
+
+def random_grid(seed: int, margin: int = 0) -> np.ndarray:
+    grid = np.zeros((HEIGHT, WIDTH), dtype=np.uint8)
+    inner = grid[margin:HEIGHT - margin, margin:WIDTH - margin]
+    inner[...] = np.random.default_rng(seed).random(inner.shape) < 0.4
+    return grid
+
+
+def make(engine: str, topology: str):
+    kwargs = {"workers": 3} if engine == "parallel" else {}
+    return ENGINES[engine](WIDTH, height=HEIGHT, topology=topology, **kwargs)
+
+
+CASES = [
+    (engine, topology)
+    for engine in ENGINES if engine != "numpy"
+    for topology in TOPOLOGIES
+    # HashLife runs on an open plane, only bounded boards whose cells never reach the edge match.
+    if engine != "hashlife" or topology == "bounded"
+    ]
+
+
+@pytest.mark.parametrize("engine, topology", CASES)
+@pytest.mark.parametrize("seed", [0, 1])
+def test_engine_matches_numpy(engine: str, topology: str, seed: int):
+    grid = random_grid(seed, GENERATIONS + 1 if engine == "hashlife" else 0)
+    expected, board = make("numpy", topology).load_grid(grid), make(engine, topology).load_grid(grid)
+    try:
+        for generation in range(1, GENERATIONS + 1):
+            expected.generation()
+            board.generation()
+            assert np.array_equal(board.to_grid(), expected.to_grid()), generation
+        assert board.generation_number == GENERATIONS
+    finally:
+        if hasattr(board, "close"):
+            board.close()
+
+
+@pytest.mark.parametrize("topology", TOPOLOGIES)
+def test_board_pool_matches_numpy(topology: str):
+    seeds = [0, 1, 2]
+    pool = BoardPool(len(seeds), WIDTH, height=HEIGHT, topology=topology)
+    boards = [make("numpy", topology).load_grid(random_grid(seed)) for seed in seeds]
+    for k, board in enumerate(boards):
+        pool.board[k] = board.board
+    for generation in range(1, GENERATIONS + 1):
+        pool.generation()
+        for k, board in enumerate(boards):
+            board.generation()
+            assert np.array_equal(pool[k].to_grid(), board.to_grid()), (k, generation)